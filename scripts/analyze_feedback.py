@@ -11,57 +11,315 @@ Frequência recomendada: Semanal ou sob demanda
 """
 
 import os
+import sys
 import json
-from datetime import datetime, timedelta
-from collections import defaultdict
-from typing import Dict, List, Tuple
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
 import pandas as pd
-from supabase import create_client, Client
+from pandas.api.types import union_categoricals
+from supabase import Client
+
+# Utilitários compartilhados com o scraper (leitura paginada)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scraper'))
+from storage import create_storage_client, uses_supabase
+from table_reader import iter_pages
+
+from feedback_cache import FeedbackCache, cache_available
+from feedback_rollup import FeedbackRollup
 
 # Configuração do Supabase
 SUPABASE_URL = os.getenv('SUPABASE_URL', '')
 SUPABASE_KEY = os.getenv('SUPABASE_SERVICE_KEY', '')  # Service key para acesso admin
 
+# rows = baixa os feedbacks e agrega em pandas; aggregate = agrega no banco (RPCs);
+# incremental = soma só os feedbacks novos a um rollup diário local
+ANALYSIS_MODE = os.getenv('ANALYSIS_MODE', 'rows')
+
+# Modo incremental: arquivo do rollup, dias mantidos e atraso da marca d'água
+ROLLUP_FILE = os.getenv('ROLLUP_FILE', 'feedback_rollup.db')
+ROLLUP_RETENTION_DAYS = int(os.getenv('ROLLUP_RETENTION_DAYS', '90'))
+ROLLUP_LAG_MINUTES = int(os.getenv('ROLLUP_LAG_MINUTES', '5'))
+
+# Só as colunas usadas nas análises (analysis_result é o JSON grande da conversa)
+FEEDBACK_COLUMNS = 'id, created_at, feedback_type, suggestion_text, conversations(tone, focus_tags)'
+FEEDBACK_TYPES = ['like', 'dislike']
+MERGED_CATEGORIES = ('suggestion_text', 'tone')
+# Linhas por request (até o max-rows da API) e por pedaço convertido em DataFrame
+FEEDBACK_PAGE_SIZE = int(os.getenv('FEEDBACK_PAGE_SIZE', '1000'))
+FEEDBACK_CHUNK_ROWS = int(os.getenv('FEEDBACK_CHUNK_ROWS', '50000'))
+# Cache colunar por dia do modo rows (vazio desativa; requer pyarrow)
+FEEDBACK_CACHE_DIR = os.getenv('FEEDBACK_CACHE_DIR', '.feedback_cache')
+FEEDBACK_CACHE_SETTLE_MINUTES = int(os.getenv('FEEDBACK_CACHE_SETTLE_MINUTES', '5'))
+
 def init_supabase() -> Client:
     """Inicializa cliente Supabase"""
-    if not SUPABASE_URL or not SUPABASE_KEY:
+    if uses_supabase() and (not SUPABASE_URL or not SUPABASE_KEY):
         raise ValueError("Variáveis de ambiente SUPABASE_URL e SUPABASE_SERVICE_KEY são obrigatórias")
     
-    return create_client(SUPABASE_URL, SUPABASE_KEY)
+    return create_storage_client(SUPABASE_URL, SUPABASE_KEY)
+
+def _feedback_chunk(rows: List[Dict]) -> pd.DataFrame:
+    """
+    Converte uma página de feedbacks em DataFrame com dtypes compactos
+    
+    O embed conversations vira as colunas tone/focus_tags, para as
+    análises não abrirem um dict por linha.
+    """
+    conversations = [row.get('conversations') or {} for row in rows]
+    return pd.DataFrame({
+        'id': [row['id'] for row in rows],
+        'created_at': pd.to_datetime([row['created_at'] for row in rows], utc=True, format='ISO8601'),
+        'feedback_type': pd.Categorical([row['feedback_type'] for row in rows], categories=FEEDBACK_TYPES),
+        'suggestion_text': pd.Categorical([row['suggestion_text'] for row in rows]),
+        'tone': pd.Categorical([conv.get('tone') or 'unknown' for conv in conversations]),
+        'focus_tags': [conv.get('focus_tags') or [] for conv in conversations],
+    })
+
+def _concat_chunks(chunks: List[pd.DataFrame]) -> pd.DataFrame:
+    """Junta os pedaços mantendo tone/suggestion_text categóricos"""
+    if len(chunks) == 1:
+        return chunks[0]
+    # concat de categóricos com categorias diferentes viraria object
+    df = pd.concat([chunk.drop(columns=list(MERGED_CATEGORIES)) for chunk in chunks], ignore_index=True)
+    for column in MERGED_CATEGORIES:
+        df[column] = union_categoricals([chunk[column] for chunk in chunks])
+    return df[chunks[0].columns]
+
+def _read_feedback(supabase: Client, since: str, until: Optional[str] = None) -> pd.DataFrame:
+    """
+    Lê os feedbacks com created_at em [since, until)
+    
+    Lê em páginas por (created_at, id), só com as colunas usadas nas
+    análises, e monta o DataFrame em pedaços de FEEDBACK_CHUNK_ROWS: a
+    memória fica limitada a um pedaço de dicts mais as colunas já
+    convertidas. Erros da API são propagados.
+    
+    Returns:
+        DataFrame com id, created_at, feedback_type, suggestion_text,
+        tone e focus_tags (vazio se não houver linhas)
+    """
+    def filters(query):
+        query = query.gte('created_at', since)
+        return query.lt('created_at', until) if until else query
+    
+    chunks = []
+    buffer: List[Dict] = []
+    # Uma única request pararia no limite de linhas da API
+    for page in iter_pages(
+        supabase, 'suggestion_feedback', FEEDBACK_COLUMNS,
+        key='created_at', tiebreaker='id', page_size=FEEDBACK_PAGE_SIZE, filters=filters,
+    ):
+        buffer.extend(page)
+        if len(buffer) >= FEEDBACK_CHUNK_ROWS:
+            chunks.append(_feedback_chunk(buffer))
+            buffer = []
+    if buffer:
+        chunks.append(_feedback_chunk(buffer))
+    
+    return _concat_chunks(chunks) if chunks else pd.DataFrame()
 
 def fetch_feedback_data(supabase: Client, days_ago: int = 7) -> pd.DataFrame:
     """
     Busca dados de feedback dos últimos N dias
     
+    Com FEEDBACK_CACHE_DIR (e pyarrow), os dias fechados vêm do cache
+    colunar local e só os dias que faltam, mais o dia corrente, são
+    baixados.
+    
     Args:
         supabase: Cliente Supabase
         days_ago: Número de dias para buscar feedback
         
     Returns:
-        DataFrame com feedbacks
+        DataFrame com feedbacks (ver _read_feedback)
     """
-    cutoff_date = (datetime.now() - timedelta(days=days_ago)).isoformat()
-    
     try:
-        # Buscar feedbacks com joins para obter dados relacionados
-        response = supabase.table('suggestion_feedback') \
-            .select('*, conversations(tone, focus_tags, analysis_result)') \
-            .gte('created_at', cutoff_date) \
-            .execute()
+        if FEEDBACK_CACHE_DIR and cache_available():
+            cache = FeedbackCache(FEEDBACK_CACHE_DIR, settle_minutes=FEEDBACK_CACHE_SETTLE_MINUTES)
+            df = cache.load(lambda since, until: _read_feedback(supabase, since, until),
+                            datetime.now(timezone.utc) - timedelta(days=days_ago))
+            print(f"📦 Cache: {cache.hits} dias locais, {cache.fetched} baixados ({FEEDBACK_CACHE_DIR})")
+        else:
+            if FEEDBACK_CACHE_DIR:
+                print("⚠️  pyarrow não instalado: cache de feedbacks desativado")
+            cutoff_date = (datetime.now(timezone.utc) - timedelta(days=days_ago)).isoformat()
+            df = _read_feedback(supabase, cutoff_date)
         
-        if not response.data:
+        if df.empty:
             print(f"⚠️  Nenhum feedback encontrado nos últimos {days_ago} dias")
-            return pd.DataFrame()
+            return df
         
-        # Converter para DataFrame
-        df = pd.DataFrame(response.data)
-        print(f"✅ {len(df)} feedbacks carregados")
+        print(f"✅ {len(df)} feedbacks carregados "
+              f"({df.memory_usage(deep=True).sum() / 1024 / 1024:.1f} MB)")
         return df
         
     except Exception as e:
         print(f"❌ Erro ao buscar feedbacks: {e}")
         return pd.DataFrame()
 
+def _with_rates(stats: Dict) -> Dict:
+    """Acrescenta like_rate/dislike_rate (%) a um grupo com total/likes/dislikes"""
+    total = stats['total']
+    return {
+        **stats,
+        'like_rate': round((stats['likes'] / total * 100) if total > 0 else 0, 2),
+        'dislike_rate': round((stats['dislikes'] / total * 100) if total > 0 else 0, 2),
+    }
+
+def _format_aggregates(totals: Dict, tones: List[Dict], tags: List[Dict],
+                       suggestions: List[Dict]) -> Tuple[Dict, List[Dict], List[Dict], List[Dict]]:
+    """
+    Converte contagens já agrupadas (RPCs ou rollup local) nos formatos
+    das funções analyze_*
+    
+    Args:
+        totals: total/likes/dislikes da janela
+        tones: total/likes/dislikes por tone
+        tags: total/likes/dislikes por focus_tag
+        suggestions: total/dislikes das sugestões acima do limite
+        
+    Returns:
+        (métricas, análise por tom, análise por focus_tags, sugestões problemáticas)
+    """
+    rates = _with_rates(totals)
+    metrics = {
+        'total_feedbacks': rates['total'],
+        'likes': rates['likes'],
+        'dislikes': rates['dislikes'],
+        'like_rate': rates['like_rate'],
+        'dislike_rate': rates['dislike_rate'],
+    }
+    tone_analysis = sorted((_with_rates(tone) for tone in tones),
+                           key=lambda x: x['dislike_rate'], reverse=True)
+    tag_analysis = sorted((_with_rates(tag) for tag in tags),
+                          key=lambda x: x['dislike_rate'], reverse=True)
+    problems = sorted((
+        {
+            'suggestion_text': row['suggestion_text'],
+            'total_feedbacks': row['total'],
+            'dislikes': row['dislikes'],
+            'dislike_rate': round(row['dislikes'] / row['total'] * 100, 2),
+        }
+        for row in suggestions
+    ), key=lambda x: x['dislike_rate'], reverse=True)
+    return metrics, tone_analysis, tag_analysis, problems
+
+def fetch_feedback_aggregates(supabase: Client, days_ago: int = 7,
+                              threshold: float = 70.0) -> Tuple[Dict, List[Dict], List[Dict], List[Dict]]:
+    """
+    Busca as análises já agregadas no banco (ANALYSIS_MODE=aggregate)
+    
+    Usa as funções da migration 20251007_add_feedback_aggregation_functions:
+    só as contagens por tom, focus_tag e sugestão trafegam, não as linhas.
+    
+    Args:
+        supabase: Cliente Supabase
+        days_ago: Número de dias para buscar feedback
+        threshold: Percentual mínimo de dislikes para sugestão problemática
+        
+    Returns:
+        (métricas, análise por tom, análise por focus_tags, sugestões
+        problemáticas), nos mesmos formatos das funções analyze_*
+    """
+    since = (datetime.now(timezone.utc) - timedelta(days=days_ago)).isoformat()
+    
+    try:
+        totals = supabase.rpc('get_feedback_totals', {'since': since}).execute().data
+        tones = supabase.rpc('get_feedback_by_tone', {'since': since}).execute().data
+        tags = supabase.rpc('get_feedback_by_focus_tag', {'since': since}).execute().data
+        suggestions = supabase.rpc('get_problem_suggestions', {
+            'since': since, 'threshold': threshold, 'min_feedbacks': 3,
+        }).execute().data
+    except Exception as e:
+        print(f"❌ Erro ao buscar agregados: {e}")
+        return {}, [], [], []
+    
+    totals = totals[0] if totals else {'total': 0, 'likes': 0, 'dislikes': 0}
+    if not totals['total']:
+        print(f"⚠️  Nenhum feedback encontrado nos últimos {days_ago} dias")
+        return {}, [], [], []
+    print(f"✅ {totals['total']} feedbacks agregados no banco")
+    
+    return _format_aggregates(totals, tones, tags, suggestions)
+
+def fetch_feedback_incremental(supabase: Client, days_ago: int = 7,
+                               threshold: float = 70.0) -> Tuple[Dict, List[Dict], List[Dict], List[Dict]]:
+    """
+    Soma ao rollup local só os feedbacks novos e analisa a janela a
+    partir dele (ANALYSIS_MODE=incremental)
+    
+    A primeira execução carrega max(days_ago, ROLLUP_RETENTION_DAYS) dias;
+    as seguintes buscam só as linhas depois da marca d'água. A janela é a
+    mesma dos modos rows e aggregate (created_at >= now - days_ago): os
+    dias inteiros vêm do rollup, e o pedaço do primeiro dia e as linhas
+    depois da marca d'água são lidos da API.
+    
+    Args:
+        supabase: Cliente Supabase
+        days_ago: Número de dias da janela
+        threshold: Percentual mínimo de dislikes para sugestão problemática
+        
+    Returns:
+        (métricas, análise por tom, análise por focus_tags, sugestões
+        problemáticas), nos mesmos formatos das funções analyze_*
+    """
+    now = datetime.now(timezone.utc)
+    # Linhas dos últimos minutos podem ainda estar em transações abertas
+    # com created_at anterior: ficam para a próxima execução
+    until = (now - timedelta(minutes=ROLLUP_LAG_MINUTES)).isoformat()
+    retention_days = max(days_ago, ROLLUP_RETENTION_DAYS)
+    cutoff = now - timedelta(days=days_ago)
+    # Primeiro dia que entra inteiro na janela
+    first_full_day = datetime.combine(cutoff.date() + timedelta(days=1), datetime.min.time(), tzinfo=timezone.utc)
+    
+    rollup = FeedbackRollup(ROLLUP_FILE)
+    try:
+        since = rollup.watermark()
+        if since is None:
+            since = (now - timedelta(days=retention_days)).strftime('%Y-%m-%dT00:00:00+00:00')
+            print(f"📦 Rollup vazio: carregando feedbacks desde {since[:10]}...")
+        
+        try:
+            if since < until:
+                df = _read_feedback(supabase, since, until)
+                rollup.add(df, since, until)
+                print(f"✅ {len(df)} feedbacks novos somados ao rollup ({ROLLUP_FILE})")
+            watermark = datetime.fromisoformat(rollup.watermark())
+            
+            # Fora dos dias do rollup: [cutoff, primeiro dia inteiro) e o que
+            # veio depois da marca d'água
+            extra = []
+            partial_until = min(first_full_day, watermark)
+            if cutoff < partial_until:
+                extra.append(_read_feedback(supabase, cutoff.isoformat(), partial_until.isoformat()))
+            extra.append(_read_feedback(supabase, max(watermark, cutoff).isoformat()))
+        except Exception as e:
+            # A marca d'água só anda depois de uma leitura completa
+            print(f"❌ Erro ao buscar feedbacks: {e}")
+            return {}, [], [], []
+        extra = [df for df in extra if not df.empty]
+        
+        rollup.prune((now - timedelta(days=retention_days)).strftime('%Y-%m-%d'))
+        
+        window_start = first_full_day.strftime('%Y-%m-%d')
+        covered_from = rollup.covered_from()
+        if covered_from and covered_from > window_start:
+            print(f"⚠️  Rollup só cobre a partir de {covered_from}; "
+                  f"apague {ROLLUP_FILE} para recarregar a janela inteira")
+        totals, tones, tags, suggestions = rollup.window(
+            window_start, threshold, min_feedbacks=3,
+            extra=_concat_chunks(extra) if extra else None,
+        )
+    finally:
+        rollup.close()
+    
+    if not totals['total']:
+        print(f"⚠️  Nenhum feedback encontrado nos últimos {days_ago} dias")
+        return {}, [], [], []
+    print(f"✅ {totals['total']} feedbacks na janela desde {cutoff.isoformat(timespec='seconds')}")
+    
+    return _format_aggregates(totals, tones, tags, suggestions)
+
 def analyze_feedback_metrics(df: pd.DataFrame) -> Dict:
     """
     Analisa métricas gerais de feedback
@@ -76,8 +334,8 @@ def analyze_feedback_metrics(df: pd.DataFrame) -> Dict:
         return {}
     
     total = len(df)
-    likes = len(df[df['feedback_type'] == 'like'])
-    dislikes = len(df[df['feedback_type'] == 'dislike'])
+    likes = int((df['feedback_type'] == 'like').sum())
+    dislikes = int((df['feedback_type'] == 'dislike').sum())
     like_rate = (likes / total * 100) if total > 0 else 0
     dislike_rate = (dislikes / total * 100) if total > 0 else 0
     
@@ -89,6 +347,32 @@ def analyze_feedback_metrics(df: pd.DataFrame) -> Dict:
         'dislike_rate': round(dislike_rate, 2),
     }
 
+def _group_feedback(keys: pd.Series, feedback_type: pd.Series, name: str,
+                    dislike_if_not_like: bool = False) -> pd.DataFrame:
+    """
+    Contagens e taxas de feedback por chave, em um único groupby
+    
+    Args:
+        keys: Chave de agrupamento de cada feedback (tom, tag, texto...)
+        feedback_type: 'like'/'dislike' de cada feedback, alinhado com keys
+        name: Nome da coluna da chave no resultado
+        dislike_if_not_like: Conta como dislike tudo que não é like
+        
+    Returns:
+        DataFrame com name, total, likes, dislikes, like_rate e
+        dislike_rate, ordenado por dislike_rate (problemas primeiro)
+    """
+    is_like = (feedback_type == 'like').to_numpy()
+    is_dislike = ~is_like if dislike_if_not_like else (feedback_type == 'dislike').to_numpy()
+    counts = pd.DataFrame({name: keys.to_numpy(), 'likes': is_like, 'dislikes': is_dislike})
+    stats = counts.groupby(name, observed=True, sort=False).agg(
+        total=('likes', 'size'), likes=('likes', 'sum'), dislikes=('dislikes', 'sum'),
+    ).reset_index()
+    stats[name] = stats[name].astype(object)
+    stats['like_rate'] = (stats['likes'] / stats['total'] * 100).round(2)
+    stats['dislike_rate'] = (stats['dislikes'] / stats['total'] * 100).round(2)
+    return stats.sort_values('dislike_rate', ascending=False, kind='stable')
+
 def analyze_by_tone(df: pd.DataFrame) -> List[Dict]:
     """
     Analisa feedback por tom de mensagem
@@ -99,78 +383,34 @@ def analyze_by_tone(df: pd.DataFrame) -> List[Dict]:
     Returns:
         Lista com análise por tom
     """
-    if df.empty or 'conversations' not in df.columns:
+    if df.empty or 'tone' not in df.columns:
         return []
     
-    # Extrair tom de cada conversa
-    df['tone'] = df['conversations'].apply(
-        lambda x: x.get('tone', 'unknown') if isinstance(x, dict) else 'unknown'
-    )
-    
-    tone_stats = []
-    for tone in df['tone'].unique():
-        tone_df = df[df['tone'] == tone]
-        total = len(tone_df)
-        likes = len(tone_df[tone_df['feedback_type'] == 'like'])
-        dislikes = len(tone_df[tone_df['feedback_type'] == 'dislike'])
-        
-        tone_stats.append({
-            'tone': tone,
-            'total': total,
-            'likes': likes,
-            'dislikes': dislikes,
-            'like_rate': round((likes / total * 100) if total > 0 else 0, 2),
-            'dislike_rate': round((dislikes / total * 100) if total > 0 else 0, 2),
-        })
-    
-    # Ordenar por taxa de dislike (problemas primeiro)
-    tone_stats.sort(key=lambda x: x['dislike_rate'], reverse=True)
-    return tone_stats
+    return _group_feedback(df['tone'], df['feedback_type'], 'tone').to_dict('records')
 
 def analyze_by_focus_tags(df: pd.DataFrame) -> List[Dict]:
     """
     Analisa feedback por focus_tags
     
+    Um feedback conta uma vez para cada focus_tag da conversa (e como
+    dislike sempre que não é like).
+    
     Args:
         df: DataFrame com feedbacks
         
     Returns:
         Lista com análise por focus_tags
     """
-    if df.empty or 'conversations' not in df.columns:
+    if df.empty or 'focus_tags' not in df.columns:
         return []
     
-    # Extrair focus_tags de cada conversa
-    tag_stats = defaultdict(lambda: {'likes': 0, 'dislikes': 0, 'total': 0})
-    
-    for _, row in df.iterrows():
-        conv = row.get('conversations', {})
-        if isinstance(conv, dict):
-            focus_tags = conv.get('focus_tags', [])
-            if isinstance(focus_tags, list):
-                for tag in focus_tags:
-                    tag_stats[tag]['total'] += 1
-                    if row['feedback_type'] == 'like':
-                        tag_stats[tag]['likes'] += 1
-                    else:
-                        tag_stats[tag]['dislikes'] += 1
-    
-    # Converter para lista
-    results = []
-    for tag, stats in tag_stats.items():
-        total = stats['total']
-        results.append({
-            'focus_tag': tag,
-            'total': total,
-            'likes': stats['likes'],
-            'dislikes': stats['dislikes'],
-            'like_rate': round((stats['likes'] / total * 100) if total > 0 else 0, 2),
-            'dislike_rate': round((stats['dislikes'] / total * 100) if total > 0 else 0, 2),
-        })
-    
-    # Ordenar por taxa de dislike
-    results.sort(key=lambda x: x['dislike_rate'], reverse=True)
-    return results
+    # Uma linha por (feedback, tag); conversas sem tags ficam de fora
+    tags = df[['feedback_type', 'focus_tags']].explode('focus_tags').dropna(subset=['focus_tags'])
+    if tags.empty:
+        return []
+    
+    return _group_feedback(tags['focus_tags'], tags['feedback_type'], 'focus_tag',
+                           dislike_if_not_like=True).to_dict('records')
 
 def identify_problem_suggestions(df: pd.DataFrame, threshold: float = 70.0) -> List[Dict]:
     """
@@ -186,33 +426,12 @@ def identify_problem_suggestions(df: pd.DataFrame, threshold: float = 70.0) -> L
     if df.empty:
         return []
     
-    # Agrupar por texto da sugestão
-    suggestion_stats = df.groupby('suggestion_text').agg({
-        'feedback_type': lambda x: {
-            'total': len(x),
-            'likes': (x == 'like').sum(),
-            'dislikes': (x == 'dislike').sum(),
-        }
-    }).reset_index()
-    
-    problems = []
-    for _, row in suggestion_stats.iterrows():
-        stats = row['feedback_type']
-        total = stats['total']
-        dislikes = stats['dislikes']
-        dislike_rate = (dislikes / total * 100) if total > 0 else 0
-        
-        if dislike_rate >= threshold and total >= 3:  # Mínimo 3 feedbacks
-            problems.append({
-                'suggestion_text': row['suggestion_text'],
-                'total_feedbacks': total,
-                'dislikes': dislikes,
-                'dislike_rate': round(dislike_rate, 2),
-            })
-    
-    # Ordenar por taxa de dislike
-    problems.sort(key=lambda x: x['dislike_rate'], reverse=True)
-    return problems
+    stats = _group_feedback(df['suggestion_text'], df['feedback_type'], 'suggestion_text')
+    # Taxa sem arredondamento, como no filtro do banco; mínimo 3 feedbacks
+    problems = stats[(stats['dislikes'] * 100 >= threshold * stats['total']) & (stats['total'] >= 3)]
+    return problems.rename(columns={'total': 'total_feedbacks'})[
+        ['suggestion_text', 'total_feedbacks', 'dislikes', 'dislike_rate']
+    ].to_dict('records')
 
 def generate_report(metrics: Dict, tone_analysis: List[Dict], 
                    tag_analysis: List[Dict], problems: List[Dict]) -> str:
@@ -341,27 +560,47 @@ def main():
         print("   export SUPABASE_SERVICE_KEY='sua_key'")
         return
     
-    # Buscar dados
     days = int(os.getenv('ANALYSIS_DAYS', '7'))
-    print(f"🔍 Buscando feedbacks dos últimos {days} dias...")
-    df = fetch_feedback_data(supabase, days_ago=days)
-    
-    if df.empty:
-        print("\n⚠️  Sem dados para analisar. Encerrando.")
-        return
-    
-    # Análises
-    print("\n📈 Calculando métricas...")
-    metrics = analyze_feedback_metrics(df)
-    
-    print("🎭 Analisando por tom...")
-    tone_analysis = analyze_by_tone(df)
-    
-    print("🎯 Analisando por focus_tags...")
-    tag_analysis = analyze_by_focus_tags(df)
     
-    print("🚨 Identificando sugestões problemáticas...")
-    problems = identify_problem_suggestions(df, threshold=70.0)
+    if ANALYSIS_MODE == 'aggregate':
+        # Contagens agrupadas no banco: só kilobytes trafegam
+        print(f"🔍 Agregando feedbacks dos últimos {days} dias no banco...")
+        metrics, tone_analysis, tag_analysis, problems = fetch_feedback_aggregates(
+            supabase, days_ago=days, threshold=70.0
+        )
+        if not metrics:
+            print("\n⚠️  Sem dados para analisar. Encerrando.")
+            return
+    elif ANALYSIS_MODE == 'incremental':
+        # Só os feedbacks depois da última execução trafegam
+        print(f"🔍 Atualizando rollup e somando os últimos {days} dias...")
+        metrics, tone_analysis, tag_analysis, problems = fetch_feedback_incremental(
+            supabase, days_ago=days, threshold=70.0
+        )
+        if not metrics:
+            print("\n⚠️  Sem dados para analisar. Encerrando.")
+            return
+    else:
+        # Buscar dados
+        print(f"🔍 Buscando feedbacks dos últimos {days} dias...")
+        df = fetch_feedback_data(supabase, days_ago=days)
+        
+        if df.empty:
+            print("\n⚠️  Sem dados para analisar. Encerrando.")
+            return
+        
+        # Análises
+        print("\n📈 Calculando métricas...")
+        metrics = analyze_feedback_metrics(df)
+        
+        print("🎭 Analisando por tom...")
+        tone_analysis = analyze_by_tone(df)
+        
+        print("🎯 Analisando por focus_tags...")
+        tag_analysis = analyze_by_focus_tags(df)
+        
+        print("🚨 Identificando sugestões problemáticas...")
+        problems = identify_problem_suggestions(df, threshold=70.0)
     
     # Gerar relatório
     print("\n📝 Gerando relatório...")
@@ -0,0 +1,139 @@
+"""
+=====================================================
+FEEDBACK SNAPSHOT CACHE
+=====================================================
+Description: Cache local e colunar dos feedbacks lidos pelo
+             analyze_feedback.py: um arquivo Arrow IPC por dia
+             (UTC), lido com memory map; só os dias que faltam
+             são baixados
+Author: FlertAI Team
+Date: 2025-10-08
+=====================================================
+"""
+
+import os
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Callable, List, Optional
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = None
+    pc = None
+
+# (since, until) ISO -> feedbacks de [since, until), no formato de fetch_feedback_data
+FeedbackReader = Callable[[str, Optional[str]], pd.DataFrame]
+
+
+def cache_available() -> bool:
+    """True se o pyarrow está instalado"""
+    return pa is not None
+
+
+def _schema() -> 'pa.Schema':
+    # Mesmos dtypes do DataFrame: categóricos viram colunas dictionary
+    text = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema([
+        ('id', pa.string()),
+        ('created_at', pa.timestamp('us', tz='UTC')),
+        ('feedback_type', text),
+        ('suggestion_text', text),
+        ('tone', text),
+        ('focus_tags', pa.list_(pa.string())),
+    ])
+
+
+def _day_start(day: date) -> datetime:
+    return datetime.combine(day, time.min, tzinfo=timezone.utc)
+
+
+class FeedbackCache:
+    """
+    Partições diárias de suggestion_feedback em disco
+
+    Só dias fechados (terminados há pelo menos settle_minutes) são
+    gravados; o dia corrente é sempre lido da API. Arquivos são Arrow
+    IPC sem compressão, então a leitura mapeia o arquivo em vez de
+    decodificá-lo. Dias já gravados não são atualizados: apague o
+    diretório para baixar tudo de novo.
+    """
+
+    def __init__(self, directory: str, settle_minutes: int = 5):
+        self.directory = directory
+        self.settle = timedelta(minutes=settle_minutes)
+        self.schema = _schema()
+        self.hits = 0
+        self.fetched = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, day: date) -> str:
+        return os.path.join(self.directory, f"day={day.isoformat()}.arrow")
+
+    def _to_table(self, df: pd.DataFrame) -> 'pa.Table':
+        if df.empty:
+            return self.schema.empty_table()
+        return pa.Table.from_pandas(df[self.schema.names], schema=self.schema, preserve_index=False)
+
+    def _write(self, day: date, df: pd.DataFrame):
+        for column in ('suggestion_text', 'tone'):
+            if column in df.columns:
+                df[column] = df[column].cat.remove_unused_categories()
+        table = self._to_table(df)
+        # Nunca fica um arquivo pela metade no lugar da partição
+        path = self._path(day)
+        tmp_path = f'{path}.tmp'
+        with pa.OSFile(tmp_path, 'wb') as sink:
+            with pa.ipc.new_file(sink, self.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, path)
+
+    def _read(self, day: date) -> 'pa.Table':
+        with pa.memory_map(self._path(day), 'r') as source:
+            return pa.ipc.open_file(source).read_all()
+
+    def load(self, read: FeedbackReader, since: datetime,
+             now: Optional[datetime] = None) -> pd.DataFrame:
+        """
+        Feedbacks com created_at >= since, do cache e da API
+
+        Args:
+            read: Função que lê um intervalo da API (ver FeedbackReader)
+            since: Início da janela (com timezone)
+            now: Momento da leitura (padrão: agora)
+
+        Returns:
+            DataFrame no formato de fetch_feedback_data (vazio se não
+            houver linhas)
+        """
+        now = now or datetime.now(timezone.utc)
+        # Dias anteriores a settled_until estão fechados e podem ir para o cache
+        settled_until = (now - self.settle).date()
+        first_day = since.astimezone(timezone.utc).date()
+
+        tables: List['pa.Table'] = []
+        day = first_day
+        while day < settled_until:
+            if os.path.exists(self._path(day)):
+                self.hits += 1
+            else:
+                next_start = _day_start(day + timedelta(days=1))
+                self._write(day, read(_day_start(day).isoformat(), next_start.isoformat()))
+                self.fetched += 1
+            tables.append(self._read(day))
+            day += timedelta(days=1)
+
+        # O primeiro dia pode começar antes da janela
+        if tables:
+            created_at = tables[0].column('created_at')
+            tables[0] = tables[0].filter(pc.greater_equal(created_at, pa.scalar(since, created_at.type)))
+
+        live_since = max(since, _day_start(settled_until))
+        tables.append(self._to_table(read(live_since.isoformat(), None)))
+
+        table = pa.concat_tables(tables)
+        if table.num_rows == 0:
+            return pd.DataFrame()
+        return table.to_pandas()
@@ -0,0 +1,266 @@
+"""
+=====================================================
+FEEDBACK ROLLUP
+=====================================================
+Description: Agregados diários de suggestion_feedback em SQLite
+             (por tom, focus_tag e sugestão) com marca d'água,
+             para o analyze_feedback.py (ANALYSIS_MODE=incremental)
+             buscar só as linhas novas a cada execução
+Author: FlertAI Team
+Date: 2025-10-08
+=====================================================
+"""
+
+import hashlib
+import sqlite3
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS daily_totals (
+    day TEXT PRIMARY KEY,
+    total INTEGER NOT NULL,
+    likes INTEGER NOT NULL,
+    dislikes INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS daily_tone (
+    day TEXT NOT NULL,
+    tone TEXT NOT NULL,
+    total INTEGER NOT NULL,
+    likes INTEGER NOT NULL,
+    dislikes INTEGER NOT NULL,
+    PRIMARY KEY (day, tone)
+);
+CREATE TABLE IF NOT EXISTS daily_focus_tag (
+    day TEXT NOT NULL,
+    focus_tag TEXT NOT NULL,
+    total INTEGER NOT NULL,
+    likes INTEGER NOT NULL,
+    dislikes INTEGER NOT NULL,
+    PRIMARY KEY (day, focus_tag)
+);
+CREATE TABLE IF NOT EXISTS daily_suggestion (
+    day TEXT NOT NULL,
+    suggestion_hash TEXT NOT NULL,
+    total INTEGER NOT NULL,
+    likes INTEGER NOT NULL,
+    dislikes INTEGER NOT NULL,
+    PRIMARY KEY (day, suggestion_hash)
+);
+CREATE TABLE IF NOT EXISTS suggestions (
+    suggestion_hash TEXT PRIMARY KEY,
+    suggestion_text TEXT NOT NULL
+);
+"""
+
+# Tabela diária -> coluna da chave
+DAILY_TABLES = {
+    'daily_tone': 'tone',
+    'daily_focus_tag': 'focus_tag',
+    'daily_suggestion': 'suggestion_hash',
+}
+
+
+def suggestion_hash(text: str) -> str:
+    """Chave estável e curta de um texto de sugestão"""
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def _daily_counts(day: pd.Series, key: Optional[pd.Series], feedback_type: pd.Series,
+                  dislike_if_not_like: bool = False) -> List[Tuple]:
+    """(day, [chave,] total, likes, dislikes) por dia e chave"""
+    is_like = (feedback_type == 'like').to_numpy()
+    is_dislike = ~is_like if dislike_if_not_like else (feedback_type == 'dislike').to_numpy()
+    counts = pd.DataFrame({'day': day.to_numpy(), 'likes': is_like, 'dislikes': is_dislike})
+    keys = ['day']
+    if key is not None:
+        counts['key'] = key.to_numpy()
+        keys.append('key')
+    stats = counts.groupby(keys, observed=True).agg(
+        total=('likes', 'size'), likes=('likes', 'sum'), dislikes=('dislikes', 'sum'),
+    ).reset_index()
+    return [tuple(row) for row in stats.astype(object).itertuples(index=False)]
+
+
+def _partials(df: pd.DataFrame) -> Tuple[Dict[str, List[Tuple]], List[Tuple[str, str]]]:
+    """
+    Contagens por dia de um lote de feedbacks
+
+    Returns:
+        (linhas por tabela diária, pares (suggestion_hash, suggestion_text))
+    """
+    rows: Dict[str, List[Tuple]] = {}
+    texts: List[Tuple[str, str]] = []
+    if not df.empty:
+        day = df['created_at'].dt.strftime('%Y-%m-%d')
+        feedback_type = df['feedback_type']
+        rows['daily_totals'] = _daily_counts(day, None, feedback_type)
+        rows['daily_tone'] = _daily_counts(day, df['tone'], feedback_type)
+
+        tags = df[['feedback_type', 'focus_tags']].assign(day=day)
+        tags = tags.explode('focus_tags').dropna(subset=['focus_tags'])
+        rows['daily_focus_tag'] = _daily_counts(tags['day'], tags['focus_tags'], tags['feedback_type'],
+                                                dislike_if_not_like=True)
+
+        # Hash só das sugestões distintas; as linhas usam o código da categoria
+        suggestion = df['suggestion_text'].astype('category')
+        hashes = [suggestion_hash(text) for text in suggestion.cat.categories]
+        texts = list(zip(hashes, suggestion.cat.categories))
+        rows['daily_suggestion'] = _daily_counts(
+            day, pd.Series(pd.Categorical.from_codes(suggestion.cat.codes, categories=hashes)), feedback_type
+        )
+    return rows, texts
+
+
+class FeedbackRollup:
+    """
+    Contagens diárias (dia UTC) de feedback e a marca d'água até onde
+    as linhas já foram somadas
+
+    Cada execução soma só as linhas em [marca d'água, until) e avança a
+    marca na mesma transação, então uma execução interrompida não conta
+    nada duas vezes. Dias antigos não mudam; relatórios de 7/30/90 dias
+    somam os dias da janela.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    def close(self):
+        self._conn.close()
+
+    # Marca d'água ----------------------------------------
+
+    def _meta(self, key: str) -> Optional[str]:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def watermark(self) -> Optional[str]:
+        """created_at (ISO) a partir do qual ainda não há linhas somadas"""
+        return self._meta('watermark')
+
+    def covered_from(self) -> Optional[str]:
+        """Primeiro dia (YYYY-MM-DD) com contagens completas"""
+        return self._meta('covered_from')
+
+    # Escrita ---------------------------------------------
+
+    def add(self, df: pd.DataFrame, since: str, until: str):
+        """
+        Soma as linhas de [since, until) e move a marca d'água para until
+
+        Args:
+            df: Feedbacks do intervalo (formato de fetch_feedback_data)
+            since: Início do intervalo; na primeira carga marca o início
+                   da cobertura
+            until: Fim (exclusivo) do intervalo, a nova marca d'água
+        """
+        rows, texts = _partials(df)
+
+        with self._conn:
+            self._insert_partials('', rows, texts)
+            if self.covered_from() is None:
+                self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('covered_from', ?)",
+                                   (since[:10],))
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('watermark', ?)", (until,))
+
+    def _insert_partials(self, prefix: str, rows: Dict[str, List[Tuple]],
+                         texts: List[Tuple[str, str]]):
+        """Soma as contagens nas tabelas diárias (prefix='temp.extra_' = lote avulso)"""
+        for table, values in rows.items():
+            if not values:
+                continue
+            key = DAILY_TABLES.get(table)
+            columns = f"day, {key}" if key else 'day'
+            placeholders = ', '.join('?' * len(values[0]))
+            self._conn.executemany(
+                f"INSERT INTO {prefix}{table} ({columns}, total, likes, dislikes) VALUES ({placeholders}) "
+                f"ON CONFLICT ({columns}) DO UPDATE SET "
+                f"total = total + excluded.total, likes = likes + excluded.likes, "
+                f"dislikes = dislikes + excluded.dislikes",
+                values,
+            )
+        self._conn.executemany(f"INSERT OR IGNORE INTO {prefix}suggestions (suggestion_hash, suggestion_text) "
+                               "VALUES (?, ?)", texts)
+
+    def prune(self, before_day: str):
+        """Remove os dias anteriores a before_day (YYYY-MM-DD)"""
+        with self._conn:
+            for table in ('daily_totals', *DAILY_TABLES):
+                self._conn.execute(f"DELETE FROM {table} WHERE day < ?", (before_day,))
+            self._conn.execute("DELETE FROM suggestions WHERE suggestion_hash NOT IN "
+                               "(SELECT suggestion_hash FROM daily_suggestion)")
+            covered_from = self.covered_from()
+            if covered_from and covered_from < before_day:
+                self._conn.execute("UPDATE meta SET value = ? WHERE key = 'covered_from'", (before_day,))
+
+    # Leitura ---------------------------------------------
+
+    def _sum_by(self, table: str, key: str, since_day: str) -> List[Dict]:
+        cursor = self._conn.execute(
+            f"SELECT {key}, SUM(total), SUM(likes), SUM(dislikes) FROM ("
+            f"SELECT {key}, total, likes, dislikes FROM {table} WHERE day >= ? "
+            f"UNION ALL SELECT {key}, total, likes, dislikes FROM temp.extra_{table}"
+            f") GROUP BY {key}", (since_day,)
+        )
+        return [{key: value, 'total': total, 'likes': likes, 'dislikes': dislikes}
+                for value, total, likes, dislikes in cursor]
+
+    def _load_extra(self, extra: Optional[pd.DataFrame]):
+        """Põe as contagens de `extra` nas tabelas temporárias extra_*"""
+        # Mesmo esquema (e chaves) das tabelas diárias, só nesta conexão
+        self._conn.executescript(SCHEMA.replace('CREATE TABLE IF NOT EXISTS ', 'CREATE TEMP TABLE IF NOT EXISTS extra_'))
+        with self._conn:
+            for table in ('daily_totals', *DAILY_TABLES, 'suggestions'):
+                self._conn.execute(f"DELETE FROM temp.extra_{table}")
+            if extra is not None and not extra.empty:
+                self._insert_partials('temp.extra_', *_partials(extra))
+
+    def window(self, since_day: str, threshold: float = 70.0, min_feedbacks: int = 3,
+               extra: Optional[pd.DataFrame] = None) -> Tuple[Dict, List[Dict], List[Dict], List[Dict]]:
+        """
+        Soma os dias a partir de since_day (inclusive) e as linhas de extra
+
+        Args:
+            since_day: Primeiro dia (YYYY-MM-DD) somado do rollup
+            threshold: Percentual mínimo de dislikes para sugestão problemática
+            min_feedbacks: Mínimo de feedbacks da sugestão
+            extra: Feedbacks lidos à parte (fora dos dias do rollup), somados
+                   antes dos filtros de sugestão
+
+        Returns:
+            (totais, por tom, por focus_tag, sugestões problemáticas), no
+            formato das RPCs get_feedback_* do modo aggregate
+        """
+        self._load_extra(extra)
+        total, likes, dislikes = self._conn.execute(
+            "SELECT COALESCE(SUM(total), 0), COALESCE(SUM(likes), 0), COALESCE(SUM(dislikes), 0) FROM ("
+            "SELECT total, likes, dislikes FROM daily_totals WHERE day >= ? "
+            "UNION ALL SELECT total, likes, dislikes FROM temp.extra_daily_totals)", (since_day,)
+        ).fetchone()
+        totals = {'total': total, 'likes': likes, 'dislikes': dislikes}
+        tones = self._sum_by('daily_tone', 'tone', since_day)
+        tags = self._sum_by('daily_focus_tag', 'focus_tag', since_day)
+        cursor = self._conn.execute(
+            "SELECT s.suggestion_text, SUM(d.total), SUM(d.dislikes) FROM ("
+            "SELECT suggestion_hash, total, dislikes FROM daily_suggestion WHERE day >= ? "
+            "UNION ALL SELECT suggestion_hash, total, dislikes FROM temp.extra_daily_suggestion"
+            ") d JOIN ("
+            "SELECT suggestion_hash, suggestion_text FROM suggestions "
+            "UNION SELECT suggestion_hash, suggestion_text FROM temp.extra_suggestions"
+            ") s USING (suggestion_hash) "
+            "GROUP BY d.suggestion_hash "
+            "HAVING SUM(d.total) >= ? AND SUM(d.dislikes) * 100.0 >= ? * SUM(d.total)",
+            (since_day, min_feedbacks, threshold),
+        )
+        suggestions = [{'suggestion_text': text, 'total': total, 'dislikes': dislikes}
+                       for text, total, dislikes in cursor]
+        return totals, tones, tags, suggestions
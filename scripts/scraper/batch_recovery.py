@@ -0,0 +1,167 @@
+"""
+=====================================================
+BATCH RECOVERY
+=====================================================
+Description: Recuperação de batches que falharam no insert:
+             divide o batch ao meio recursivamente até isolar
+             as linhas inválidas e as grava num arquivo de rejeitos
+Author: FlertAI Team
+Date: 2025-10-01
+=====================================================
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Callable, List, Optional
+
+import httpx
+
+from rate_limiter import THROTTLE_STATUS
+from records import Record, as_payload
+
+logger = logging.getLogger(__name__)
+
+# Classes SQLSTATE de erro causado pelos dados da linha
+# (22 = data exception, 23 = integrity constraint violation)
+ROW_ERROR_CLASSES = ('22', '23')
+
+# Sinais de sobrecarga do banco: too_many_connections, out_of_memory,
+# statement_timeout, serialization/deadlock e timeout do pool do PostgREST
+BACKPRESSURE_CODES = frozenset({'53300', '53400', '57014', '40001', '40P01', 'PGRST003'})
+
+
+def is_row_error(error: Exception) -> bool:
+    """
+    Verifica se o erro foi causado por uma linha do batch
+
+    Erros de rede, timeout ou permissão falham o batch inteiro de novo
+    em qualquer metade, então não adianta dividir.
+
+    Args:
+        error: Exceção do insert (postgrest APIError tem `code`)
+
+    Returns:
+        bool: True para violação de constraint / dado inválido
+    """
+    code = getattr(error, 'code', None)
+    return isinstance(code, str) and code[:2] in ROW_ERROR_CLASSES
+
+
+def is_backpressure_error(error: Exception) -> bool:
+    """
+    Verifica se o servidor pediu para desacelerar (429/503, timeout, pool cheio)
+
+    Esses erros não dizem nada sobre as linhas: o batch deve ser
+    repetido mais tarde, não dividido nem rejeitado.
+
+    Args:
+        error: Exceção do insert
+
+    Returns:
+        bool: True se vale esperar e tentar o batch de novo
+    """
+    if getattr(error, 'code', None) in BACKPRESSURE_CODES:
+        return True
+    if isinstance(error, (httpx.TimeoutException, httpx.NetworkError)):
+        return True
+    response = getattr(error, 'response', None)
+    return getattr(response, 'status_code', None) in THROTTLE_STATUS
+
+
+class BisectionInterrupted(Exception):
+    """
+    Backpressure no meio da bisseção de um batch
+
+    As linhas já tratadas (gravadas ou rejeitadas) não devem ser
+    reenviadas: quem chamou espera o backoff e repete só `remaining`.
+
+    Attributes:
+        inserted: Registros gravados antes da interrupção
+        remaining: Registros ainda não tentados (na ordem do batch)
+        error: Erro de backpressure que interrompeu a bisseção
+    """
+
+    def __init__(self, inserted: int, remaining: List[Record], error: Exception):
+        super().__init__(f"Bisection interrupted after {inserted} records: {error}")
+        self.inserted = inserted
+        self.remaining = remaining
+        self.error = error
+
+
+class RejectLog:
+    """Arquivo JSONL com as linhas rejeitadas e o motivo"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def write(self, data: Record, error: Exception):
+        """Registra uma linha rejeitada"""
+        entry = {
+            'rejected_at': time.time(),
+            'code': getattr(error, 'code', None),
+            'reason': getattr(error, 'message', None) or str(error),
+            'record': as_payload(data),
+        }
+        line = json.dumps(entry, ensure_ascii=False, default=str)
+        with self._lock:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+            self.count += 1
+        logger.debug(f"Rejected {data.get('termo', 'unknown')}: {entry['reason']}")
+
+
+def insert_with_bisection(insert: Callable[[List[Record]], int], batch: List[Record],
+                          error: Exception, reject_log: Optional[RejectLog] = None) -> int:
+    """
+    Reinsere um batch que falhou, isolando as linhas problemáticas
+
+    O batch é dividido ao meio e cada metade é tentada de novo; só as
+    metades que falham continuam sendo divididas. Com uma linha ruim em
+    N, são ~2·log2(N) requests em vez de N. Backpressure numa metade não
+    diz nada sobre as linhas: a bisseção para com BisectionInterrupted
+    e nada dessa metade vai para o arquivo de rejeitos.
+
+    Args:
+        insert: Função que grava uma lista de registros e retorna quantos
+                entraram (levanta exceção se falhar)
+        batch: Batch que falhou
+        error: Erro da tentativa com o batch inteiro
+        reject_log: Destino das linhas rejeitadas
+
+    Returns:
+        int: Número de registros inseridos
+
+    Raises:
+        BisectionInterrupted: Backpressure ao tentar uma das metades
+    """
+    if not is_row_error(error):
+        logger.error(f"Batch of {len(batch)} failed with non-row error: {error}")
+    elif len(batch) > 1:
+        middle = len(batch) // 2
+        inserted = 0
+        for start, end in ((0, middle), (middle, len(batch))):
+            half = batch[start:end]
+            try:
+                try:
+                    inserted += insert(half)
+                except Exception as e:
+                    if is_backpressure_error(e):
+                        raise BisectionInterrupted(0, half, e) from e
+                    inserted += insert_with_bisection(insert, half, e, reject_log)
+            except BisectionInterrupted as e:
+                raise BisectionInterrupted(inserted + e.inserted, e.remaining + batch[end:], e.error) from e.error
+        return inserted
+
+    logger.warning(f"Rejected {len(batch)} record(s): {error}")
+    if reject_log:
+        for data in batch:
+            reject_log.write(data, error)
+    return 0
@@ -0,0 +1,294 @@
+"""
+=====================================================
+INSERT THROUGHPUT BENCHMARK
+=====================================================
+Description: Benchmark reproduzível dos caminhos de inserção
+             (scraper e seed) contra o backend local: corpora
+             sintéticos no formato do seed e, por estratégia,
+             registros/s, latência p50/p99 por request, pico de
+             RSS e número de requests
+Author: FlertAI Team
+Date: 2025-10-06
+=====================================================
+
+Uso:
+    python benchmark.py
+
+Configuração via ambiente (ver .env.example): BENCHMARK_SIZES,
+BENCHMARK_STRATEGIES, BENCHMARK_BASELINE etc. A latência simulada vem
+de LOCAL_BACKEND_LATENCY_MS / LOCAL_BACKEND_ROW_LATENCY_US.
+"""
+
+import json
+import logging
+import os
+import random
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import Callable, Dict, List, Optional
+
+from dotenv import load_dotenv
+
+# Nunca toca no Supabase: tudo roda no backend local, em memória
+load_dotenv()
+os.environ['STORAGE_BACKEND'] = 'local'
+os.environ['LOCAL_BACKEND_PATH'] = ''
+os.environ['REJECT_FILE'] = ''
+os.environ['CHECKPOINT_FILE'] = ''
+os.environ['HTTP_CACHE_DIR'] = ''
+os.environ['MAX_TOTAL_RECORDS'] = str(sys.maxsize)
+os.environ.setdefault('TQDM_DISABLE', '1')
+
+import numpy as np
+
+from local_backend import LocalBackend, LocalQuery, LocalResponse
+from records import CulturalReference
+from seed_data import iter_seed_records
+
+# =====================================================
+# CONFIGURATION
+# =====================================================
+
+BENCHMARK_SIZES = [int(size) for size in os.getenv('BENCHMARK_SIZES', '1000,100000,1000000').split(',') if size]
+BENCHMARK_STRATEGIES = [name.strip() for name in os.getenv('BENCHMARK_STRATEGIES', 'row,batch,upsert,bulk').split(',') if name.strip()]
+BENCHMARK_SEED = int(os.getenv('BENCHMARK_SEED', 42))
+# Estratégia row acima disso fica de fora (um request por registro)
+BENCHMARK_ROW_MAX = int(os.getenv('BENCHMARK_ROW_MAX', 100000))
+BENCHMARK_OUTPUT = os.getenv('BENCHMARK_OUTPUT', 'benchmark_results.json')
+# Resultado anterior para comparar; queda de registros/s acima da tolerância é regressão
+BENCHMARK_BASELINE = os.getenv('BENCHMARK_BASELINE')
+BENCHMARK_TOLERANCE = float(os.getenv('BENCHMARK_TOLERANCE', 0.2))
+
+logger = logging.getLogger(__name__)
+
+# =====================================================
+# CORPUS
+# =====================================================
+
+def synthetic_corpus(size: int, seed: int = BENCHMARK_SEED) -> List[CulturalReference]:
+    """
+    Gera `size` referências únicas no formato do seed
+
+    Cada registro copia tipo, região e textos de um registro do seed
+    sorteado (mesma distribuição e tamanho de payload) com um termo
+    único. O mesmo seed gera sempre o mesmo corpus.
+    """
+    templates = list(iter_seed_records())
+    rng = random.Random(seed)
+    corpus = []
+    for i in range(size):
+        template = rng.choice(templates)
+        corpus.append(CulturalReference(
+            f"{template.termo} {i}",
+            template.tipo,
+            template.significado,
+            template.exemplo_uso,
+            template.regiao,
+            template.contexto_flerte,
+        ))
+    return corpus
+
+# =====================================================
+# BACKEND
+# =====================================================
+
+class TimedBackend(LocalBackend):
+    """Backend local que guarda a latência de cada request"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.latencies: List[float] = []
+
+    def execute(self, query: LocalQuery) -> LocalResponse:
+        start = time.perf_counter()
+        try:
+            return super().execute(query)
+        finally:
+            self.latencies.append(time.perf_counter() - start)
+
+    def execute_rpc(self, name: str, params: Dict) -> LocalResponse:
+        start = time.perf_counter()
+        try:
+            return super().execute_rpc(name, params)
+        finally:
+            self.latencies.append(time.perf_counter() - start)
+
+# =====================================================
+# STRATEGIES
+# =====================================================
+
+Strategy = Callable[[List[CulturalReference]], int]
+
+
+def setup_row(backend: TimedBackend) -> Strategy:
+    """Um insert por registro (SupabaseClient.insert_cultural_reference)"""
+    from scraper import SupabaseClient
+    client = SupabaseClient(insert_mode='insert')
+    client.client = backend
+    return lambda corpus: sum(client.insert_cultural_reference(record.to_payload()) for record in corpus)
+
+
+def _setup_orchestrator(backend: TimedBackend, mode: str) -> Strategy:
+    from scraper import ScraperOrchestrator
+    orchestrator = ScraperOrchestrator()
+    orchestrator.db_client.client = backend
+    orchestrator.db_client.insert_mode = mode
+    return orchestrator.insert_to_database
+
+
+def setup_batch(backend: TimedBackend) -> Strategy:
+    """ScraperOrchestrator.insert_to_database com INSERT_MODE=insert"""
+    return _setup_orchestrator(backend, 'insert')
+
+
+def setup_upsert(backend: TimedBackend) -> Strategy:
+    """ScraperOrchestrator.insert_to_database com INSERT_MODE=upsert"""
+    return _setup_orchestrator(backend, 'upsert')
+
+
+def _setup_seed(backend: TimedBackend, mode: str) -> Strategy:
+    from insert_seed_data import SeedInserter
+    inserter = SeedInserter()
+    inserter.client = backend
+
+    def run(corpus: List[CulturalReference]) -> int:
+        inserter.insert_seed_data(corpus, mode=mode)
+        return inserter.inserted_count
+    return run
+
+
+def setup_bulk(backend: TimedBackend) -> Strategy:
+    """SeedInserter.insert_seed_data com INSERT_MODE=bulk (RPC)"""
+    return _setup_seed(backend, 'bulk')
+
+
+def setup_seed(backend: TimedBackend) -> Strategy:
+    """SeedInserter.insert_seed_data completo (leitura dos existentes + filtro)"""
+    return _setup_seed(backend, 'insert')
+
+
+# Cada estratégia prepara clientes/imports fora da medição e devolve o run
+STRATEGIES: Dict[str, Callable[[TimedBackend], Strategy]] = {
+    'row': setup_row,
+    'batch': setup_batch,
+    'upsert': setup_upsert,
+    'bulk': setup_bulk,
+    'seed': setup_seed,
+}
+
+# =====================================================
+# RUNNER
+# =====================================================
+
+def run_case(strategy: str, size: int) -> Dict:
+    """
+    Roda uma estratégia com um corpus de `size` registros
+
+    Chamado em um processo novo para cada caso, para que o pico de RSS
+    seja só deste caso.
+    """
+    logging.disable(logging.INFO)  # Log por batch distorce a medição
+    corpus = synthetic_corpus(size)
+    defaults = LocalBackend.from_env()
+    backend = TimedBackend(latency=defaults.latency, row_latency=defaults.row_latency)
+
+    run = STRATEGIES[strategy](backend)
+
+    start = time.perf_counter()
+    written = run(corpus)
+    elapsed = time.perf_counter() - start
+
+    latencies = np.array(backend.latencies) * 1000
+    return {
+        'strategy': strategy,
+        'size': size,
+        'written': written,
+        'elapsed_s': round(elapsed, 3),
+        'records_per_s': round(written / elapsed, 1) if elapsed else 0.0,
+        'p50_ms': round(float(np.percentile(latencies, 50)), 3) if latencies.size else None,
+        'p99_ms': round(float(np.percentile(latencies, 99)), 3) if latencies.size else None,
+        'requests': backend.request_count,
+        # ru_maxrss em KB no Linux (bytes no macOS)
+        'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+                             / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1),
+    }
+
+
+def compare_with_baseline(results: List[Dict], path: str, tolerance: float) -> List[str]:
+    """Casos cujo registros/s caiu mais que `tolerance` em relação ao baseline"""
+    with open(path, 'r', encoding='utf-8') as f:
+        baseline = {(r['strategy'], r['size']): r for r in json.load(f)['results']}
+    regressions = []
+    for result in results:
+        previous = baseline.get((result['strategy'], result['size']))
+        if not previous or not previous['records_per_s']:
+            continue
+        change = result['records_per_s'] / previous['records_per_s'] - 1
+        if change < -tolerance:
+            regressions.append(f"{result['strategy']}/{result['size']}: "
+                               f"{previous['records_per_s']:.0f} -> {result['records_per_s']:.0f} rec/s "
+                               f"({change:+.0%})")
+    return regressions
+
+
+def print_table(results: List[Dict]):
+    header = f"{'strategy':<8} {'size':>9} {'rec/s':>11} {'p50 ms':>9} {'p99 ms':>9} {'requests':>9} {'RSS MB':>8}"
+    print(header)
+    print('-' * len(header))
+    for r in results:
+        p50 = f"{r['p50_ms']:.3f}" if r['p50_ms'] is not None else '-'
+        p99 = f"{r['p99_ms']:.3f}" if r['p99_ms'] is not None else '-'
+        print(f"{r['strategy']:<8} {r['size']:>9} {r['records_per_s']:>11.0f} {p50:>9} {p99:>9} "
+              f"{r['requests']:>9} {r['peak_rss_mb']:>8.1f}")
+
+
+def main(sizes: Optional[List[int]] = None, strategies: Optional[List[str]] = None) -> List[Dict]:
+    """Roda todos os casos e grava o resultado em BENCHMARK_OUTPUT"""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    sizes = sizes or BENCHMARK_SIZES
+    strategies = strategies or BENCHMARK_STRATEGIES
+    unknown = [name for name in strategies if name not in STRATEGIES]
+    if unknown:
+        raise ValueError(f"Unknown strategies {unknown}; choose from {list(STRATEGIES)}")
+
+    results = []
+    for size in sizes:
+        for strategy in strategies:
+            if strategy == 'row' and size > BENCHMARK_ROW_MAX:
+                logger.info(f"Skipping row/{size}: above BENCHMARK_ROW_MAX={BENCHMARK_ROW_MAX}")
+                continue
+            logger.info(f"Running {strategy}/{size}...")
+            with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as pool:
+                result = pool.submit(run_case, strategy, size).result()
+            logger.info(f"{strategy}/{size}: {result['records_per_s']:.0f} rec/s, "
+                        f"{result['requests']} requests")
+            results.append(result)
+
+    print()
+    print_table(results)
+
+    report = {
+        'generated_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'latency_ms': float(os.getenv('LOCAL_BACKEND_LATENCY_MS', 0)),
+        'row_latency_us': float(os.getenv('LOCAL_BACKEND_ROW_LATENCY_US', 0)),
+        'results': results,
+    }
+    if BENCHMARK_OUTPUT:
+        with open(BENCHMARK_OUTPUT, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        logger.info(f"Results saved to {BENCHMARK_OUTPUT}")
+
+    if BENCHMARK_BASELINE:
+        regressions = compare_with_baseline(results, BENCHMARK_BASELINE, BENCHMARK_TOLERANCE)
+        for line in regressions:
+            logger.warning(f"Regression: {line}")
+        if regressions:
+            sys.exit(1)
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+=====================================================
+BULK LOADER
+=====================================================
+Description: Carga em massa de cultural_references: registros
+             enviados em arrays grandes para a RPC
+             bulk_load_cultural_references ou, com DATABASE_URL,
+             via COPY em CSV para uma tabela de staging e um
+             único INSERT ... ON CONFLICT
+Author: FlertAI Team
+Date: 2025-10-06
+=====================================================
+"""
+
+import csv
+import io
+import logging
+from itertools import islice
+from typing import Iterable, Iterator
+
+from records import FIELDS, Record, as_payload
+
+try:
+    import psycopg
+except ImportError:  # Dependência opcional (só para o caminho COPY)
+    psycopg = None
+
+logger = logging.getLogger(__name__)
+
+# Função da migration 20251006_add_bulk_load_cultural_references.sql
+BULK_RPC = 'bulk_load_cultural_references'
+
+COLUMNS = ', '.join(FIELDS)
+
+CREATE_STAGING_SQL = f"""
+    CREATE TEMP TABLE cultural_references_staging (
+        ord BIGSERIAL,
+        {', '.join(f'{field} TEXT' for field in FIELDS)}
+    ) ON COMMIT DROP
+"""
+
+COPY_SQL = f"COPY cultural_references_staging ({COLUMNS}) FROM STDIN WITH (FORMAT csv)"
+
+# Mesma regra da RPC: primeira ocorrência de cada termo, conflito com o banco
+# resolvido por ON CONFLICT (termo)
+MERGE_SQL = f"""
+    INSERT INTO cultural_references ({COLUMNS})
+    SELECT DISTINCT ON (termo)
+        termo, tipo, significado, exemplo_uso, COALESCE(regiao, 'nacional'), contexto_flerte
+    FROM cultural_references_staging
+    ORDER BY termo, ord
+    ON CONFLICT (termo) DO {{action}}
+"""
+
+MERGE_UPDATE = 'UPDATE SET ' + ', '.join(
+    f'{field} = EXCLUDED.{field}' for field in FIELDS if field != 'termo'
+)
+
+
+def copy_available() -> bool:
+    """True se o driver do caminho COPY (psycopg 3) está instalado"""
+    return psycopg is not None
+
+
+def iter_csv_chunks(records: Iterable[Record], rows_per_chunk: int = 5000) -> Iterator[str]:
+    """
+    Serializa os registros em CSV (colunas de FIELDS), em blocos
+
+    None vira campo vazio sem aspas, que o COPY ... (FORMAT csv) lê
+    como NULL.
+
+    Args:
+        records: Registros a serializar
+        rows_per_chunk: Linhas por bloco de texto
+
+    Returns:
+        Iterator[str]: Blocos de CSV prontos para o COPY
+    """
+    iterator = iter(records)
+    while True:
+        batch = list(islice(iterator, rows_per_chunk))
+        if not batch:
+            return
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator='\n')
+        for record in batch:
+            payload = as_payload(record)
+            writer.writerow([payload.get(field) for field in FIELDS])
+        yield buffer.getvalue()
+
+
+class CopyBulkLoader:
+    """
+    Carga via COPY direto no Postgres (DATABASE_URL)
+
+    Tudo roda em uma transação: se alguma linha violar uma constraint
+    no INSERT final, nada é gravado e o erro sobe para quem chamou.
+    """
+
+    def __init__(self, dsn: str, rows_per_chunk: int = 5000):
+        if psycopg is None:
+            raise RuntimeError("psycopg is required for COPY bulk loads (pip install 'psycopg[binary]')")
+        self.dsn = dsn
+        self.rows_per_chunk = rows_per_chunk
+
+    def load(self, records: Iterable[Record], merge: bool = False) -> int:
+        """
+        Grava os registros em cultural_references
+
+        Args:
+            records: Registros (lidos sob demanda, podem vir de um gerador)
+            merge: True atualiza termos existentes; False os mantém
+
+        Returns:
+            int: Linhas inseridas ou atualizadas
+        """
+        action = MERGE_UPDATE if merge else 'NOTHING'
+        with psycopg.connect(self.dsn) as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(CREATE_STAGING_SQL)
+                with cursor.copy(COPY_SQL) as copy:
+                    for chunk in iter_csv_chunks(records, self.rows_per_chunk):
+                        copy.write(chunk)
+                logger.info("Staging loaded via COPY, merging into cultural_references")
+                cursor.execute(MERGE_SQL.format(action=action))
+                return cursor.rowcount
@@ -0,0 +1,157 @@
+"""
+=====================================================
+CRAWL CHECKPOINT
+=====================================================
+Description: Estado persistente do crawl em SQLite, para retomar
+             uma execução interrompida de onde ela parou
+Author: FlertAI Team
+Date: 2025-10-01
+=====================================================
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, Iterator, List, Set
+
+from records import CulturalReference, Record, as_payload
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS visited_urls (
+    url TEXT PRIMARY KEY,
+    visited_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS completed_scrapers (
+    name TEXT PRIMARY KEY,
+    completed_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS records (
+    termo TEXT PRIMARY KEY,
+    payload TEXT NOT NULL,
+    inserted INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS batches (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    size INTEGER NOT NULL,
+    inserted INTEGER NOT NULL,
+    created_at REAL NOT NULL
+);
+"""
+
+
+class CrawlCheckpoint:
+    """
+    Journal do crawl: URLs visitadas, scrapers concluídos, registros
+    gerados e batches inseridos
+
+    Registros entram como pendentes quando passam pela validação e são
+    marcados como inseridos quando o batch deles vai para o banco. Ao
+    retomar, os pendentes são reenfileirados e os inseridos entram no
+    conjunto de termos conhecidos, sem refazer fetch nem dedup.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    def _write(self, sql: str, rows: Iterable[tuple]):
+        with self._lock:
+            self._conn.executemany(sql, rows)
+            self._conn.commit()
+
+    def _read(self, sql: str, params: tuple = ()) -> List[tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    # URLs -------------------------------------------------
+
+    def is_visited(self, url: str) -> bool:
+        """Verifica se a URL já foi processada"""
+        return bool(self._read("SELECT 1 FROM visited_urls WHERE url = ?", (url,)))
+
+    def mark_visited(self, urls: Iterable[str]):
+        """Marca URLs como processadas"""
+        now = time.time()
+        self._write("INSERT OR IGNORE INTO visited_urls (url, visited_at) VALUES (?, ?)",
+                    ((url, now) for url in urls))
+
+    # Scrapers ---------------------------------------------
+
+    def is_scraper_done(self, name: str) -> bool:
+        """Verifica se o scraper já terminou numa execução anterior"""
+        return bool(self._read("SELECT 1 FROM completed_scrapers WHERE name = ?", (name,)))
+
+    def mark_scraper_done(self, name: str):
+        """Marca o scraper como concluído"""
+        self._write("INSERT OR REPLACE INTO completed_scrapers (name, completed_at) VALUES (?, ?)",
+                    [(name, time.time())])
+
+    # Records ----------------------------------------------
+
+    def add_records(self, records: Iterable[Record]):
+        """Registra dados validados ainda não inseridos"""
+        self._write("INSERT OR IGNORE INTO records (termo, payload) VALUES (?, ?)",
+                    ((data['termo'], json.dumps(as_payload(data), ensure_ascii=False)) for data in records))
+
+    def pending_records(self) -> Iterator[CulturalReference]:
+        """Registros gerados numa execução anterior e ainda não inseridos"""
+        rows = self._read("SELECT payload FROM records WHERE inserted = 0 ORDER BY rowid")
+        for (payload,) in rows:
+            yield CulturalReference.from_dict(json.loads(payload))
+
+    def inserted_terms(self) -> Set[str]:
+        """Termos cujos batches já foram enviados ao banco"""
+        return {termo for (termo,) in self._read("SELECT termo FROM records WHERE inserted = 1")}
+
+    def mark_inserted(self, batch: List[Record], inserted: int):
+        """
+        Registra um batch enviado ao banco
+
+        Os registros só são marcados como inseridos quando o batch entrou
+        inteiro. Com falha parcial ou total ficam pendentes: não se sabe
+        quais linhas entraram, e ao retomar os que já estão no banco são
+        descartados (ver mark_terms_inserted).
+        """
+        with self._lock:
+            if inserted >= len(batch):
+                self._conn.executemany("UPDATE records SET inserted = 1 WHERE termo = ?",
+                                       ((data['termo'],) for data in batch))
+            self._conn.execute("INSERT INTO batches (size, inserted, created_at) VALUES (?, ?, ?)",
+                               (len(batch), inserted, time.time()))
+            self._conn.commit()
+
+    def mark_terms_inserted(self, termos: Iterable[str]):
+        """Marca como inseridos registros pendentes que já estão no banco"""
+        self._write("UPDATE records SET inserted = 1 WHERE termo = ?", ((termo,) for termo in termos))
+
+    # Lifecycle --------------------------------------------
+
+    def summary(self) -> Dict[str, int]:
+        """Contadores do checkpoint (para log ao retomar)"""
+        return {
+            'visited_urls': self._read("SELECT COUNT(*) FROM visited_urls")[0][0],
+            'completed_scrapers': self._read("SELECT COUNT(*) FROM completed_scrapers")[0][0],
+            'pending_records': self._read("SELECT COUNT(*) FROM records WHERE inserted = 0")[0][0],
+            'inserted_records': self._read("SELECT COUNT(*) FROM records WHERE inserted = 1")[0][0],
+            'batches': self._read("SELECT COUNT(*) FROM batches")[0][0],
+        }
+
+    def clear(self):
+        """Descarta o estado (execução concluída com sucesso)"""
+        with self._lock:
+            for table in ('visited_urls', 'completed_scrapers', 'records', 'batches'):
+                self._conn.execute(f"DELETE FROM {table}")
+            self._conn.commit()
+        logger.info("Checkpoint cleared")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,178 @@
+"""
+=====================================================
+NEAR-DUPLICATE INDEX
+=====================================================
+Description: Índice de quase-duplicatas para termos culturais:
+             chave normalizada (sem acento, caixa, espaços e
+             marcadores de gênero) + MinHash/LSH sobre trigramas
+Author: FlertAI Team
+Date: 2025-10-01
+=====================================================
+"""
+
+import random
+import re
+import unicodedata
+import zlib
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+import numpy as np
+
+# Marcadores de gênero/plural: "Gato(a)", "Amigo(as)", "Lindo/a"
+_GENDER_MARKER_RE = re.compile(r'\((?:a|o|as|os|e|es)\)|/(?:a|o)\b')
+_NON_ALNUM_RE = re.compile(r'[^0-9a-z]+')
+_WORD_RE = re.compile(r'[0-9a-z]{3,}')
+
+_SHIFT = np.uint64(32)
+
+
+def fold_accents(text: str) -> str:
+    """Remove acentos e passa para minúsculas ("Música" → "musica")"""
+    decomposed = unicodedata.normalize('NFKD', text.lower())
+    return ''.join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def normalize_term(termo: str) -> str:
+    """
+    Chave canônica de um termo
+
+    "Gato(a)" → "gato", "Da hora" → "dahora", "Tá ligado?" → "taligado"
+
+    Args:
+        termo: Termo original
+
+    Returns:
+        str: Chave sem acentos, caixa, pontuação, espaços e marcadores de gênero
+    """
+    folded = fold_accents(termo or '')
+    folded = _GENDER_MARKER_RE.sub('', folded)
+    return _NON_ALNUM_RE.sub('', folded)
+
+
+def term_shingles(key: str, size: int = 3) -> FrozenSet[str]:
+    """Trigramas de caractere da chave, com marcadores de início/fim"""
+    padded = f"^{key}$"
+    if len(padded) <= size:
+        return frozenset({padded})
+    return frozenset(padded[i:i+size] for i in range(len(padded) - size + 1))
+
+
+def meaning_words(significado: str) -> FrozenSet[str]:
+    """Palavras (3+ letras, sem acento) do significado"""
+    return frozenset(_WORD_RE.findall(fold_accents(significado or '')))
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class NearDuplicateIndex:
+    """
+    Índice em memória de termos para detectar variantes
+
+    Uma consulta é duplicata se a chave normalizada já existe, ou se um
+    candidato do LSH tem similaridade de trigramas >= term_threshold e,
+    quando os dois têm significado, pelo menos meaning_threshold de
+    palavras em comum (evita juntar "Mano" e "Mana"). O custo por
+    consulta é constante: num_perm hashes (vetorizados com NumPy) +
+    bands lookups em dict.
+    """
+
+    def __init__(self, term_threshold: float = 0.8, meaning_threshold: float = 0.2,
+                 num_perm: int = 16, bands: int = 4, seed: int = 42):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.term_threshold = term_threshold
+        self.meaning_threshold = meaning_threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+
+        # Hash multiply-shift: h_i(x) = (a_i * x + b_i) mod 2^64 >> 32
+        rng = random.Random(seed)
+        self._a = np.array([rng.getrandbits(64) | 1 for _ in range(num_perm)], dtype=np.uint64)[:, None]
+        self._b = np.array([rng.getrandbits(64) for _ in range(num_perm)], dtype=np.uint64)[:, None]
+
+        self._keys: Dict[str, int] = {}
+        self._entries: List[Tuple[str, str, str]] = []  # (termo, chave, significado)
+        self._buckets: List[Dict[int, List[int]]] = [{} for _ in range(bands)]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, termo: str) -> bool:
+        return self.find(termo) is not None
+
+    def _signature(self, shingles: FrozenSet[str]) -> List[int]:
+        hashes = np.fromiter((zlib.crc32(s.encode('utf-8')) for s in shingles),
+                             dtype=np.uint64, count=len(shingles))
+        return ((self._a * hashes + self._b) >> _SHIFT).min(axis=1).tolist()
+
+    def _band_keys(self, shingles: FrozenSet[str]) -> List[int]:
+        signature = self._signature(shingles)
+        rows = self.rows
+        return [hash(tuple(signature[i*rows:(i+1)*rows])) for i in range(self.bands)]
+
+    def find(self, termo: str, significado: str = '') -> Optional[str]:
+        """
+        Procura um termo equivalente já indexado
+
+        Args:
+            termo: Termo candidato
+            significado: Significado do candidato (refina a comparação)
+
+        Returns:
+            Optional[str]: Termo já indexado equivalente, ou None
+        """
+        key = normalize_term(termo)
+        if not key:
+            return None
+        if key in self._keys:
+            return self._entries[self._keys[key]][0]
+
+        shingles = term_shingles(key)
+        words = meaning_words(significado) if significado else None
+        seen = set()
+        for band, band_key in enumerate(self._band_keys(shingles)):
+            for entry_id in self._buckets[band].get(band_key, ()):
+                if entry_id in seen:
+                    continue
+                seen.add(entry_id)
+                other_termo, other_key, other_meaning = self._entries[entry_id]
+                if jaccard(shingles, term_shingles(other_key)) < self.term_threshold:
+                    continue
+                if words and other_meaning and \
+                        jaccard(words, meaning_words(other_meaning)) < self.meaning_threshold:
+                    continue
+                return other_termo
+        return None
+
+    def add(self, termo: str, significado: str = '') -> bool:
+        """
+        Indexa um termo
+
+        Returns:
+            bool: False se a chave normalizada já estava indexada
+        """
+        key = normalize_term(termo)
+        if not key or key in self._keys:
+            return False
+        entry_id = len(self._entries)
+        self._entries.append((termo, key, significado or ''))
+        self._keys[key] = entry_id
+        for band, band_key in enumerate(self._band_keys(term_shingles(key))):
+            self._buckets[band].setdefault(band_key, []).append(entry_id)
+        return True
+
+    def check_and_add(self, termo: str, significado: str = '') -> Optional[str]:
+        """
+        Retorna o termo equivalente se houver; senão indexa o novo termo
+
+        Returns:
+            Optional[str]: Termo equivalente já indexado, ou None se era novo
+        """
+        match = self.find(termo, significado)
+        if match is None:
+            self.add(termo, significado)
+        return match
@@ -0,0 +1,161 @@
+"""
+=====================================================
+ASYNC FETCH ENGINE
+=====================================================
+Description: Engine assíncrono de download para os scrapers, com
+             pool de conexões HTTP, limite global de concorrência
+             e politeness por host
+Author: FlertAI Team
+Date: 2025-10-01
+=====================================================
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, Iterable, Optional
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from http_cache import ResponseCache
+from metrics import PipelineMetrics
+from rate_limiter import HostRateLimiter, RetryPolicy, parse_retry_after
+
+logger = logging.getLogger(__name__)
+
+# =====================================================
+# ENGINE
+# =====================================================
+
+class AsyncFetchEngine:
+    """
+    Baixa muitas páginas em paralelo respeitando limites por host
+
+    A taxa de cada host é controlada pelo seu próprio token bucket,
+    então sites diferentes não esperam uns pelos outros.
+    """
+
+    def __init__(self, max_concurrency: int = 50, per_host_concurrency: int = 2,
+                 rate_limiter: Optional[HostRateLimiter] = None,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 cache: Optional[ResponseCache] = None,
+                 timeout: float = 30, headers: Optional[Dict[str, str]] = None,
+                 metrics: Optional[PipelineMetrics] = None):
+        self.max_concurrency = max_concurrency
+        self.per_host_concurrency = per_host_concurrency
+        self.rate_limiter = rate_limiter or HostRateLimiter()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.cache = cache
+        self.timeout = timeout
+        self.headers = headers or {}
+        self.metrics = metrics or PipelineMetrics()
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def _host_semaphore(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc
+        if host not in self._host_semaphores:
+            self._host_semaphores[host] = asyncio.Semaphore(self.per_host_concurrency)
+        return self._host_semaphores[host]
+
+    async def fetch(self, session: aiohttp.ClientSession, url: str) -> Optional[bytes]:
+        """
+        Baixa uma página, repetindo apenas erros temporários
+
+        Args:
+            session: Sessão HTTP compartilhada (pool de conexões)
+            url: URL a baixar
+
+        Returns:
+            Optional[bytes]: Corpo da resposta ou None em caso de erro
+        """
+        semaphore = self._host_semaphore(url)
+        policy = self.retry_policy
+        metrics = self.metrics
+
+        for attempt in range(policy.max_retries):
+            retry_after = None
+            async with semaphore:
+                headers = self.cache.conditional_headers(url) if self.cache else {}
+                while True:
+                    await self.rate_limiter.acquire_async(url)
+                    start = time.perf_counter()
+                    try:
+                        logger.debug(f"Fetching: {url}")
+                        async with session.get(url, headers=headers) as response:
+                            header = response.headers.get('Retry-After')
+                            self.rate_limiter.on_response(url, response.status, header)
+                            if response.status == 304 and self.cache:
+                                metrics.observe_fetch(url, time.perf_counter() - start, 304)
+                                body = self.cache.load(url)
+                                if body is not None:
+                                    metrics.incr('cache_hits')
+                                    return body
+                                if headers:
+                                    # Entrada expirou entre o request e a leitura: pede a
+                                    # página inteira, sem gastar uma tentativa
+                                    logger.debug(f"Cache entry gone after 304, refetching: {url}")
+                                    headers = {}
+                                    continue
+                                error = "HTTP 304 without a cached entry"
+                                break
+                            if response.status < 400:
+                                body = await response.read()
+                                metrics.observe_fetch(url, time.perf_counter() - start, response.status, len(body))
+                                if self.cache:
+                                    self.cache.store(url, body, response.headers)
+                                return body
+                            metrics.observe_fetch(url, time.perf_counter() - start, response.status)
+                            error = f"HTTP {response.status}"
+                            if not policy.is_retryable_status(response.status):
+                                logger.error(f"Error fetching {url}: {error}")
+                                return None
+                            retry_after = parse_retry_after(header)
+                    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                        metrics.observe_fetch(url, time.perf_counter() - start, None)
+                        error = e
+                    break
+
+            if attempt + 1 >= policy.max_retries:
+                logger.error(f"Error fetching {url}: {error}")
+                return None
+            delay = policy.backoff(attempt, retry_after)
+            logger.warning(f"Retrying {url} in {delay:.1f}s: {error}")
+            metrics.record_retry(url)
+            await asyncio.sleep(delay)
+
+        return None
+
+    async def fetch_all(self, urls: Iterable[str]) -> Dict[str, Optional[bytes]]:
+        """
+        Baixa todas as URLs concorrentemente
+
+        Args:
+            urls: URLs a baixar
+
+        Returns:
+            Dict[str, Optional[bytes]]: Corpo de cada URL (None se falhou)
+        """
+        urls = list(dict.fromkeys(urls))
+        # Os semáforos pertencem ao event loop corrente
+        self._host_semaphores = {}
+
+        connector = aiohttp.TCPConnector(
+            limit=self.max_concurrency,
+            limit_per_host=self.per_host_concurrency,
+        )
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout,
+                                         headers=self.headers) as session:
+            bodies = await asyncio.gather(*(self.fetch(session, url) for url in urls))
+
+        return dict(zip(urls, bodies))
+
+    def run(self, urls: Iterable[str]) -> Dict[str, Optional[bytes]]:
+        """Versão síncrona de fetch_all, para código fora de um event loop"""
+        start = time.perf_counter()
+        bodies = asyncio.run(self.fetch_all(urls))
+        fetched = sum(body is not None for body in bodies.values())
+        self.metrics.add_stage_time('fetch', time.perf_counter() - start, fetched)
+        return bodies
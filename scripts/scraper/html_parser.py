@@ -0,0 +1,97 @@
+"""
+=====================================================
+HTML PARSER BACKENDS
+=====================================================
+Description: Parsing de HTML direto dos bytes da resposta, com
+             backend selecionável (lxml, html.parser, html5lib ou
+             selectolax) e extração apenas dos nós de interesse
+Author: FlertAI Team
+Date: 2025-10-01
+=====================================================
+"""
+
+import logging
+from typing import List, Optional
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    from selectolax.parser import HTMLParser as SelectolaxParser
+except ImportError:  # Dependência opcional
+    SelectolaxParser = None
+
+try:
+    import lxml  # noqa: F401
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Tree builders aceitos pelo BeautifulSoup
+SOUP_BACKENDS = ('lxml', 'html.parser', 'html5lib')
+BACKENDS = SOUP_BACKENDS + ('selectolax',)
+
+
+def resolve_backend(backend: str) -> str:
+    """
+    Valida o backend pedido e cai para o melhor disponível
+
+    Args:
+        backend: Nome do backend (PARSER_BACKEND)
+
+    Returns:
+        str: Backend efetivamente utilizável
+    """
+    if backend not in BACKENDS:
+        logger.warning(f"Unknown parser backend '{backend}', using lxml")
+        backend = 'lxml'
+    if backend == 'selectolax' and SelectolaxParser is None:
+        logger.warning("selectolax not installed, using lxml")
+        backend = 'lxml'
+    if backend == 'lxml' and not LXML_AVAILABLE:
+        logger.warning("lxml not installed, using html.parser")
+        backend = 'html.parser'
+    return backend
+
+
+def parse_html(content: bytes, backend: str = 'lxml',
+               parse_only: Optional[SoupStrainer] = None) -> BeautifulSoup:
+    """
+    Monta o BeautifulSoup direto dos bytes, sem decodificar para str antes
+
+    Args:
+        content: Corpo bruto da resposta
+        backend: Tree builder; selectolax não gera soup e usa lxml aqui
+        parse_only: Se informado, só os nós que casam entram na árvore
+
+    Returns:
+        BeautifulSoup: Documento parsed
+    """
+    builder = backend if backend in SOUP_BACKENDS else 'lxml'
+    return BeautifulSoup(content, builder, parse_only=parse_only, from_encoding='utf-8')
+
+
+def select_text(content: bytes, selector: str, backend: str = 'lxml',
+                parse_only: Optional[SoupStrainer] = None) -> List[str]:
+    """
+    Extrai o texto dos nós que casam com um seletor CSS
+
+    Com selectolax não há árvore Python: o seletor roda no parser em C
+    e só o texto dos nós encontrados é materializado.
+
+    Args:
+        content: Corpo bruto da resposta
+        selector: Seletor CSS (ex.: 'div.verbete h3')
+        backend: Backend de parsing
+        parse_only: Restringe a árvore do BeautifulSoup (ignorado no selectolax)
+
+    Returns:
+        List[str]: Texto de cada nó encontrado
+    """
+    if backend == 'selectolax' and SelectolaxParser is not None:
+        tree = SelectolaxParser(content)
+        return [node.text(separator=' ', strip=True) for node in tree.css(selector)]
+
+    soup = parse_html(content, backend, parse_only)
+    return [element.get_text(' ', strip=True) for element in soup.select(selector)]
@@ -0,0 +1,191 @@
+"""
+=====================================================
+HTTP RESPONSE CACHE
+=====================================================
+Description: Cache persistente de respostas HTTP em disco, com
+             GET condicional (ETag / Last-Modified), expiração
+             por TTL e limite de tamanho (LRU)
+Author: FlertAI Team
+Date: 2025-10-01
+=====================================================
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """
+    Cache de páginas em disco, chaveado por URL
+
+    Cada entrada tem dois arquivos: `<sha256>.body` com o corpo bruto e
+    `<sha256>.json` com os validadores. Só respostas com ETag ou
+    Last-Modified são guardadas, pois são as únicas revalidáveis.
+    """
+
+    def __init__(self, directory: str, ttl_seconds: float = 7 * 24 * 3600,
+                 max_bytes: int = 500 * 1024 * 1024):
+        self.directory = directory
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def _paths(self, url: str) -> Tuple[str, str]:
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        base = os.path.join(self.directory, key)
+        return base + '.body', base + '.json'
+
+    def _write_atomic(self, path: str, data: bytes):
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def _load_meta(self, url: str) -> Optional[Dict]:
+        body_path, meta_path = self._paths(url)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() - meta.get('stored_at', 0) > self.ttl_seconds or not os.path.exists(body_path):
+            self.delete(url)
+            return None
+        return meta
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """
+        Headers de GET condicional para a URL
+
+        Returns:
+            Dict[str, str]: If-None-Match / If-Modified-Since (vazio se não há entrada)
+        """
+        meta = self._load_meta(url)
+        if not meta:
+            return {}
+        headers = {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        return headers
+
+    def load(self, url: str) -> Optional[bytes]:
+        """
+        Lê o corpo guardado (usado após um 304) e renova a entrada
+
+        Returns:
+            Optional[bytes]: Corpo em cache ou None se expirou/não existe
+        """
+        meta = self._load_meta(url)
+        if not meta:
+            return None
+        body_path, meta_path = self._paths(url)
+        try:
+            with open(body_path, 'rb') as f:
+                body = f.read()
+        except OSError:
+            return None
+        meta['stored_at'] = time.time()
+        try:
+            self._write_atomic(meta_path, json.dumps(meta).encode('utf-8'))
+        except OSError as e:
+            # O corpo é válido; só a renovação do TTL fica para depois
+            logger.warning(f"Could not refresh cache entry for {url}: {e}")
+        logger.debug(f"Cache hit (304): {url}")
+        return body
+
+    def store(self, url: str, body: bytes, headers) -> bool:
+        """
+        Guarda uma resposta 200 se ela tiver validadores
+
+        Args:
+            url: URL da resposta
+            body: Corpo bruto
+            headers: Headers da resposta (mapping case-insensitive)
+
+        Returns:
+            bool: True se a resposta foi guardada
+        """
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return False
+
+        body_path, meta_path = self._paths(url)
+        meta = {
+            'url': url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'stored_at': time.time(),
+            'size': len(body),
+        }
+        try:
+            self._write_atomic(body_path, body)
+            self._write_atomic(meta_path, json.dumps(meta).encode('utf-8'))
+        except OSError as e:
+            logger.warning(f"Could not cache {url}: {e}")
+            return False
+        return True
+
+    def delete(self, url: str):
+        """Remove a entrada da URL"""
+        for path in self._paths(url):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"Could not remove cache file {path}: {e}")
+
+    def prune(self) -> int:
+        """
+        Remove entradas expiradas e, se preciso, as menos usadas até
+        caber em max_bytes
+
+        Returns:
+            int: Número de entradas removidas
+        """
+        now = time.time()
+        entries = []
+        removed = 0
+
+        for name in os.listdir(self.directory):
+            if not name.endswith('.json'):
+                continue
+            meta_path = os.path.join(self.directory, name)
+            body_path = meta_path[:-len('.json')] + '.body'
+            try:
+                with open(meta_path, 'r', encoding='utf-8') as f:
+                    meta = json.load(f)
+                size = os.path.getsize(body_path)
+            except (OSError, ValueError):
+                meta, size = {}, 0
+
+            if not meta or now - meta.get('stored_at', 0) > self.ttl_seconds:
+                for path in (meta_path, body_path):
+                    if os.path.exists(path):
+                        os.remove(path)
+                removed += 1
+            else:
+                entries.append((meta['stored_at'], size, meta_path, body_path))
+
+        total = sum(size for _, size, _, _ in entries)
+        for _, size, meta_path, body_path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            for path in (meta_path, body_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            total -= size
+            removed += 1
+
+        if removed:
+            logger.info(f"HTTP cache pruned: {removed} entries removed")
+        return removed
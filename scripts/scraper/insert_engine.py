@@ -0,0 +1,199 @@
+"""
+=====================================================
+INSERT ENGINE
+=====================================================
+Description: Envio de registros ao banco com workers concorrentes,
+             tamanho de batch adaptativo (latência, payload e erros)
+             e backoff só quando o servidor pede
+Author: FlertAI Team
+Date: 2025-10-01
+=====================================================
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from itertools import islice
+from typing import Callable, Iterable, List, Optional, Set, Tuple
+
+from batch_recovery import BisectionInterrupted, RejectLog, is_backpressure_error
+from metrics import PipelineMetrics
+from rate_limiter import RetryPolicy
+from records import Record, estimate_payload_bytes
+
+logger = logging.getLogger(__name__)
+
+BatchCallback = Callable[[List[Record], int], None]
+
+
+class AdaptiveBatchSizer:
+    """
+    Tamanho de batch AIMD guiado pela latência observada
+
+    Enquanto os batches respondem abaixo de target_latency, o tamanho
+    cresce de forma aditiva; acima disso encolhe na proporção do
+    excesso, e cai pela metade quando o servidor reclama. O tamanho
+    também é limitado para o payload não passar de max_payload_bytes.
+    """
+
+    def __init__(self, initial: int = 50, min_size: int = 10, max_size: int = 500,
+                 target_latency: float = 1.0, max_payload_bytes: int = 1024 * 1024):
+        self.min_size = min_size
+        self.max_size = max(max_size, min_size)
+        self.target_latency = target_latency
+        self.max_payload_bytes = max_payload_bytes
+        self.increment = max(1, initial // 2)
+        self._size = float(min(max(initial, min_size), self.max_size))
+        self._lock = threading.Lock()
+
+    def next_size(self) -> int:
+        """Tamanho do próximo batch"""
+        with self._lock:
+            return int(self._size)
+
+    def on_success(self, size: int, latency: float, payload_bytes: int):
+        """
+        Ajusta o tamanho a partir de um batch bem-sucedido
+
+        Args:
+            size: Registros no batch
+            latency: Tempo de resposta em segundos
+            payload_bytes: Tamanho do JSON enviado
+        """
+        with self._lock:
+            if latency <= self.target_latency:
+                new_size = self._size + self.increment
+            else:
+                new_size = size * self.target_latency / latency
+            if size and payload_bytes:
+                new_size = min(new_size, self.max_payload_bytes * size / payload_bytes)
+            self._size = min(max(new_size, self.min_size), self.max_size)
+
+    def on_backpressure(self):
+        """Servidor sobrecarregado: corta o tamanho pela metade"""
+        with self._lock:
+            self._size = max(self._size / 2, self.min_size)
+
+
+class InsertEngine:
+    """
+    Envia registros com alguns workers em paralelo sobre o mesmo cliente
+
+    `write` recebe um batch e retorna quantos registros foram gravados;
+    erros de linha são tratados por ele. Um erro de backpressure
+    (is_backpressure_error) que escapa de `write` é um pedido de
+    desaceleração: todos os workers param pelo tempo do backoff e o
+    batch é repetido. Sem isso não há nenhuma pausa entre batches.
+    BisectionInterrupted (backpressure no meio da bisseção) passa pelo
+    mesmo backoff, repetindo só os registros que faltaram. Qualquer
+    outra exceção é propagada para quem chamou run.
+    """
+
+    def __init__(self, write: Callable[[List[Record]], int], workers: int = 4,
+                 sizer: Optional[AdaptiveBatchSizer] = None,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 reject_log: Optional[RejectLog] = None,
+                 metrics: Optional[PipelineMetrics] = None):
+        self.write = write
+        self.workers = max(1, workers)
+        self.sizer = sizer or AdaptiveBatchSizer()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.reject_log = reject_log
+        self.metrics = metrics
+        self._resume_at = 0.0
+        self._lock = threading.Lock()
+
+    def _wait_for_resume(self):
+        while True:
+            with self._lock:
+                delay = self._resume_at - time.monotonic()
+            if delay <= 0:
+                return
+            time.sleep(delay)
+
+    def _pause(self, delay: float):
+        with self._lock:
+            self._resume_at = max(self._resume_at, time.monotonic() + delay)
+
+    def _write_batch(self, batch: List[Record]) -> Tuple[List[Record], int]:
+        policy = self.retry_policy
+        rows = batch
+        written = 0
+
+        for attempt in range(policy.max_retries):
+            self._wait_for_resume()
+            payload_bytes = estimate_payload_bytes(rows)
+            start = time.monotonic()
+            try:
+                count = self.write(rows)
+            except BisectionInterrupted as e:
+                # O que já foi gravado ou rejeitado não volta para o banco
+                written += e.inserted
+                rows = e.remaining
+                error = e.error
+            except Exception as e:
+                if not is_backpressure_error(e):
+                    raise
+                error = e
+            else:
+                latency = time.monotonic() - start
+                self.sizer.on_success(len(rows), latency, payload_bytes)
+                if self.metrics:
+                    self.metrics.add_stage_time('insert', latency, len(rows))
+                return batch, written + count
+
+            self.sizer.on_backpressure()
+            if self.metrics:
+                self.metrics.incr('insert_backpressure')
+            if attempt + 1 >= policy.max_retries:
+                logger.error(f"Giving up on {len(rows)} of {len(batch)} records: {error}")
+                if self.reject_log:
+                    for data in rows:
+                        self.reject_log.write(data, error)
+                return batch, written
+            delay = policy.backoff(attempt)
+            logger.warning(f"Server pushed back, pausing inserts for {delay:.1f}s: {error}")
+            self._pause(delay)
+
+        return batch, written
+
+    def run(self, records: Iterable[Record], on_batch: Optional[BatchCallback] = None) -> int:
+        """
+        Grava todos os registros
+
+        Os registros são consumidos sob demanda, então `records` pode ser
+        um gerador alimentado pelos scrapers.
+
+        Args:
+            records: Registros a gravar
+            on_batch: Chamado na thread de quem chamou run, com o batch e
+                      quantos registros dele foram gravados
+
+        Returns:
+            int: Total de registros gravados
+        """
+        iterator = iter(records)
+        in_flight: Set[Future] = set()
+        total = 0
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='insert') as pool:
+            exhausted = False
+            while not exhausted or in_flight:
+                if not exhausted and len(in_flight) < self.workers:
+                    batch = list(islice(iterator, self.sizer.next_size()))
+                    if batch:
+                        in_flight.add(pool.submit(self._write_batch, batch))
+                        continue
+                    exhausted = True
+                    if not in_flight:
+                        break
+
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    batch, count = future.result()
+                    total += count
+                    if on_batch:
+                        on_batch(batch, count)
+
+        return total
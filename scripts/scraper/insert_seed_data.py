@@ -12,13 +12,22 @@ import os
 import sys
 import time
 import logging
-from typing import List, Dict
+import threading
+from typing import Callable, Dict, Iterable, List
 from dotenv import load_dotenv
-from supabase import create_client, Client
+from supabase import Client
 from tqdm import tqdm
 
 # Import seed data
-from seed_data import get_seed_data
+from seed_data import iter_seed_records
+from batch_recovery import BisectionInterrupted, RejectLog, insert_with_bisection, is_backpressure_error
+from insert_engine import AdaptiveBatchSizer, InsertEngine
+from rate_limiter import RetryPolicy
+from records import Record, to_payloads
+from storage import create_storage_client, uses_supabase
+from table_reader import iter_table
+from dedup_index import NearDuplicateIndex
+from bulk_loader import BULK_RPC, CopyBulkLoader, copy_available
 
 # =====================================================
 # CONFIGURATION
@@ -28,7 +37,22 @@ load_dotenv()
 
 SUPABASE_URL = os.getenv('SUPABASE_URL')
 SUPABASE_KEY = os.getenv('SUPABASE_KEY')
-BATCH_SIZE = int(os.getenv('BATCH_SIZE', 50))
+BATCH_SIZE = int(os.getenv('BATCH_SIZE', 50))  # Tamanho inicial; ajustado pelo InsertEngine
+INSERT_WORKERS = int(os.getenv('INSERT_WORKERS', 4))
+INSERT_BATCH_MIN = int(os.getenv('INSERT_BATCH_MIN', 10))
+INSERT_BATCH_MAX = int(os.getenv('INSERT_BATCH_MAX', 500))
+INSERT_TARGET_LATENCY = float(os.getenv('INSERT_TARGET_LATENCY', 1.0))
+INSERT_MAX_PAYLOAD_KB = int(os.getenv('INSERT_MAX_PAYLOAD_KB', 1024))
+MAX_RETRIES = int(os.getenv('MAX_RETRIES', 3))
+MAX_RETRY_DELAY = float(os.getenv('MAX_RETRY_DELAY', 60))
+NEAR_DUPLICATE_THRESHOLD = float(os.getenv('NEAR_DUPLICATE_THRESHOLD', 0))
+TERMS_PAGE_SIZE = int(os.getenv('TERMS_PAGE_SIZE', 1000))
+INSERT_MODE = os.getenv('INSERT_MODE', 'insert')
+UPSERT_ON_DUPLICATE = os.getenv('UPSERT_ON_DUPLICATE', 'ignore')
+REJECT_FILE = os.getenv('REJECT_FILE', 'rejected_records.jsonl')
+BULK_BATCH_SIZE = int(os.getenv('BULK_BATCH_SIZE', 5000))
+BULK_MAX_PAYLOAD_KB = int(os.getenv('BULK_MAX_PAYLOAD_KB', 8192))
+DATABASE_URL = os.getenv('DATABASE_URL')
 
 # Logging
 logging.basicConfig(
@@ -49,15 +73,18 @@ class SeedInserter:
     """Classe para inserir seed data no Supabase"""
     
     def __init__(self):
-        if not SUPABASE_URL or not SUPABASE_KEY:
+        if uses_supabase() and (not SUPABASE_URL or not SUPABASE_KEY):
             raise ValueError("SUPABASE_URL and SUPABASE_KEY must be set")
         
-        self.client: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+        self.client: Client = create_storage_client(SUPABASE_URL, SUPABASE_KEY)
+        self.reject_log = RejectLog(REJECT_FILE) if REJECT_FILE else None
         logger.info("Supabase client initialized")
         
         self.inserted_count = 0
         self.skipped_count = 0
         self.error_count = 0
+        # insert/upsert/bulk_batch rodam nas threads do InsertEngine
+        self._error_lock = threading.Lock()
     
     def check_table_exists(self) -> bool:
         """Verifica se a tabela cultural_references existe"""
@@ -69,49 +96,152 @@ class SeedInserter:
             logger.error(f"Table check failed: {e}")
             return False
     
+    def iter_existing(self, columns: str = 'termo'):
+        """Percorre os termos do banco em páginas (sem truncar no max-rows da API)"""
+        return iter_table(self.client, 'cultural_references', columns,
+                          key='termo', page_size=TERMS_PAGE_SIZE)
+    
     def get_existing_terms(self) -> set:
         """Recupera termos já existentes no banco"""
         try:
-            result = self.client.table('cultural_references').select('termo').execute()
-            existing = {row['termo'] for row in result.data}
+            existing = {row['termo'] for row in self.iter_existing()}
             logger.info(f"Found {len(existing)} existing terms")
             return existing
         except Exception as e:
             logger.error(f"Error fetching existing terms: {e}")
             return set()
     
-    def insert_batch(self, data_list: List[Dict]) -> int:
+    def get_existing_index(self) -> NearDuplicateIndex:
+        """Monta o índice de quase-duplicatas com os termos do banco"""
+        index = NearDuplicateIndex(term_threshold=NEAR_DUPLICATE_THRESHOLD)
+        try:
+            for row in self.iter_existing('termo, significado'):
+                index.add(row['termo'], row.get('significado') or '')
+            logger.info(f"Found {len(index)} existing terms")
+        except Exception as e:
+            logger.error(f"Error fetching existing terms: {e}")
+        return index
+    
+    def insert_batch(self, data_list: List[Record]) -> int:
         """Insere batch de dados"""
         try:
-            result = self.client.table('cultural_references').insert(data_list).execute()
-            count = len(data_list)
+            count = self._insert(data_list)
             logger.info(f"Batch inserted: {count} records")
             return count
         except Exception as e:
-            logger.error(f"Batch insert failed: {e}")
-            # Tentar inserções individuais
-            return self.insert_individually(data_list)
+            if is_backpressure_error(e):
+                raise
+            logger.error(f"Batch insert failed, isolating bad rows: {e}")
+            # Divide o batch até isolar as linhas inválidas
+            return self._recover(self._insert, data_list, e)
+    
+    def upsert_batch(self, data_list: List[Record], ignore_duplicates: bool = True) -> int:
+        """Grava batch com ON CONFLICT (termo); retorna as linhas gravadas"""
+        def upsert(rows: List[Record]) -> int:
+            result = self.client.table('cultural_references').upsert(
+                to_payloads(rows), on_conflict='termo', ignore_duplicates=ignore_duplicates
+            ).execute()
+            return len(result.data)
+        
+        try:
+            count = upsert(data_list)
+            logger.info(f"Batch upserted: {count} of {len(data_list)} records written")
+            return count
+        except Exception as e:
+            if is_backpressure_error(e):
+                raise
+            logger.error(f"Batch upsert failed, isolating bad rows: {e}")
+            return self._recover(upsert, data_list, e)
+    
+    def bulk_batch(self, data_list: List[Record], merge: bool = False) -> int:
+        """Grava um array grande com uma chamada à RPC de carga em massa"""
+        def bulk(rows: List[Record]) -> int:
+            result = self.client.rpc(BULK_RPC, {'payload': to_payloads(rows), 'merge': merge}).execute()
+            return int(result.data or 0)
+        
+        try:
+            count = bulk(data_list)
+            logger.info(f"Bulk batch loaded: {count} of {len(data_list)} records written")
+            return count
+        except Exception as e:
+            if is_backpressure_error(e):
+                raise
+            logger.error(f"Bulk batch failed, isolating bad rows: {e}")
+            return self._recover(bulk, data_list, e)
+    
+    def bulk_load(self, seed_data: Iterable[Record], merge: bool = False) -> int:
+        """
+        Carga em massa sem leitura prévia do banco
+        
+        Com DATABASE_URL (e psycopg instalado) usa COPY para uma tabela de
+        staging e um único INSERT ... ON CONFLICT; senão envia arrays de
+        até BULK_BATCH_SIZE registros para a RPC bulk_load_cultural_references.
+        
+        Args:
+            seed_data: Registros, consumidos sob demanda
+            merge: True atualiza termos existentes; False os mantém
+        
+        Returns:
+            int: Linhas gravadas
+        """
+        if DATABASE_URL and uses_supabase():
+            if copy_available():
+                logger.info("Bulk loading via COPY (DATABASE_URL)")
+                return CopyBulkLoader(DATABASE_URL, BULK_BATCH_SIZE).load(seed_data, merge=merge)
+            logger.warning("psycopg not installed, bulk loading via RPC instead of COPY")
+        
+        logger.info(f"Bulk loading via RPC {BULK_RPC} with {INSERT_WORKERS} workers")
+        engine = InsertEngine(
+            lambda batch: self.bulk_batch(batch, merge=merge),
+            workers=INSERT_WORKERS,
+            sizer=AdaptiveBatchSizer(
+                initial=BULK_BATCH_SIZE,
+                min_size=INSERT_BATCH_MIN,
+                max_size=BULK_BATCH_SIZE,
+                target_latency=INSERT_TARGET_LATENCY,
+                max_payload_bytes=BULK_MAX_PAYLOAD_KB * 1024,
+            ),
+            retry_policy=RetryPolicy(max_retries=MAX_RETRIES, base_delay=2, max_delay=MAX_RETRY_DELAY),
+            reject_log=self.reject_log,
+        )
+        with tqdm(desc="Bulk loading", unit="rec") as progress:
+            return engine.run(seed_data, lambda batch, count: progress.update(len(batch)))
     
-    def insert_individually(self, data_list: List[Dict]) -> int:
-        """Insere dados individualmente (fallback)"""
-        success_count = 0
-        for data in data_list:
-            try:
-                self.client.table('cultural_references').insert(data).execute()
-                success_count += 1
-                logger.debug(f"Inserted: {data['termo']}")
-            except Exception as e:
-                logger.error(f"Failed to insert {data['termo']}: {e}")
-                self.error_count += 1
-        return success_count
+    def _recover(self, write: Callable[[List[Record]], int], data_list: List[Record],
+                 error: Exception) -> int:
+        """
+        Bisseção de um batch que falhou, contando as linhas que não entraram
+        
+        Se a bisseção parar por backpressure, conta só a parte já tratada e
+        repassa a exceção para o InsertEngine repetir o resto.
+        """
+        try:
+            count = insert_with_bisection(write, data_list, error, self.reject_log)
+        except BisectionInterrupted as e:
+            self._add_errors(len(data_list) - len(e.remaining) - e.inserted)
+            raise
+        self._add_errors(len(data_list) - count)
+        return count
+    
+    def _add_errors(self, count: int):
+        with self._error_lock:
+            self.error_count += count
     
-    def insert_seed_data(self, seed_data: List[Dict], skip_existing: bool = True):
+    def _insert(self, data_list: List[Record]) -> int:
+        self.client.table('cultural_references').insert(to_payloads(data_list)).execute()
+        return len(data_list)
+    
+    def insert_seed_data(self, seed_data: Iterable[Record], skip_existing: bool = True,
+                         mode: str = INSERT_MODE):
         """
         Insere todos os dados seed
         
         Args:
-            seed_data: Lista de dados a inserir
+            seed_data: Registros a inserir (no modo bulk pode ser um gerador)
             skip_existing: Se True, pula termos já existentes
+            mode: 'insert' (filtra existentes antes), 'upsert' (ON CONFLICT,
+                  sem leitura prévia; pode ser reexecutado) ou 'bulk' (carga
+                  em massa via RPC/COPY, também com ON CONFLICT)
         """
         logger.info("="*50)
         logger.info("STARTING SEED DATA INSERTION")
@@ -124,8 +254,22 @@ class SeedInserter:
             logger.error("Table does not exist! Run migration first.")
             return
         
+        if mode == 'bulk':
+            # Conflitos e repetições ficam com o banco (ON CONFLICT / DISTINCT ON)
+            self.inserted_count += self.bulk_load(seed_data, merge=UPSERT_ON_DUPLICATE == 'merge')
+            self.log_summary(start_time)
+            return
+        
         # Filtrar dados existentes
-        if skip_existing:
+        if mode == 'upsert':
+            # Conflitos ficam com o banco; só remove termos repetidos no seed
+            seed_data = list({d['termo']: d for d in seed_data}.values())
+        elif skip_existing and NEAR_DUPLICATE_THRESHOLD > 0:
+            # Também pula variantes ("Gato(a)" x "Gato") e repetições no próprio seed
+            index = self.get_existing_index()
+            seed_data = [d for d in seed_data if index.check_and_add(d['termo'], d['significado']) is None]
+            logger.info(f"After filtering: {len(seed_data)} new records to insert")
+        elif skip_existing:
             existing_terms = self.get_existing_terms()
             seed_data = [d for d in seed_data if d['termo'] not in existing_terms]
             logger.info(f"After filtering: {len(seed_data)} new records to insert")
@@ -134,23 +278,43 @@ class SeedInserter:
             logger.info("No new data to insert")
             return
         
-        # Inserir em batches
-        total_batches = (len(seed_data) + BATCH_SIZE - 1) // BATCH_SIZE
-        logger.info(f"Inserting {len(seed_data)} records in {total_batches} batches")
+        # Inserir com workers concorrentes e batch adaptativo
+        logger.info(f"Inserting {len(seed_data)} records with {INSERT_WORKERS} workers")
         
-        for i in tqdm(range(0, len(seed_data), BATCH_SIZE), desc="Inserting batches"):
-            batch = seed_data[i:i+BATCH_SIZE]
-            count = self.insert_batch(batch)
-            self.inserted_count += count
-            time.sleep(0.5)  # Rate limiting
+        if mode == 'upsert':
+            ignore_duplicates = UPSERT_ON_DUPLICATE != 'merge'
+            write = lambda batch: self.upsert_batch(batch, ignore_duplicates=ignore_duplicates)
+        else:
+            write = self.insert_batch
         
-        # Estatísticas finais
+        engine = InsertEngine(
+            write,
+            workers=INSERT_WORKERS,
+            sizer=AdaptiveBatchSizer(
+                initial=BATCH_SIZE,
+                min_size=INSERT_BATCH_MIN,
+                max_size=INSERT_BATCH_MAX,
+                target_latency=INSERT_TARGET_LATENCY,
+                max_payload_bytes=INSERT_MAX_PAYLOAD_KB * 1024,
+            ),
+            retry_policy=RetryPolicy(max_retries=MAX_RETRIES, base_delay=2, max_delay=MAX_RETRY_DELAY),
+            reject_log=self.reject_log,
+        )
+        with tqdm(total=len(seed_data), desc="Inserting", unit="rec") as progress:
+            self.inserted_count += engine.run(seed_data, lambda batch, count: progress.update(len(batch)))
+        
+        self.log_summary(start_time)
+    
+    def log_summary(self, start_time: float):
+        """Estatísticas finais da carga"""
         elapsed = time.time() - start_time
         logger.info("="*50)
         logger.info("SEED DATA INSERTION COMPLETED")
         logger.info(f"Time elapsed: {elapsed:.2f}s")
         logger.info(f"Total inserted: {self.inserted_count}")
         logger.info(f"Total errors: {self.error_count}")
+        if self.reject_log and self.reject_log.count:
+            logger.info(f"Rejected rows written to {self.reject_log.path}")
         logger.info("="*50)
     
     def get_stats(self) -> Dict:
@@ -176,10 +340,14 @@ class SeedInserter:
 def main():
     """Função principal"""
     try:
-        # Carregar seed data
-        logger.info("Loading seed data...")
-        seed_data = get_seed_data()
-        logger.info(f"Loaded {len(seed_data)} seed records")
+        # Carregar seed data (no modo bulk, lido do arquivo durante o envio)
+        if INSERT_MODE == 'bulk':
+            logger.info("Streaming seed data in bulk mode...")
+            seed_data = iter_seed_records()
+        else:
+            logger.info("Loading seed data...")
+            seed_data = list(iter_seed_records())
+            logger.info(f"Loaded {len(seed_data)} seed records")
         
         # Criar inserter
         inserter = SeedInserter()
@@ -0,0 +1,681 @@
+"""
+=====================================================
+LOCAL STORAGE BACKEND
+=====================================================
+Description: Substituto local do PostgREST/Supabase para rodar
+             carga, análise e benchmarks sem rede: mesma API de
+             query builder (table/select/insert/upsert/filtros/
+             rpc), constraints do schema e latência injetável
+Author: FlertAI Team
+Date: 2025-10-01
+=====================================================
+"""
+
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from postgrest.exceptions import APIError
+
+logger = logging.getLogger(__name__)
+
+# =====================================================
+# SCHEMA
+# =====================================================
+
+# Subconjunto das migrations em supabase/migrations usado pelos scripts
+SCHEMAS: Dict[str, Dict[str, Any]] = {
+    'cultural_references': {
+        'defaults': {'regiao': 'nacional'},
+        'timestamps': ('created_at', 'updated_at'),
+        'not_null': ('termo', 'tipo', 'significado'),
+        'unique': ('termo',),
+        'checks': {
+            'tipo_valido': ('tipo', frozenset({
+                'giria', 'meme', 'novela', 'musica', 'personalidade', 'evento',
+                'expressao_regional', 'filme', 'serie', 'esporte', 'comida', 'lugar',
+            })),
+            'regiao_valida': ('regiao', frozenset({
+                'nacional', 'norte', 'nordeste', 'centro-oeste', 'sudeste', 'sul',
+            })),
+        },
+    },
+    'suggestion_feedback': {
+        'defaults': {},
+        'timestamps': ('created_at',),
+        'not_null': ('user_id', 'conversation_id', 'suggestion_text', 'suggestion_index', 'feedback_type'),
+        'unique': (),
+        'checks': {
+            'suggestion_feedback_feedback_type_check': ('feedback_type', frozenset({'like', 'dislike'})),
+        },
+    },
+    'conversations': {
+        'defaults': {'focus_tags': []},
+        'timestamps': ('created_at', 'updated_at'),
+        'not_null': (),
+        'unique': (),
+        'checks': {},
+    },
+}
+
+# Funções RPC: nome -> fn(backend, params)
+RPC_FUNCTIONS: Dict[str, Callable[['LocalBackend', Dict], Any]] = {}
+
+
+def rpc_function(name: str):
+    """Registra uma função RPC do backend local (equivalente a uma função SQL)"""
+    def register(fn):
+        RPC_FUNCTIONS[name] = fn
+        return fn
+    return register
+
+
+def _error(code: str, message: str, details: Optional[str] = None) -> APIError:
+    return APIError({'code': code, 'message': message, 'details': details, 'hint': None})
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+# =====================================================
+# FILTERS
+# =====================================================
+
+def _split_top_level(text: str) -> List[str]:
+    """Separa por vírgula fora de parênteses e aspas"""
+    parts, depth, quoted, current = [], 0, False, []
+    i = 0
+    while i < len(text):
+        char = text[i]
+        if quoted:
+            if char == '\\' and i + 1 < len(text):
+                current.append(text[i:i+2])
+                i += 2
+                continue
+            quoted = char != '"'
+        elif char == '"':
+            quoted = True
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif char == ',' and depth == 0:
+            parts.append(''.join(current).strip())
+            current = []
+            i += 1
+            continue
+        current.append(char)
+        i += 1
+    if current:
+        parts.append(''.join(current).strip())
+    return [part for part in parts if part]
+
+
+def _unquote(value: str) -> str:
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        return re.sub(r'\\(.)', r'\1', value[1:-1])
+    return value
+
+
+def _coerce(value: Any, sample: Any) -> Any:
+    """Converte o valor vindo da URL para o tipo da coluna"""
+    if not isinstance(value, str) or sample is None or isinstance(sample, str):
+        return value
+    try:
+        if isinstance(sample, bool):
+            return value.lower() == 'true'
+        if isinstance(sample, int):
+            return int(value)
+        if isinstance(sample, float):
+            return float(value)
+    except ValueError:
+        pass
+    return value
+
+
+def _compare(op: str, actual: Any, expected: Any) -> bool:
+    if op == 'is':
+        lowered = str(expected).lower()
+        if lowered == 'null':
+            return actual is None
+        return actual is (lowered == 'true')
+    if op == 'in':
+        return actual is not None and actual in [_coerce(v, actual) for v in expected]
+    if actual is None:
+        return False
+    expected = _coerce(expected, actual)
+    try:
+        if op == 'eq':
+            return actual == expected
+        if op == 'neq':
+            return actual != expected
+        if op == 'gt':
+            return actual > expected
+        if op == 'gte':
+            return actual >= expected
+        if op == 'lt':
+            return actual < expected
+        if op == 'lte':
+            return actual <= expected
+        if op == 'cs':
+            return set(expected) <= set(actual)
+    except TypeError:
+        return False
+    raise _error('PGRST100', f'unsupported operator: {op}')
+
+
+Predicate = Callable[[Dict], bool]
+
+
+def _parse_condition(text: str) -> Predicate:
+    """Converte um item de or=(...) do PostgREST em predicado"""
+    for logic in ('and', 'or'):
+        if text.startswith(f'{logic}(') and text.endswith(')'):
+            children = [_parse_condition(part) for part in _split_top_level(text[len(logic)+1:-1])]
+            combine = all if logic == 'and' else any
+            return lambda row: combine(child(row) for child in children)
+
+    column, op, value = text.split('.', 2)
+    negate = op == 'not'
+    if negate:
+        op, value = value.split('.', 1)
+    if op == 'in':
+        values = [_unquote(v) for v in _split_top_level(value.strip('()'))]
+        predicate = lambda row: _compare('in', row.get(column), values)
+    else:
+        literal = _unquote(value)
+        predicate = lambda row: _compare(op, row.get(column), literal)
+    return (lambda row: not predicate(row)) if negate else predicate
+
+# =====================================================
+# QUERY BUILDER
+# =====================================================
+
+class LocalResponse:
+    """Resposta no formato do postgrest (data + count)"""
+
+    def __init__(self, data: Any, count: Optional[int] = None):
+        self.data = data
+        self.count = count
+
+
+class LocalQuery:
+    """Query builder com a mesma interface encadeável do postgrest-py"""
+
+    def __init__(self, backend: 'LocalBackend', table: str):
+        self.backend = backend
+        self.table = table
+        self.action = 'select'
+        self.columns = '*'
+        self.count: Optional[str] = None
+        self.payload: List[Dict] = []
+        self.on_conflict = ''
+        self.ignore_duplicates = False
+        self.filters: List[Predicate] = []
+        self.ordering: List[Tuple[str, bool]] = []
+        self.limit_count: Optional[int] = None
+        self.offset = 0
+
+    # Ações -----------------------------------------------
+
+    def select(self, *columns: str, count: Optional[str] = None) -> 'LocalQuery':
+        self.columns = ','.join(columns) or '*'
+        self.count = count
+        return self
+
+    def insert(self, json: Any, **kwargs) -> 'LocalQuery':
+        self.action = 'insert'
+        self.payload = json if isinstance(json, list) else [json]
+        return self
+
+    def upsert(self, json: Any, on_conflict: str = '', ignore_duplicates: bool = False,
+               **kwargs) -> 'LocalQuery':
+        self.action = 'upsert'
+        self.payload = json if isinstance(json, list) else [json]
+        self.on_conflict = on_conflict or 'id'
+        self.ignore_duplicates = ignore_duplicates
+        return self
+
+    def delete(self, **kwargs) -> 'LocalQuery':
+        self.action = 'delete'
+        return self
+
+    # Filtros ---------------------------------------------
+
+    def _filter(self, column: str, op: str, value: Any) -> 'LocalQuery':
+        self.filters.append(lambda row: _compare(op, row.get(column), value))
+        return self
+
+    def eq(self, column: str, value: Any) -> 'LocalQuery':
+        return self._filter(column, 'eq', value)
+
+    def neq(self, column: str, value: Any) -> 'LocalQuery':
+        return self._filter(column, 'neq', value)
+
+    def gt(self, column: str, value: Any) -> 'LocalQuery':
+        return self._filter(column, 'gt', value)
+
+    def gte(self, column: str, value: Any) -> 'LocalQuery':
+        return self._filter(column, 'gte', value)
+
+    def lt(self, column: str, value: Any) -> 'LocalQuery':
+        return self._filter(column, 'lt', value)
+
+    def lte(self, column: str, value: Any) -> 'LocalQuery':
+        return self._filter(column, 'lte', value)
+
+    def in_(self, column: str, values: Iterable[Any]) -> 'LocalQuery':
+        return self._filter(column, 'in', list(values))
+
+    def is_(self, column: str, value: Any) -> 'LocalQuery':
+        return self._filter(column, 'is', 'null' if value is None else value)
+
+    def contains(self, column: str, value: Iterable[Any]) -> 'LocalQuery':
+        return self._filter(column, 'cs', list(value))
+
+    def or_(self, filters: str) -> 'LocalQuery':
+        conditions = [_parse_condition(part) for part in _split_top_level(filters)]
+        self.filters.append(lambda row: any(condition(row) for condition in conditions))
+        return self
+
+    # Ordenação e paginação -------------------------------
+
+    def order(self, column: str, *, desc: bool = False, **kwargs) -> 'LocalQuery':
+        for item in column.split(','):
+            name, _, direction = item.strip().partition('.')
+            self.ordering.append((name, desc or direction.startswith('desc')))
+        return self
+
+    def limit(self, size: int, **kwargs) -> 'LocalQuery':
+        self.limit_count = size
+        return self
+
+    def range(self, start: int, end: int, **kwargs) -> 'LocalQuery':
+        self.offset = start
+        self.limit_count = end - start + 1
+        return self
+
+    def execute(self) -> LocalResponse:
+        return self.backend.execute(self)
+
+
+class LocalRPC:
+    """Chamada RPC pendente (execute() roda a função registrada)"""
+
+    def __init__(self, backend: 'LocalBackend', name: str, params: Optional[Dict]):
+        self.backend = backend
+        self.name = name
+        self.params = params or {}
+
+    def execute(self) -> LocalResponse:
+        return self.backend.execute_rpc(self.name, self.params)
+
+# =====================================================
+# BACKEND
+# =====================================================
+
+class LocalBackend:
+    """
+    Banco em memória com a interface do cliente Supabase
+
+    As linhas ficam em listas de dicts por tabela, com índices para as
+    colunas únicas. Se `path` for informado, o estado é carregado de um
+    arquivo SQLite e cada escrita é persistida nele, para que scripts
+    diferentes (carga, verificação, análise) vejam os mesmos dados.
+
+    `latency` (segundos por request) e `row_latency` (segundos por linha
+    lida ou gravada) simulam o custo de rede e do banco.
+    """
+
+    def __init__(self, path: Optional[str] = None, latency: float = 0.0,
+                 row_latency: float = 0.0):
+        self.path = path
+        self.latency = latency
+        self.row_latency = row_latency
+        self.request_count = 0
+        self.rows: Dict[str, List[Dict]] = {name: [] for name in SCHEMAS}
+        self._unique: Dict[Tuple[str, str], Dict[Any, Dict]] = {}
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+        for table, schema in SCHEMAS.items():
+            for column in ('id',) + tuple(schema['unique']):
+                self._unique[(table, column)] = {}
+        if path:
+            self._load(path)
+
+    @classmethod
+    def from_env(cls) -> 'LocalBackend':
+        """Cria o backend com LOCAL_BACKEND_PATH / _LATENCY_MS / _ROW_LATENCY_US"""
+        return cls(
+            path=os.getenv('LOCAL_BACKEND_PATH', 'local_backend.db') or None,
+            latency=float(os.getenv('LOCAL_BACKEND_LATENCY_MS', 0)) / 1000,
+            row_latency=float(os.getenv('LOCAL_BACKEND_ROW_LATENCY_US', 0)) / 1_000_000,
+        )
+
+    # Persistência ----------------------------------------
+
+    def _load(self, path: str):
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS rows (
+                tbl TEXT NOT NULL,
+                pk TEXT NOT NULL,
+                data TEXT NOT NULL,
+                PRIMARY KEY (tbl, pk)
+            )
+        """)
+        self._conn.commit()
+        loaded = 0
+        for table, data in self._conn.execute("SELECT tbl, data FROM rows ORDER BY rowid"):
+            self._index_row(table, json.loads(data))
+            loaded += 1
+        if loaded:
+            logger.info(f"Local backend loaded {loaded} rows from {path}")
+
+    def _persist(self, table: str, rows: List[Dict], delete: bool = False):
+        if not self._conn or not rows:
+            return
+        if delete:
+            self._conn.executemany("DELETE FROM rows WHERE tbl = ? AND pk = ?",
+                                   ((table, str(row['id'])) for row in rows))
+        else:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO rows (tbl, pk, data) VALUES (?, ?, ?)",
+                ((table, str(row['id']), json.dumps(row, ensure_ascii=False, default=str)) for row in rows),
+            )
+        self._conn.commit()
+
+    def _index_row(self, table: str, row: Dict):
+        self.rows.setdefault(table, []).append(row)
+        for (indexed_table, column), index in self._unique.items():
+            if indexed_table == table and row.get(column) is not None:
+                index[row[column]] = row
+
+    def close(self):
+        if self._conn:
+            self._conn.close()
+            self._conn = None
+
+    # Interface do cliente --------------------------------
+
+    def table(self, name: str) -> LocalQuery:
+        return LocalQuery(self, name)
+
+    from_ = table
+
+    def rpc(self, name: str, params: Optional[Dict] = None) -> LocalRPC:
+        return LocalRPC(self, name, params)
+
+    # Execução --------------------------------------------
+
+    def _simulate_latency(self, rows: int):
+        delay = self.latency + self.row_latency * rows
+        if delay > 0:
+            time.sleep(delay)
+
+    def _table_rows(self, table: str) -> List[Dict]:
+        if table not in self.rows:
+            raise _error('42P01', f'relation "public.{table}" does not exist')
+        return self.rows[table]
+
+    def execute(self, query: LocalQuery) -> LocalResponse:
+        with self._lock:
+            self.request_count += 1
+            if query.action == 'select':
+                response = self._select(query)
+                rows = len(response.data)
+            elif query.action == 'delete':
+                response = self._delete(query)
+                rows = len(response.data)
+            else:
+                response = self._write(query)
+                rows = len(query.payload)
+        self._simulate_latency(rows)
+        return response
+
+    def execute_rpc(self, name: str, params: Dict) -> LocalResponse:
+        fn = RPC_FUNCTIONS.get(name)
+        if fn is None:
+            raise _error('PGRST202', f'Could not find the function public.{name}')
+        with self._lock:
+            self.request_count += 1
+            data = fn(self, params)
+        # Funções de carga custam pelas linhas recebidas, não pelo retorno
+        rows = len(params['payload']) if isinstance(params.get('payload'), list) else None
+        self._simulate_latency(rows if rows is not None else len(data) if isinstance(data, list) else 1)
+        return LocalResponse(data)
+
+    def _matching(self, query: LocalQuery) -> List[Dict]:
+        rows = [row for row in self._table_rows(query.table)
+                if all(predicate(row) for predicate in query.filters)]
+        # Ordena da última chave para a primeira (sort estável); nulls por último no asc
+        for column, desc in reversed(query.ordering):
+            present = [row for row in rows if row.get(column) is not None]
+            missing = [row for row in rows if row.get(column) is None]
+            present.sort(key=lambda row: row[column], reverse=desc)
+            rows = missing + present if desc else present + missing
+        return rows
+
+    def _select(self, query: LocalQuery) -> LocalResponse:
+        rows = self._matching(query)
+        count = len(rows) if query.count else None
+        end = None if query.limit_count is None else query.offset + query.limit_count
+        rows = rows[query.offset:end]
+        return LocalResponse([self._project(query.table, row, query.columns) for row in rows], count)
+
+    def _delete(self, query: LocalQuery) -> LocalResponse:
+        doomed = self._matching(query)
+        doomed_ids = {id(row) for row in doomed}
+        self.rows[query.table] = [row for row in self.rows[query.table] if id(row) not in doomed_ids]
+        for (table, column), index in self._unique.items():
+            if table == query.table:
+                for row in doomed:
+                    index.pop(row.get(column), None)
+        self._persist(query.table, doomed, delete=True)
+        return LocalResponse([dict(row) for row in doomed])
+
+    # Projeção e embeds -----------------------------------
+
+    def _project(self, table: str, row: Dict, columns: str) -> Dict:
+        result: Dict[str, Any] = {}
+        for item in _split_top_level(columns):
+            if item == '*':
+                result.update(row)
+                continue
+            alias, _, item = item.rpartition(':') if ':' in item.split('(')[0] else ('', '', item)
+            if '(' in item:
+                target, inner = item.split('(', 1)
+                target = target.strip()
+                result[alias or target] = self._embed(table, row, target, inner[:-1])
+            else:
+                name = item.strip()
+                result[alias or name] = row.get(name)
+        return result
+
+    def _embed(self, table: str, row: Dict, target: str, columns: str) -> Any:
+        """Recurso relacionado: many-to-one por `<target>_id`, senão one-to-many"""
+        foreign_key = f"{target[:-1] if target.endswith('s') else target}_id"
+        if foreign_key in row:
+            parent = self._unique.get((target, 'id'), {}).get(row[foreign_key])
+            return self._project(target, parent, columns) if parent else None
+        back_key = f"{table[:-1] if table.endswith('s') else table}_id"
+        return [self._project(target, child, columns)
+                for child in self._table_rows(target) if child.get(back_key) == row.get('id')]
+
+    # Escrita ---------------------------------------------
+
+    def _prepare(self, table: str, data: Dict) -> Dict:
+        schema = SCHEMAS.get(table, {})
+        row = dict(schema.get('defaults', {}))
+        row.update(data)
+        row.setdefault('id', str(uuid.uuid4()))
+        now = _now()
+        for column in schema.get('timestamps', ()):
+            row.setdefault(column, now)
+        for column in schema.get('not_null', ()):
+            if row.get(column) is None:
+                raise _error('23502', f'null value in column "{column}" of relation "{table}" '
+                                      f'violates not-null constraint')
+        for constraint, (column, allowed) in schema.get('checks', {}).items():
+            if row.get(column) is not None and row[column] not in allowed:
+                raise _error('23514', f'new row for relation "{table}" violates check '
+                                      f'constraint "{constraint}"')
+        return row
+
+    def _duplicate(self, table: str, column: str, value: Any) -> APIError:
+        return _error('23505', f'duplicate key value violates unique constraint "{table}_{column}_key"',
+                      f'Key ({column})=({value}) already exists.')
+
+    def _write(self, query: LocalQuery) -> LocalResponse:
+        table = query.table
+        self._table_rows(table)
+        rows = [self._prepare(table, data) for data in query.payload]
+        unique_columns = ('id',) + tuple(SCHEMAS.get(table, {}).get('unique', ()))
+        conflict = query.on_conflict if query.action == 'upsert' else None
+        if conflict and conflict not in unique_columns:
+            raise _error('42P10', 'there is no unique or exclusion constraint matching '
+                                  'the ON CONFLICT specification')
+
+        # Valida o statement inteiro antes de aplicar (atômico como no Postgres)
+        seen: Dict[str, set] = {column: set() for column in unique_columns}
+        for row in rows:
+            target = self._unique[(table, conflict)].get(row.get(conflict)) if conflict else None
+            for column in unique_columns:
+                value = row.get(column)
+                if value is None:
+                    continue
+                if value in seen[column]:
+                    if column != conflict:
+                        raise self._duplicate(table, column, value)
+                    if not query.ignore_duplicates:
+                        raise _error('21000', 'ON CONFLICT DO UPDATE command cannot affect row a second time')
+                seen[column].add(value)
+                existing = self._unique[(table, column)].get(value)
+                if column != conflict and existing is not None and existing is not target:
+                    raise self._duplicate(table, column, value)
+
+        written: List[Dict] = []
+        applied = set()
+        for row, data in zip(rows, query.payload):
+            key = row.get(conflict) if conflict else None
+            existing = self._unique[(table, conflict)].get(key) if conflict else None
+            if existing is None:
+                if conflict:
+                    if key in applied:
+                        continue  # Repetido no mesmo statement com ignore_duplicates
+                    applied.add(key)
+                self._index_row(table, row)
+                written.append(row)
+            elif not query.ignore_duplicates:
+                existing.update({column: value for column, value in data.items() if column != 'id'})
+                if 'updated_at' in existing:
+                    existing['updated_at'] = _now()
+                written.append(existing)
+
+        self._persist(table, written)
+        return LocalResponse([dict(row) for row in written])
+
+
+_shared: Optional[LocalBackend] = None
+_shared_lock = threading.Lock()
+
+
+def get_local_backend() -> LocalBackend:
+    """Instância única por processo (todas as entradas veem os mesmos dados)"""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = LocalBackend.from_env()
+        return _shared
+
+# =====================================================
+# RPC FUNCTIONS
+# =====================================================
+
+@rpc_function('get_cultural_references_stats')
+def _cultural_references_stats(backend: LocalBackend, params: Dict) -> List[Dict]:
+    rows = backend.rows['cultural_references']
+    tipos: Dict[str, int] = {}
+    regioes: Dict[str, int] = {}
+    for row in rows:
+        tipos[row['tipo']] = tipos.get(row['tipo'], 0) + 1
+        regioes[row['regiao']] = regioes.get(row['regiao'], 0) + 1
+    return [{'total_count': len(rows), 'tipo_counts': tipos, 'regiao_counts': regioes}]
+
+
+@rpc_function('bulk_load_cultural_references')
+def _bulk_load_cultural_references(backend: LocalBackend, params: Dict) -> int:
+    # Mesma regra da função SQL: primeira ocorrência de cada termo, ON CONFLICT (termo)
+    first: Dict[Any, Dict] = {}
+    for data in params.get('payload') or []:
+        first.setdefault(data.get('termo'), data)
+    query = LocalQuery(backend, 'cultural_references').upsert(
+        list(first.values()), on_conflict='termo', ignore_duplicates=not params.get('merge', False)
+    )
+    return len(backend._write(query).data)
+
+
+def _feedback_in_window(backend: LocalBackend, params: Dict) -> Iterable[Tuple[Dict, Optional[Dict]]]:
+    """(feedback, conversa) com created_at >= since"""
+    since = params['since']
+    conversations = backend._unique.get(('conversations', 'id'), {})
+    for row in backend.rows['suggestion_feedback']:
+        if _compare('gte', row.get('created_at'), since):
+            yield row, conversations.get(row.get('conversation_id'))
+
+
+def _count_feedback(groups: Dict[Any, Dict[str, int]], key: Any, feedback_type: str):
+    stats = groups.setdefault(key, {'total': 0, 'likes': 0, 'dislikes': 0})
+    stats['total'] += 1
+    if feedback_type == 'like':
+        stats['likes'] += 1
+    else:
+        stats['dislikes'] += 1
+
+
+@rpc_function('get_feedback_totals')
+def _feedback_totals(backend: LocalBackend, params: Dict) -> List[Dict]:
+    groups: Dict[Any, Dict[str, int]] = {None: {'total': 0, 'likes': 0, 'dislikes': 0}}
+    for row, _ in _feedback_in_window(backend, params):
+        _count_feedback(groups, None, row['feedback_type'])
+    return [groups[None]]
+
+
+@rpc_function('get_feedback_by_tone')
+def _feedback_by_tone(backend: LocalBackend, params: Dict) -> List[Dict]:
+    groups: Dict[Any, Dict[str, int]] = {}
+    for row, conversation in _feedback_in_window(backend, params):
+        tone = (conversation or {}).get('tone') or 'unknown'
+        _count_feedback(groups, tone, row['feedback_type'])
+    return [{'tone': tone, **stats} for tone, stats in groups.items()]
+
+
+@rpc_function('get_feedback_by_focus_tag')
+def _feedback_by_focus_tag(backend: LocalBackend, params: Dict) -> List[Dict]:
+    groups: Dict[Any, Dict[str, int]] = {}
+    for row, conversation in _feedback_in_window(backend, params):
+        for tag in (conversation or {}).get('focus_tags') or []:
+            _count_feedback(groups, tag, row['feedback_type'])
+    return [{'focus_tag': tag, **stats} for tag, stats in groups.items()]
+
+
+@rpc_function('get_problem_suggestions')
+def _problem_suggestions(backend: LocalBackend, params: Dict) -> List[Dict]:
+    threshold = float(params.get('threshold', 70))
+    min_feedbacks = int(params.get('min_feedbacks', 3))
+    groups: Dict[Any, Dict[str, int]] = {}
+    for row, _ in _feedback_in_window(backend, params):
+        _count_feedback(groups, row['suggestion_text'], row['feedback_type'])
+    return [
+        {'suggestion_text': text, 'total': stats['total'], 'dislikes': stats['dislikes']}
+        for text, stats in groups.items()
+        if stats['total'] >= min_feedbacks and stats['dislikes'] * 100 / stats['total'] >= threshold
+    ]
@@ -0,0 +1,292 @@
+"""
+=====================================================
+PIPELINE METRICS
+=====================================================
+Description: Telemetria do pipeline de scraping: tempo por etapa
+             (fetch, parse, clean, dedup, insert), histograma de
+             latência de fetch por host, bytes, retries e 429,
+             exportados em JSON e no formato textfile do Prometheus
+Author: FlertAI Team
+Date: 2025-10-06
+=====================================================
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+STAGES = ('fetch', 'parse', 'clean', 'dedup', 'insert')
+
+# Limites (segundos) dos buckets de latência de fetch
+LATENCY_BUCKETS: Tuple[float, ...] = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+PROMETHEUS_PREFIX = 'flertai_scraper'
+
+
+class Histogram:
+    """Histograma de buckets fixos (contagem não cumulativa por bucket)"""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Último = +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> Iterator[Tuple[str, int]]:
+        """(le, contagem acumulada), como nos buckets do Prometheus"""
+        total = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            total += count
+            yield ('+Inf' if bound == float('inf') else f'{bound:g}'), total
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 6),
+            'buckets': dict(self.cumulative()),
+        }
+
+
+class PipelineMetrics:
+    """
+    Contadores e timers de uma execução do scraper
+
+    Thread-safe: é compartilhado pelo engine de fetch, pelos scrapers,
+    pela thread produtora do modo streaming e pelos workers de insert.
+    Etapas que rodam em paralelo acumulam o próprio tempo, então a soma
+    das etapas pode passar do tempo total da execução.
+    """
+
+    def __init__(self):
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+        self.stage_seconds: Dict[str, float] = {stage: 0.0 for stage in STAGES}
+        self.stage_calls: Dict[str, int] = {stage: 0 for stage in STAGES}
+        self.stage_items: Dict[str, int] = {stage: 0 for stage in STAGES}
+        self.counters: Dict[str, int] = {}
+        self.host_latency: Dict[str, Histogram] = {}
+        self.host_bytes: Dict[str, int] = {}
+        self.host_requests: Dict[str, int] = {}
+        self.host_retries: Dict[str, int] = {}
+        self.status_counts: Dict[str, int] = {}
+
+    # Etapas ----------------------------------------------
+
+    def add_stage_time(self, stage: str, seconds: float, items: int = 0):
+        """Soma `seconds` ao tempo da etapa (e `items` processados nela)"""
+        with self._lock:
+            self.stage_seconds[stage] = self.stage_seconds.get(stage, 0.0) + seconds
+            self.stage_calls[stage] = self.stage_calls.get(stage, 0) + 1
+            self.stage_items[stage] = self.stage_items.get(stage, 0) + items
+
+    @contextmanager
+    def stage(self, name: str, items: int = 0):
+        """Cronometra um bloco como parte da etapa `name`"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_stage_time(name, time.perf_counter() - start, items)
+
+    # Contadores ------------------------------------------
+
+    def incr(self, name: str, value: int = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def set(self, name: str, value: int):
+        with self._lock:
+            self.counters[name] = value
+
+    # Fetch -----------------------------------------------
+
+    def observe_fetch(self, url: str, seconds: float, status: Optional[int], nbytes: int = 0):
+        """
+        Registra um request HTTP
+
+        Args:
+            url: URL pedida (agrupada por host)
+            seconds: Latência do request
+            status: Status HTTP (None = erro de rede/timeout)
+            nbytes: Bytes do corpo recebido
+        """
+        host = urlsplit(url).netloc
+        status_key = str(status) if status is not None else 'error'
+        with self._lock:
+            histogram = self.host_latency.get(host)
+            if histogram is None:
+                histogram = self.host_latency[host] = Histogram()
+            histogram.observe(seconds)
+            self.host_requests[host] = self.host_requests.get(host, 0) + 1
+            self.host_bytes[host] = self.host_bytes.get(host, 0) + nbytes
+            self.status_counts[status_key] = self.status_counts.get(status_key, 0) + 1
+
+    def record_retry(self, url: str):
+        """Um request vai ser repetido (erro temporário, 429 ou 5xx)"""
+        host = urlsplit(url).netloc
+        with self._lock:
+            self.host_retries[host] = self.host_retries.get(host, 0) + 1
+
+    # Exportação ------------------------------------------
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Estado atual em um dict serializável em JSON"""
+        with self._lock:
+            return {
+                'timestamp': time.time(),
+                'elapsed_seconds': round(time.time() - self.started_at, 3),
+                'stages': {
+                    stage: {
+                        'seconds': round(self.stage_seconds[stage], 6),
+                        'calls': self.stage_calls[stage],
+                        'items': self.stage_items[stage],
+                    }
+                    for stage in self.stage_seconds
+                },
+                'counters': dict(self.counters),
+                'http': {
+                    'requests': sum(self.host_requests.values()),
+                    'bytes': sum(self.host_bytes.values()),
+                    'retries': sum(self.host_retries.values()),
+                    'status_429': self.status_counts.get('429', 0),
+                    'status': dict(self.status_counts),
+                },
+                'hosts': {
+                    host: {
+                        'requests': self.host_requests.get(host, 0),
+                        'bytes': self.host_bytes.get(host, 0),
+                        'retries': self.host_retries.get(host, 0),
+                        'latency': histogram.to_dict(),
+                    }
+                    for host, histogram in self.host_latency.items()
+                },
+            }
+
+    def to_prometheus(self) -> str:
+        """Snapshot no formato textfile do Prometheus (node_exporter)"""
+        snapshot = self.snapshot()
+        p = PROMETHEUS_PREFIX
+        lines = [
+            f'# HELP {p}_stage_seconds_total Cumulative time spent in each pipeline stage',
+            f'# TYPE {p}_stage_seconds_total counter',
+        ]
+        for stage, data in snapshot['stages'].items():
+            lines.append(f'{p}_stage_seconds_total{{stage="{stage}"}} {data["seconds"]}')
+        lines += [f'# TYPE {p}_stage_items_total counter']
+        for stage, data in snapshot['stages'].items():
+            lines.append(f'{p}_stage_items_total{{stage="{stage}"}} {data["items"]}')
+
+        lines += [f'# TYPE {p}_records_total counter']
+        for name, value in sorted(snapshot['counters'].items()):
+            lines.append(f'{p}_records_total{{kind="{name}"}} {value}')
+
+        lines += [f'# TYPE {p}_http_responses_total counter']
+        for status, count in sorted(snapshot['http']['status'].items()):
+            lines.append(f'{p}_http_responses_total{{status="{status}"}} {count}')
+
+        lines += [
+            f'# HELP {p}_fetch_seconds Fetch latency per host',
+            f'# TYPE {p}_fetch_seconds histogram',
+        ]
+        for host, data in snapshot['hosts'].items():
+            for bound, count in data['latency']['buckets'].items():
+                lines.append(f'{p}_fetch_seconds_bucket{{host="{host}",le="{bound}"}} {count}')
+            lines.append(f'{p}_fetch_seconds_sum{{host="{host}"}} {data["latency"]["sum"]}')
+            lines.append(f'{p}_fetch_seconds_count{{host="{host}"}} {data["latency"]["count"]}')
+        lines += [f'# TYPE {p}_fetch_bytes_total counter']
+        for host, data in snapshot['hosts'].items():
+            lines.append(f'{p}_fetch_bytes_total{{host="{host}"}} {data["bytes"]}')
+        lines += [f'# TYPE {p}_fetch_retries_total counter']
+        for host, data in snapshot['hosts'].items():
+            lines.append(f'{p}_fetch_retries_total{{host="{host}"}} {data["retries"]}')
+
+        lines += [
+            f'# TYPE {p}_elapsed_seconds gauge',
+            f'{p}_elapsed_seconds {snapshot["elapsed_seconds"]}',
+        ]
+        return '\n'.join(lines) + '\n'
+
+    def summary(self) -> str:
+        """Linha curta com o tempo de cada etapa, para o log final"""
+        with self._lock:
+            return ' '.join(f'{stage}={seconds:.2f}s' for stage, seconds in self.stage_seconds.items())
+
+
+def _write_atomic(path: str, content: str):
+    # O coletor nunca lê um arquivo pela metade
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+class MetricsExporter:
+    """
+    Grava snapshots das métricas periodicamente e ao final da execução
+
+    Uso:
+        with MetricsExporter(metrics, json_path='scraper_metrics.json'):
+            orchestrator.run_full_pipeline()
+    """
+
+    def __init__(self, metrics: PipelineMetrics, json_path: Optional[str] = None,
+                 prometheus_path: Optional[str] = None, interval: float = 30.0):
+        self.metrics = metrics
+        self.json_path = json_path
+        self.prometheus_path = prometheus_path
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def export(self):
+        """Grava um snapshot agora"""
+        try:
+            if self.json_path:
+                _write_atomic(self.json_path, json.dumps(self.metrics.snapshot(), indent=2))
+            if self.prometheus_path:
+                _write_atomic(self.prometheus_path, self.metrics.to_prometheus())
+        except OSError as e:
+            logger.warning(f"Could not export metrics: {e}")
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.export()
+
+    def start(self):
+        if (self.json_path or self.prometheus_path) and self.interval > 0:
+            self._thread = threading.Thread(target=self._run, name='metrics-exporter', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Para a exportação periódica e grava o snapshot final"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        self.export()
+        if self.json_path:
+            logger.info(f"Metrics written to {self.json_path}")
+
+    def __enter__(self) -> 'MetricsExporter':
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,189 @@
+"""
+=====================================================
+RATE LIMITER
+=====================================================
+Description: Rate limiting por host (token bucket) com ajuste
+             adaptativo e política de retry com backoff
+             exponencial + jitter
+Author: FlertAI Team
+Date: 2025-10-01
+=====================================================
+"""
+
+import asyncio
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+# Status que indicam falha temporária (vale a pena tentar de novo)
+RETRYABLE_STATUS = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+# Status que indicam que o host pediu para desacelerar
+THROTTLE_STATUS = frozenset({429, 503})
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Converte o header Retry-After em segundos
+
+    Args:
+        value: Valor do header (segundos ou data HTTP)
+
+    Returns:
+        Optional[float]: Segundos a esperar, ou None se ausente/inválido
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+# =====================================================
+# TOKEN BUCKET
+# =====================================================
+
+class TokenBucket:
+    """
+    Token bucket thread-safe com taxa ajustável
+
+    reserve() nunca bloqueia: reserva um token e devolve quanto tempo
+    o chamador deve esperar, o que serve tanto para código síncrono
+    (time.sleep) quanto assíncrono (asyncio.sleep).
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0,
+                 min_rate: float = 0.05, max_rate: Optional[float] = None,
+                 increase: float = 0.1):
+        self.rate = rate
+        self.capacity = capacity
+        self.min_rate = min_rate
+        self.max_rate = max_rate if max_rate is not None else rate
+        self.increase = increase
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        """Reserva um token e retorna o tempo de espera em segundos"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._blocked_until - now)
+
+    def throttle(self, retry_after: Optional[float] = None):
+        """Reduz a taxa pela metade e bloqueia o host pelo Retry-After"""
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            if retry_after:
+                self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+
+    def recover(self):
+        """Aumenta a taxa aos poucos após uma resposta bem-sucedida"""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+# =====================================================
+# PER-HOST LIMITER
+# =====================================================
+
+class HostRateLimiter:
+    """
+    Um token bucket por host
+
+    Cada host começa em `rate` req/s e sobe até `max_rate` enquanto
+    responde bem; 429/503 derrubam a taxa só daquele host.
+    """
+
+    def __init__(self, rate: float = 0.5, max_rate: float = 10.0,
+                 burst: float = 1.0, min_rate: float = 0.05):
+        self.rate = rate
+        self.max_rate = max(rate, max_rate)
+        self.burst = burst
+        self.min_rate = min(rate, min_rate)
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, url: str) -> TokenBucket:
+        """Retorna (criando se preciso) o bucket do host da URL"""
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._buckets:
+                self._buckets[host] = TokenBucket(
+                    self.rate, self.burst, self.min_rate, self.max_rate,
+                    increase=self.rate / 5,
+                )
+            return self._buckets[host]
+
+    def acquire(self, url: str):
+        """Bloqueia até que um request para o host seja permitido"""
+        wait = self.bucket(url).reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, url: str):
+        """Versão assíncrona de acquire"""
+        wait = self.bucket(url).reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def on_response(self, url: str, status: int, retry_after: Optional[str] = None):
+        """Ajusta a taxa do host a partir do status da resposta"""
+        bucket = self.bucket(url)
+        if status in THROTTLE_STATUS:
+            bucket.throttle(parse_retry_after(retry_after))
+        elif status < 400:
+            bucket.recover()
+
+# =====================================================
+# RETRY POLICY
+# =====================================================
+
+class RetryPolicy:
+    """Decide se e quando repetir um request"""
+
+    def __init__(self, max_retries: int = 3, base_delay: float = 2.0,
+                 max_delay: float = 60.0):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    @staticmethod
+    def is_retryable_status(status: int) -> bool:
+        """404, 403 etc. não melhoram tentando de novo"""
+        return status in RETRYABLE_STATUS
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Tempo de espera antes da próxima tentativa
+
+        Args:
+            attempt: Número da tentativa que falhou (começando em 0)
+            retry_after: Espera pedida pelo servidor, se houver
+
+        Returns:
+            float: Segundos a esperar (backoff exponencial com full jitter)
+        """
+        ceiling = min(self.max_delay, self.base_delay * (2 ** attempt))
+        delay = random.uniform(0, ceiling)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_delay))
+        return delay
@@ -0,0 +1,138 @@
+"""
+=====================================================
+CULTURAL REFERENCE RECORDS
+=====================================================
+Description: Tipo de registro compacto (__slots__) para as
+             referências culturais que passam pelo pipeline de
+             scraping e seed, com serialização direta para o
+             payload de inserção
+Author: FlertAI Team
+Date: 2025-10-01
+=====================================================
+"""
+
+import sys
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Union
+
+FIELDS = ('termo', 'tipo', 'significado', 'exemplo_uso', 'regiao', 'contexto_flerte')
+
+# Valores de tipo/regiao das constraints tipo_valido e regiao_valida
+TIPOS = frozenset(sys.intern(tipo) for tipo in (
+    'giria', 'meme', 'novela', 'musica', 'personalidade', 'evento',
+    'expressao_regional', 'filme', 'serie', 'esporte', 'comida', 'lugar',
+))
+REGIOES = frozenset(sys.intern(regiao) for regiao in (
+    'nacional', 'norte', 'nordeste', 'centro-oeste', 'sudeste', 'sul',
+))
+
+
+class CulturalReference:
+    """
+    Uma referência cultural (gíria, meme, música...)
+
+    Sem __dict__ por instância, e tipo/regiao internados: milhões de
+    registros compartilham as mesmas poucas strings. Aceita leitura
+    como dict (record['termo'], record.get(...)) para o código que
+    ainda trata registros como dicionários.
+    """
+
+    __slots__ = FIELDS
+
+    def __init__(self, termo: str, tipo: str, significado: str,
+                 exemplo_uso: Optional[str] = None, regiao: str = 'nacional',
+                 contexto_flerte: Optional[str] = None):
+        self.termo = termo
+        self.tipo = sys.intern(tipo)
+        self.significado = significado
+        self.exemplo_uso = exemplo_uso
+        self.regiao = sys.intern(regiao)
+        self.contexto_flerte = contexto_flerte
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> 'CulturalReference':
+        """Cria o registro a partir de um dict com as chaves de FIELDS"""
+        return cls(
+            data['termo'],
+            data['tipo'],
+            data['significado'],
+            data.get('exemplo_uso'),
+            data.get('regiao') or 'nacional',
+            data.get('contexto_flerte'),
+        )
+
+    def to_payload(self) -> Dict[str, Any]:
+        """Dict para o insert/upsert (e para json.dumps)"""
+        return {
+            'termo': self.termo,
+            'tipo': self.tipo,
+            'significado': self.significado,
+            'exemplo_uso': self.exemplo_uso,
+            'regiao': self.regiao,
+            'contexto_flerte': self.contexto_flerte,
+        }
+
+    def payload_size(self) -> int:
+        """Tamanho aproximado do JSON do registro, sem serializar"""
+        size = 96  # Chaves, aspas e separadores
+        for field in FIELDS:
+            value = getattr(self, field)
+            if value:
+                size += len(value)
+        return size
+
+    # Compatibilidade com dict ----------------------------
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in FIELDS and getattr(self, key) is not None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = getattr(self, key, None) if key in FIELDS else None
+        return default if value is None else value
+
+    def keys(self):
+        return FIELDS
+
+    # Protocolos ------------------------------------------
+
+    def __reduce__(self):
+        # Pickle compacto para o pool de parse: só a tupla de valores
+        return (CulturalReference, tuple(getattr(self, field) for field in FIELDS))
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, CulturalReference):
+            return NotImplemented
+        return all(getattr(self, field) == getattr(other, field) for field in FIELDS)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"CulturalReference(termo={self.termo!r}, tipo={self.tipo!r}, regiao={self.regiao!r})"
+
+
+Record = Union[CulturalReference, Dict[str, Any]]
+
+
+def as_payload(record: Record) -> Dict[str, Any]:
+    """Payload de um registro (CulturalReference ou dict já pronto)"""
+    return record.to_payload() if isinstance(record, CulturalReference) else record
+
+
+def to_payloads(records: Iterable[Record]) -> List[Dict[str, Any]]:
+    """Payloads de um batch, criados só na hora do envio"""
+    return [as_payload(record) for record in records]
+
+
+def estimate_payload_bytes(records: Iterable[Record]) -> int:
+    """Tamanho aproximado do JSON de um batch (para dimensionar batches)"""
+    total = 2
+    for record in records:
+        if isinstance(record, CulturalReference):
+            total += record.payload_size()
+        else:
+            total += 16 + sum(len(str(key)) + len(str(value)) + 6 for key, value in record.items())
+    return total
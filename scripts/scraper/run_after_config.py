@@ -9,6 +9,8 @@ import os
 import sys
 from dotenv import load_dotenv
 
+from storage import uses_supabase
+
 print("="*70)
 print("SCRIPT DE VERIFICAÇÃO E EXECUÇÃO")
 print("="*70)
@@ -24,35 +26,38 @@ supabase_key = os.getenv('SUPABASE_KEY')
 print("1. Verificando configuração do .env...")
 print()
 
-if not supabase_url:
-    print("  ✗ SUPABASE_URL não configurado")
-    sys.exit(1)
+if not uses_supabase():
+    print(f"  ✓ STORAGE_BACKEND=local (sem Supabase): {os.getenv('LOCAL_BACKEND_PATH', 'local_backend.db') or 'memória'}")
 else:
-    print(f"  ✓ SUPABASE_URL: {supabase_url}")
-
-if not supabase_key or supabase_key == 'COLOQUE_SUA_SERVICE_ROLE_KEY_AQUI':
-    print("  ✗ SUPABASE_KEY inválido ou não configurado")
-    print()
-    print("⚠️  AÇÃO NECESSÁRIA:")
-    print()
-    print("1. Abra: https://supabase.com/dashboard/project/olojvpoqosrjcoxygiyf/settings/api")
-    print("2. Copie a chave 'service_role' (secret)")
-    print("3. Cole no arquivo .env na linha SUPABASE_KEY=")
-    print("4. Execute este script novamente")
-    print()
-    sys.exit(1)
-else:
-    key_preview = supabase_key[:20] + "..." + supabase_key[-10:] if len(supabase_key) > 30 else "***"
-    print(f"  ✓ SUPABASE_KEY: {key_preview}")
+    if not supabase_url:
+        print("  ✗ SUPABASE_URL não configurado")
+        sys.exit(1)
+    else:
+        print(f"  ✓ SUPABASE_URL: {supabase_url}")
+
+    if not supabase_key or supabase_key == 'COLOQUE_SUA_SERVICE_ROLE_KEY_AQUI':
+        print("  ✗ SUPABASE_KEY inválido ou não configurado")
+        print()
+        print("⚠️  AÇÃO NECESSÁRIA:")
+        print()
+        print("1. Abra: https://supabase.com/dashboard/project/olojvpoqosrjcoxygiyf/settings/api")
+        print("2. Copie a chave 'service_role' (secret)")
+        print("3. Cole no arquivo .env na linha SUPABASE_KEY=")
+        print("4. Execute este script novamente")
+        print()
+        sys.exit(1)
+    else:
+        key_preview = supabase_key[:20] + "..." + supabase_key[-10:] if len(supabase_key) > 30 else "***"
+        print(f"  ✓ SUPABASE_KEY: {key_preview}")
 
 print()
 print("2. Testando conexão com Supabase...")
 print()
 
 try:
-    from supabase import create_client
+    from storage import create_storage_client
     
-    client = create_client(supabase_url, supabase_key)
+    client = create_storage_client(supabase_url, supabase_key)
     
     # Testar se tabela existe
     result = client.table('cultural_references').select('id').limit(1).execute()
@@ -91,15 +96,16 @@ print("3. Carregando seed data...")
 print()
 
 try:
-    from seed_data import get_seed_data
-    
-    seed_data = get_seed_data()
-    print(f"  ✓ {len(seed_data)} referências carregadas")
+    from seed_data import iter_seed_records
     
-    # Estatísticas
+    # Estatísticas (só contadores; os registros são lidos de novo no passo 4)
     from collections import Counter
-    tipos = Counter([d['tipo'] for d in seed_data])
-    regioes = Counter([d['regiao'] for d in seed_data])
+    tipos = Counter()
+    regioes = Counter()
+    for record in iter_seed_records():
+        tipos[record.tipo] += 1
+        regioes[record.regiao] += 1
+    print(f"  ✓ {sum(tipos.values())} referências carregadas")
     
     print()
     print("  Por tipo:")
@@ -120,13 +126,14 @@ print("4. Verificando registros existentes...")
 print()
 
 try:
-    existing = client.table('cultural_references').select('termo').execute()
-    existing_terms = {row['termo'] for row in existing.data}
+    from table_reader import iter_table
+    
+    existing_terms = {row['termo'] for row in iter_table(client, 'cultural_references', 'termo', key='termo')}
     
     print(f"  ✓ {len(existing_terms)} termos já existem no banco")
     
     # Filtrar novos
-    new_data = [d for d in seed_data if d['termo'] not in existing_terms]
+    new_data = [record.to_payload() for record in iter_seed_records() if record.termo not in existing_terms]
     
     if len(new_data) == 0:
         print()
@@ -135,7 +142,7 @@ try:
         print(f"Total no banco: {len(existing_terms)} referências culturais")
         print()
         print("Próximos passos:")
-        print("1. Expandir seed_data.py para 1000+ refs")
+        print("1. Expandir seed_data.tsv para 1000+ refs")
         print("2. Integrar com Edge Function (docs/INTEGRACAO_CULTURAL_REFERENCES.md)")
         print("3. Testar no app!")
         print()
@@ -196,7 +203,7 @@ try:
     print()
     print("Próximos passos:")
     print("1. Verificar dados no Supabase Dashboard")
-    print("2. Expandir para 1000+ referências (editar seed_data.py)")
+    print("2. Expandir para 1000+ referências (editar seed_data.tsv)")
     print("3. Integrar com Edge Function")
     print()
     
@@ -20,17 +20,38 @@ import os
 import re
 import json
 import time
+import queue
 import logging
-from typing import List, Dict, Optional
+import threading
+from types import MappingProxyType
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, Dict, Optional, Iterable, Iterator, Set, Tuple, Type
 from datetime import datetime
 
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from fake_useragent import UserAgent
-from retry import retry
 from tqdm import tqdm
 from dotenv import load_dotenv
-from supabase import create_client, Client
+from supabase import Client
+
+try:
+    import pandas as pd
+except ImportError:  # Caminho vetorizado é opcional
+    pd = None
+
+from batch_recovery import RejectLog, insert_with_bisection, is_backpressure_error
+from checkpoint import CrawlCheckpoint
+from dedup_index import NearDuplicateIndex
+from fetch_engine import AsyncFetchEngine
+from html_parser import parse_html, resolve_backend, select_text
+from http_cache import ResponseCache
+from insert_engine import AdaptiveBatchSizer, InsertEngine
+from rate_limiter import HostRateLimiter, RetryPolicy, parse_retry_after
+from metrics import MetricsExporter, PipelineMetrics
+from records import REGIOES, TIPOS, CulturalReference, Record, to_payloads
+from storage import create_storage_client, uses_supabase
+from table_reader import iter_table
 
 # =====================================================
 # CONFIGURATION
@@ -47,6 +68,18 @@ SUPABASE_KEY = os.getenv('SUPABASE_KEY')
 MAX_RETRIES = int(os.getenv('MAX_RETRIES', 3))
 TIMEOUT_SECONDS = int(os.getenv('TIMEOUT_SECONDS', 30))
 DELAY_BETWEEN_REQUESTS = float(os.getenv('DELAY_BETWEEN_REQUESTS', 2))
+MAX_CONCURRENT_REQUESTS = int(os.getenv('MAX_CONCURRENT_REQUESTS', 50))
+MAX_CONCURRENT_PER_HOST = int(os.getenv('MAX_CONCURRENT_PER_HOST', 2))
+MAX_REQUESTS_PER_SECOND_PER_HOST = float(os.getenv('MAX_REQUESTS_PER_SECOND_PER_HOST', 10))
+MAX_RETRY_DELAY = float(os.getenv('MAX_RETRY_DELAY', 60))
+
+# HTML Parsing (lxml, html.parser, html5lib ou selectolax)
+PARSER_BACKEND = os.getenv('PARSER_BACKEND', 'lxml')
+
+# HTTP Cache (HTTP_CACHE_DIR vazio desativa o cache)
+HTTP_CACHE_DIR = os.getenv('HTTP_CACHE_DIR', '.http_cache')
+HTTP_CACHE_TTL_HOURS = float(os.getenv('HTTP_CACHE_TTL_HOURS', 168))
+HTTP_CACHE_MAX_MB = int(os.getenv('HTTP_CACHE_MAX_MB', 500))
 
 # Data Quality
 MIN_TERM_LENGTH = int(os.getenv('MIN_TERM_LENGTH', 3))
@@ -54,9 +87,47 @@ MAX_TERM_LENGTH = int(os.getenv('MAX_TERM_LENGTH', 100))
 MIN_MEANING_LENGTH = int(os.getenv('MIN_MEANING_LENGTH', 10))
 MAX_MEANING_LENGTH = int(os.getenv('MAX_MEANING_LENGTH', 500))
 
+# A partir deste tamanho validate_and_clean_many usa pandas (0 = nunca)
+VECTORIZE_THRESHOLD = int(os.getenv('VECTORIZE_THRESHOLD', 0))
+
 # Batch Processing
-BATCH_SIZE = int(os.getenv('BATCH_SIZE', 50))
+BATCH_SIZE = int(os.getenv('BATCH_SIZE', 50))  # Tamanho inicial; ajustado pelo InsertEngine
+INSERT_WORKERS = int(os.getenv('INSERT_WORKERS', 4))
+INSERT_BATCH_MIN = int(os.getenv('INSERT_BATCH_MIN', 10))
+INSERT_BATCH_MAX = int(os.getenv('INSERT_BATCH_MAX', 500))
+INSERT_TARGET_LATENCY = float(os.getenv('INSERT_TARGET_LATENCY', 1.0))
+INSERT_MAX_PAYLOAD_KB = int(os.getenv('INSERT_MAX_PAYLOAD_KB', 1024))
 MAX_TOTAL_RECORDS = int(os.getenv('MAX_TOTAL_RECORDS', 1000))
+EXISTS_CHUNK_SIZE = int(os.getenv('EXISTS_CHUNK_SIZE', 200))
+# insert: INSERT simples (exige checar existência antes)
+# upsert: ON CONFLICT (termo), sem leitura prévia da tabela
+INSERT_MODE = os.getenv('INSERT_MODE', 'insert')
+# No upsert: ignore mantém a linha existente, merge atualiza com os dados novos
+UPSERT_ON_DUPLICATE = os.getenv('UPSERT_ON_DUPLICATE', 'ignore')
+# Linhas que violam constraints vão para este JSONL (vazio desativa)
+REJECT_FILE = os.getenv('REJECT_FILE', 'rejected_records.jsonl')
+
+# Quase-duplicatas ("Gato(a)" x "Gato", "Dahora" x "Da hora"); 0 desativa.
+# Ativo, lê a tabela inteira uma vez no início (no lugar das checagens por chunk)
+NEAR_DUPLICATE_THRESHOLD = float(os.getenv('NEAR_DUPLICATE_THRESHOLD', 0))
+TERMS_PAGE_SIZE = int(os.getenv('TERMS_PAGE_SIZE', 1000))
+
+# Pipeline ('batch' = três fases, 'streaming' = scrape → insert contínuo)
+PIPELINE_MODE = os.getenv('PIPELINE_MODE', 'batch')
+STREAM_QUEUE_SIZE = int(os.getenv('STREAM_QUEUE_SIZE', 4))
+
+# Parse/clean em processos separados (0 = um por CPU, 1 = no processo principal)
+PARSE_WORKERS = int(os.getenv('PARSE_WORKERS', 0)) or os.cpu_count() or 1
+PARSE_CHUNK_PAGES = int(os.getenv('PARSE_CHUNK_PAGES', 200))
+
+# Checkpoint (CHECKPOINT_FILE vazio desativa a retomada)
+CHECKPOINT_FILE = os.getenv('CHECKPOINT_FILE', 'scraper_checkpoint.db')
+
+# Metrics Configuration
+# Métricas por etapa: snapshot JSON / textfile do Prometheus (vazio desativa)
+METRICS_FILE = os.getenv('METRICS_FILE', 'scraper_metrics.json')
+METRICS_PROM_FILE = os.getenv('METRICS_PROM_FILE', '')
+METRICS_EXPORT_INTERVAL = float(os.getenv('METRICS_EXPORT_INTERVAL', 30))
 
 # Logging Configuration
 LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
@@ -83,11 +154,13 @@ ua = UserAgent()
 class SupabaseClient:
     """Cliente Supabase para inserção de dados"""
     
-    def __init__(self):
-        if not SUPABASE_URL or not SUPABASE_KEY:
+    def __init__(self, insert_mode: str = INSERT_MODE):
+        if uses_supabase() and (not SUPABASE_URL or not SUPABASE_KEY):
             raise ValueError("SUPABASE_URL and SUPABASE_KEY must be set in environment")
         
-        self.client: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+        self.client: Client = create_storage_client(SUPABASE_URL, SUPABASE_KEY)
+        self.insert_mode = insert_mode
+        self.reject_log = RejectLog(REJECT_FILE) if REJECT_FILE else None
         logger.info("Supabase client initialized successfully")
     
     def insert_cultural_reference(self, data: Dict) -> bool:
@@ -108,7 +181,7 @@ class SupabaseClient:
             logger.error(f"Error inserting {data.get('termo', 'unknown')}: {e}")
             return False
     
-    def insert_batch(self, data_list: List[Dict]) -> int:
+    def insert_batch(self, data_list: List[Record]) -> int:
         """
         Insere múltiplas referências em batch
         
@@ -118,20 +191,60 @@ class SupabaseClient:
         Returns:
             int: Número de inserções bem-sucedidas
         """
-        success_count = 0
         try:
-            result = self.client.table('cultural_references').insert(data_list).execute()
-            success_count = len(data_list)
+            success_count = self._insert(data_list)
             logger.info(f"Batch inserted: {success_count} records")
         except Exception as e:
-            logger.error(f"Batch insert failed, trying individual inserts: {e}")
-            # Fallback: tentar inserir individualmente
-            for data in data_list:
-                if self.insert_cultural_reference(data):
-                    success_count += 1
+            if is_backpressure_error(e):
+                raise
+            logger.error(f"Batch insert failed, isolating bad rows: {e}")
+            success_count = insert_with_bisection(self._insert, data_list, e, self.reject_log)
+        
+        return success_count
+    
+    def upsert_batch(self, data_list: List[Record], ignore_duplicates: bool = True) -> int:
+        """
+        Grava um batch com ON CONFLICT (termo), sem checar existência antes
+        
+        Idempotente: pode ser reexecutado ou rodar em paralelo com outra
+        carga sem erro de chave duplicada.
+        
+        Args:
+            data_list: Lista de dicionários com dados
+            ignore_duplicates: True mantém as linhas existentes; False as atualiza
+        
+        Returns:
+            int: Número de linhas gravadas (no modo ignore, só as novas)
+        """
+        def upsert(rows: List[Record]) -> int:
+            result = self.client.table('cultural_references').upsert(
+                to_payloads(rows), on_conflict='termo', ignore_duplicates=ignore_duplicates
+            ).execute()
+            return len(result.data)
+        
+        # Termo repetido no mesmo comando quebra o ON CONFLICT DO UPDATE
+        data_list = list({data['termo']: data for data in data_list}.values())
+        try:
+            success_count = upsert(data_list)
+            logger.info(f"Batch upserted: {success_count} of {len(data_list)} records written")
+        except Exception as e:
+            if is_backpressure_error(e):
+                raise
+            logger.error(f"Batch upsert failed, isolating bad rows: {e}")
+            success_count = insert_with_bisection(upsert, data_list, e, self.reject_log)
         
         return success_count
     
+    def write_batch(self, data_list: List[Record]) -> int:
+        """Grava um batch conforme o INSERT_MODE do cliente"""
+        if self.insert_mode == 'upsert':
+            return self.upsert_batch(data_list, ignore_duplicates=UPSERT_ON_DUPLICATE != 'merge')
+        return self.insert_batch(data_list)
+    
+    def _insert(self, data_list: List[Record]) -> int:
+        self.client.table('cultural_references').insert(to_payloads(data_list)).execute()
+        return len(data_list)
+    
     def check_exists(self, termo: str) -> bool:
         """
         Verifica se um termo já existe no banco
@@ -148,11 +261,68 @@ class SupabaseClient:
         except Exception as e:
             logger.error(f"Error checking existence of {termo}: {e}")
             return False
+    
+    def fetch_existing_terms(self, termos: Iterable[str]) -> Set[str]:
+        """
+        Verifica em lote quais termos já existem no banco
+        
+        Consulta os candidatos em chunks de EXISTS_CHUNK_SIZE com
+        `termo IN (...)`, trocando um round-trip por termo por um por chunk.
+        
+        Args:
+            termos: Termos candidatos
+        
+        Returns:
+            Set[str]: Subconjunto dos termos que já existem
+        """
+        candidates = list(dict.fromkeys(termos))
+        existing: Set[str] = set()
+        
+        for i in range(0, len(candidates), EXISTS_CHUNK_SIZE):
+            chunk = candidates[i:i+EXISTS_CHUNK_SIZE]
+            try:
+                result = self.client.table('cultural_references').select('termo').in_('termo', chunk).execute()
+                existing.update(row['termo'] for row in result.data)
+            except Exception as e:
+                logger.error(f"Bulk existence check failed, checking chunk individually: {e}")
+                # Fallback: verificar termo a termo apenas neste chunk
+                existing.update(termo for termo in chunk if self.check_exists(termo))
+        
+        return existing
+    
+    def iter_terms(self) -> Iterator[Dict]:
+        """
+        Percorre termo e significado de toda a tabela, em páginas por termo
+        
+        Returns:
+            Iterator[Dict]: Linhas {'termo', 'significado'}
+        """
+        return iter_table(self.client, 'cultural_references', 'termo, significado',
+                          key='termo', page_size=TERMS_PAGE_SIZE)
 
 # =====================================================
 # DATA VALIDATION AND CLEANING
 # =====================================================
 
+_WHITESPACE_RE = re.compile(r'\s+')
+
+VALID_TYPES = TIPOS
+
+# Mapeamento de sinônimos
+TYPE_SYNONYMS = MappingProxyType({
+    'gíria': 'giria',
+    'música': 'musica',
+    'série': 'serie',
+    'expressão': 'expressao_regional',
+    'regional': 'expressao_regional',
+})
+
+VALID_REGIONS = REGIOES
+
+REQUIRED_FIELDS = ('termo', 'tipo', 'significado')
+TEXT_FIELDS = ('termo', 'significado', 'exemplo_uso', 'contexto_flerte')
+
+
 class DataCleaner:
     """Limpeza e validação de dados coletados"""
     
@@ -161,132 +331,420 @@ class DataCleaner:
         """Remove espaços extras e normaliza texto"""
         if not text:
             return ""
-        text = re.sub(r'\s+', ' ', text.strip())
-        text = text.replace('\n', ' ').replace('\r', '')
-        return text
+        # \s já cobre \n e \r
+        return _WHITESPACE_RE.sub(' ', text.strip())
     
     @staticmethod
     def validate_term(termo: str) -> bool:
         """Valida se o termo atende aos critérios"""
         if not termo:
             return False
-        termo_clean = DataCleaner.clean_text(termo)
-        length = len(termo_clean)
-        return MIN_TERM_LENGTH <= length <= MAX_TERM_LENGTH
+        return MIN_TERM_LENGTH <= len(DataCleaner.clean_text(termo)) <= MAX_TERM_LENGTH
     
     @staticmethod
     def validate_meaning(significado: str) -> bool:
         """Valida se o significado atende aos critérios"""
         if not significado:
             return False
-        sig_clean = DataCleaner.clean_text(significado)
-        length = len(sig_clean)
-        return MIN_MEANING_LENGTH <= length <= MAX_MEANING_LENGTH
+        return MIN_MEANING_LENGTH <= len(DataCleaner.clean_text(significado)) <= MAX_MEANING_LENGTH
     
     @staticmethod
     def normalize_type(tipo: str) -> str:
         """Normaliza o tipo para valores válidos"""
         tipo_lower = tipo.lower()
-        valid_types = [
-            'giria', 'meme', 'novela', 'musica', 'personalidade',
-            'evento', 'expressao_regional', 'filme', 'serie',
-            'esporte', 'comida', 'lugar'
-        ]
-        
-        # Mapeamento de sinônimos
-        type_map = {
-            'gíria': 'giria',
-            'música': 'musica',
-            'série': 'serie',
-            'expressão': 'expressao_regional',
-            'regional': 'expressao_regional',
-        }
-        
-        tipo_normalized = type_map.get(tipo_lower, tipo_lower)
-        return tipo_normalized if tipo_normalized in valid_types else 'giria'
+        tipo_normalized = TYPE_SYNONYMS.get(tipo_lower, tipo_lower)
+        return tipo_normalized if tipo_normalized in VALID_TYPES else 'giria'
     
     @staticmethod
     def normalize_region(regiao: str) -> str:
         """Normaliza a região para valores válidos"""
         regiao_lower = regiao.lower() if regiao else 'nacional'
-        valid_regions = ['nacional', 'norte', 'nordeste', 'centro-oeste', 'sudeste', 'sul']
-        return regiao_lower if regiao_lower in valid_regions else 'nacional'
+        return regiao_lower if regiao_lower in VALID_REGIONS else 'nacional'
     
     @staticmethod
-    def validate_and_clean(data: Dict) -> Optional[Dict]:
+    def validate_and_clean(data: Record) -> Optional[CulturalReference]:
         """
         Valida e limpa um registro completo
         
         Args:
-            data: Dicionário com dados brutos
+            data: Dicionário (ou registro) com dados brutos
         
         Returns:
-            Optional[Dict]: Dados limpos ou None se inválido
+            Optional[CulturalReference]: Dados limpos ou None se inválido
         """
         # Campos obrigatórios
-        if not all(k in data for k in ['termo', 'tipo', 'significado']):
+        if not all(k in data for k in REQUIRED_FIELDS):
             return None
         
-        # Limpeza
-        termo = DataCleaner.clean_text(data['termo'])
-        significado = DataCleaner.clean_text(data['significado'])
-        
-        # Validação
-        if not DataCleaner.validate_term(termo):
+        # Limpeza (uma vez por campo) e validação pelo tamanho já limpo
+        clean_text = DataCleaner.clean_text
+        termo = clean_text(data['termo'])
+        if not MIN_TERM_LENGTH <= len(termo) <= MAX_TERM_LENGTH:
             return None
-        if not DataCleaner.validate_meaning(significado):
+        significado = clean_text(data['significado'])
+        if not MIN_MEANING_LENGTH <= len(significado) <= MAX_MEANING_LENGTH:
             return None
         
         # Construir dados limpos
-        clean_data = {
-            'termo': termo,
-            'tipo': DataCleaner.normalize_type(data['tipo']),
-            'significado': significado,
-            'exemplo_uso': DataCleaner.clean_text(data.get('exemplo_uso', '')),
-            'regiao': DataCleaner.normalize_region(data.get('regiao', 'nacional')),
-            'contexto_flerte': DataCleaner.clean_text(data.get('contexto_flerte', ''))
-        }
+        return CulturalReference(
+            termo,
+            DataCleaner.normalize_type(data['tipo']),
+            significado,
+            clean_text(data.get('exemplo_uso', '')),
+            DataCleaner.normalize_region(data.get('regiao', 'nacional')),
+            clean_text(data.get('contexto_flerte', '')),
+        )
+    
+    @staticmethod
+    def deduplicate(records: List[CulturalReference], index: NearDuplicateIndex) -> List[CulturalReference]:
+        """
+        Remove variantes de termos já indexados ("Gato(a)" x "Gato")
         
-        return clean_data
+        Os registros aceitos entram no índice, então variantes dentro
+        do próprio lote também são removidas.
+        
+        Args:
+            records: Registros limpos
+            index: Índice de quase-duplicatas
+        
+        Returns:
+            List[CulturalReference]: Registros sem quase-duplicatas
+        """
+        unique = []
+        for data in records:
+            match = index.check_and_add(data['termo'], data['significado'])
+            if match is None:
+                unique.append(data)
+            else:
+                logger.debug(f"Near duplicate: {data['termo']} ~ {match}")
+        return unique
+    
+    @staticmethod
+    def validate_and_clean_many(records: List[Record]) -> List[CulturalReference]:
+        """
+        Valida e limpa muitos registros de uma vez
+        
+        Com VECTORIZE_THRESHOLD > 0 e pandas instalado, lotes a partir
+        desse tamanho usam o caminho vetorizado; o resultado é o mesmo
+        do loop. Com strings object do pandas o loop costuma ser mais
+        rápido, por isso o caminho vetorizado é opt-in.
+        
+        Args:
+            records: Lista de dicionários com dados brutos
+        
+        Returns:
+            List[CulturalReference]: Registros válidos e limpos, na ordem original
+        """
+        if pd is not None and VECTORIZE_THRESHOLD and len(records) >= VECTORIZE_THRESHOLD:
+            frame = DataCleaner.validate_and_clean_frame(pd.DataFrame.from_records(map(dict, records)))
+            return [CulturalReference(*row) for row in frame.itertuples(index=False, name=None)]
+        
+        validate = DataCleaner.validate_and_clean
+        return [clean for clean in map(validate, records) if clean is not None]
+    
+    @staticmethod
+    def validate_and_clean_frame(df: 'pd.DataFrame') -> 'pd.DataFrame':
+        """
+        Versão vetorizada de validate_and_clean sobre um DataFrame
+        
+        Args:
+            df: Uma linha por registro bruto
+        
+        Returns:
+            pd.DataFrame: Apenas as linhas válidas, com as colunas limpas
+        """
+        if df.empty or not all(k in df.columns for k in REQUIRED_FIELDS):
+            return pd.DataFrame(columns=['termo', 'tipo', 'significado', 'exemplo_uso', 'regiao', 'contexto_flerte'])
+        
+        # Campos obrigatórios ausentes no dict viram NaN: descartar
+        df = df[df['termo'].notna() & df['tipo'].notna() & df['significado'].notna()]
+        
+        out = pd.DataFrame(index=df.index)
+        for field in TEXT_FIELDS:
+            values = df[field] if field in df.columns else pd.Series('', index=df.index)
+            values = values.where(values.notna() & (values != ''), '').astype(str)
+            out[field] = values.str.strip().str.replace(_WHITESPACE_RE, ' ', regex=True)
+        
+        term_len = out['termo'].str.len()
+        meaning_len = out['significado'].str.len()
+        valid = (term_len.between(MIN_TERM_LENGTH, MAX_TERM_LENGTH)
+                 & meaning_len.between(MIN_MEANING_LENGTH, MAX_MEANING_LENGTH))
+        out = out[valid]
+        df = df[valid]
+        
+        tipo = df['tipo'].astype(str).str.lower()
+        tipo = tipo.replace(dict(TYPE_SYNONYMS))
+        out['tipo'] = tipo.where(tipo.isin(VALID_TYPES), 'giria')
+        
+        if 'regiao' in df.columns:
+            regiao = df['regiao'].where(df['regiao'].notna() & (df['regiao'] != ''), 'nacional').astype(str).str.lower()
+        else:
+            regiao = pd.Series('nacional', index=df.index)
+        out['regiao'] = regiao.where(regiao.isin(VALID_REGIONS), 'nacional')
+        
+        return out[['termo', 'tipo', 'significado', 'exemplo_uso', 'regiao', 'contexto_flerte']]
 
 # =====================================================
 # WEB SCRAPERS
 # =====================================================
 
+def build_rate_limiter() -> HostRateLimiter:
+    """Cria o rate limiter por host com a configuração do .env"""
+    return HostRateLimiter(
+        rate=1 / DELAY_BETWEEN_REQUESTS if DELAY_BETWEEN_REQUESTS > 0 else MAX_REQUESTS_PER_SECOND_PER_HOST,
+        max_rate=MAX_REQUESTS_PER_SECOND_PER_HOST,
+    )
+
+
+def build_retry_policy() -> RetryPolicy:
+    """Cria a política de retry com a configuração do .env"""
+    return RetryPolicy(max_retries=MAX_RETRIES, base_delay=2, max_delay=MAX_RETRY_DELAY)
+
+
+def build_response_cache() -> Optional[ResponseCache]:
+    """Cria o cache de respostas em disco (None se desativado)"""
+    if not HTTP_CACHE_DIR:
+        return None
+    return ResponseCache(
+        HTTP_CACHE_DIR,
+        ttl_seconds=HTTP_CACHE_TTL_HOURS * 3600,
+        max_bytes=HTTP_CACHE_MAX_MB * 1024 * 1024,
+    )
+
+
+def build_fetch_engine(metrics: Optional[PipelineMetrics] = None) -> AsyncFetchEngine:
+    """Cria o engine assíncrono com a configuração do .env"""
+    return AsyncFetchEngine(
+        max_concurrency=MAX_CONCURRENT_REQUESTS,
+        per_host_concurrency=MAX_CONCURRENT_PER_HOST,
+        rate_limiter=build_rate_limiter(),
+        retry_policy=build_retry_policy(),
+        cache=build_response_cache(),
+        timeout=TIMEOUT_SECONDS,
+        headers={'User-Agent': ua.random},
+        metrics=metrics,
+    )
+
+
+def build_insert_engine(write: Callable[[List[Record]], int],
+                        reject_log: Optional[RejectLog] = None,
+                        metrics: Optional[PipelineMetrics] = None) -> InsertEngine:
+    """Cria o engine de inserção com a configuração do .env"""
+    sizer = AdaptiveBatchSizer(
+        initial=BATCH_SIZE,
+        min_size=INSERT_BATCH_MIN,
+        max_size=INSERT_BATCH_MAX,
+        target_latency=INSERT_TARGET_LATENCY,
+        max_payload_bytes=INSERT_MAX_PAYLOAD_KB * 1024,
+    )
+    return InsertEngine(write, workers=INSERT_WORKERS, sizer=sizer,
+                        retry_policy=build_retry_policy(), reject_log=reject_log,
+                        metrics=metrics)
+
+
 class BaseScraper:
     """Classe base para scrapers"""
     
-    def __init__(self):
+    def __init__(self, engine: Optional[AsyncFetchEngine] = None):
         self.session = requests.Session()
         self.session.headers.update({'User-Agent': ua.random})
+        self.engine = engine or build_fetch_engine()
+        # Mesmo limiter do engine: sync e async dividem a taxa de cada host
+        self.rate_limiter = self.engine.rate_limiter
+        self.retry_policy = self.engine.retry_policy
+        self.cache = self.engine.cache
+        self.metrics = self.engine.metrics
+        self.checkpoint: Optional[CrawlCheckpoint] = None
+        self.parser_backend = resolve_backend(PARSER_BACKEND)
+    
+    def pending_urls(self, urls: List[str]) -> List[str]:
+        """Filtra URLs já processadas numa execução anterior (checkpoint)"""
+        if not self.checkpoint:
+            return list(urls)
+        return [url for url in urls if not self.checkpoint.is_visited(url)]
+    
+    def mark_visited(self, *urls: str):
+        """
+        Registra URLs como processadas no checkpoint
+        
+        Chamar só depois que os registros da página foram gerados, para
+        que uma retomada não pule páginas cujos dados se perderam.
+        """
+        if self.checkpoint:
+            self.checkpoint.mark_visited(urls)
     
-    @retry(tries=MAX_RETRIES, delay=2, backoff=2)
-    def fetch_page(self, url: str) -> Optional[BeautifulSoup]:
+    def scrape(self) -> List[Record]:
+        """Coleta todas as referências desta fonte"""
+        raise NotImplementedError
+    
+    def page_urls(self) -> List[str]:
+        """
+        Páginas que o orquestrador deve baixar e entregar a parse_references
+        
+        Scrapers baseados em páginas sobrescrevem este método e
+        parse_references; o parsing roda no pool de processos.
+        """
+        return []
+    
+    @classmethod
+    def parse_references(cls, content: bytes, url: str, backend: str) -> List[Record]:
+        """
+        Extrai referências brutas do HTML de uma página
+        
+        Roda em um processo worker: não pode depender de estado da
+        instância (sessão, engine, checkpoint).
+        
+        Args:
+            content: Corpo bruto da página
+            url: URL da página
+            backend: Backend de parsing (PARSER_BACKEND)
+        
+        Returns:
+            List[Record]: Referências brutas encontradas
+        """
+        raise NotImplementedError
+    
+    def iter_references(self) -> Iterator[Record]:
+        """
+        Gera as referências uma a uma (pipeline streaming)
+        
+        A implementação padrão delega para scrape(); scrapers reais devem
+        sobrescrever e fazer yield à medida que cada página é processada.
+        """
+        yield from self.scrape()
+    
+    def fetch_page(self, url: str, parse_only: Optional[SoupStrainer] = None) -> Optional[BeautifulSoup]:
         """
         Faz request e retorna BeautifulSoup
         
         Args:
             url: URL a fazer scraping
+            parse_only: Se informado, só os nós que casam entram na árvore
         
         Returns:
             Optional[BeautifulSoup]: Objeto parsed ou None
         """
-        try:
-            logger.debug(f"Fetching: {url}")
-            response = self.session.get(url, timeout=TIMEOUT_SECONDS)
-            response.raise_for_status()
-            response.encoding = 'utf-8'
-            time.sleep(DELAY_BETWEEN_REQUESTS)
-            return BeautifulSoup(response.text, 'html.parser')
-        except Exception as e:
-            logger.error(f"Error fetching {url}: {e}")
+        content = self._get(url)
+        if content is None:
             return None
+        return parse_html(content, self.parser_backend, parse_only)
+    
+    def fetch_text(self, url: str, selector: str) -> List[str]:
+        """
+        Faz request e extrai só o texto dos nós do seletor CSS
+        
+        Args:
+            url: URL a fazer scraping
+            selector: Seletor CSS dos nós de interesse
+        
+        Returns:
+            List[str]: Texto de cada nó (vazio se o request falhou)
+        """
+        content = self._get(url)
+        if content is None:
+            return []
+        return select_text(content, selector, self.parser_backend)
+    
+    def _get(self, url: str) -> Optional[bytes]:
+        """
+        Faz GET respeitando o rate limit do host
+        
+        Só repete erros temporários (timeouts, 429, 5xx), com backoff
+        exponencial + jitter e respeitando Retry-After. Com cache ativo,
+        envia If-None-Match/If-Modified-Since e serve 304 do disco.
+        
+        Args:
+            url: URL a baixar
+        
+        Returns:
+            Optional[bytes]: Corpo da resposta ou None em caso de erro
+        """
+        with self.metrics.stage('fetch', items=1):
+            return self._get_with_retries(url)
+    
+    def _get_with_retries(self, url: str) -> Optional[bytes]:
+        policy = self.retry_policy
+        metrics = self.metrics
+        
+        for attempt in range(policy.max_retries):
+            retry_after = None
+            self.rate_limiter.acquire(url)
+            start = time.perf_counter()
+            try:
+                logger.debug(f"Fetching: {url}")
+                conditional = self.cache.conditional_headers(url) if self.cache else {}
+                response = self.session.get(url, headers=conditional, timeout=TIMEOUT_SECONDS)
+                metrics.observe_fetch(url, time.perf_counter() - start, response.status_code,
+                                      len(response.content))
+                header = response.headers.get('Retry-After')
+                self.rate_limiter.on_response(url, response.status_code, header)
+                if response.status_code == 304 and self.cache:
+                    body = self.cache.load(url)
+                    if body is not None:
+                        metrics.incr('cache_hits')
+                        return body
+                    # Entrada expirou entre o request e a leitura: pede a página
+                    # inteira, sem gastar uma tentativa
+                    logger.debug(f"Cache entry gone after 304, refetching: {url}")
+                    self.rate_limiter.acquire(url)
+                    start = time.perf_counter()
+                    response = self.session.get(url, timeout=TIMEOUT_SECONDS)
+                    metrics.observe_fetch(url, time.perf_counter() - start, response.status_code,
+                                          len(response.content))
+                    header = response.headers.get('Retry-After')
+                    self.rate_limiter.on_response(url, response.status_code, header)
+                if response.ok:
+                    if self.cache:
+                        self.cache.store(url, response.content, response.headers)
+                    return response.content
+                error = f"HTTP {response.status_code}"
+                if not policy.is_retryable_status(response.status_code):
+                    logger.error(f"Error fetching {url}: {error}")
+                    return None
+                retry_after = parse_retry_after(header)
+            except requests.RequestException as e:
+                metrics.observe_fetch(url, time.perf_counter() - start, None)
+                error = e
+            
+            if attempt + 1 >= policy.max_retries:
+                logger.error(f"Error fetching {url}: {error}")
+                return None
+            delay = policy.backoff(attempt, retry_after)
+            logger.warning(f"Retrying {url} in {delay:.1f}s: {error}")
+            metrics.record_retry(url)
+            time.sleep(delay)
+        
+        return None
+    
+    def fetch_pages(self, urls: List[str],
+                    parse_only: Optional[SoupStrainer] = None) -> Dict[str, Optional[BeautifulSoup]]:
+        """
+        Faz requests concorrentes e retorna BeautifulSoup de cada página
+        
+        Usa o engine assíncrono: limite global de concorrência e
+        rate limit aplicado por host.
+        
+        Args:
+            urls: URLs a fazer scraping
+            parse_only: Se informado, só os nós que casam entram na árvore
+        
+        Returns:
+            Dict[str, Optional[BeautifulSoup]]: Objeto parsed (ou None) por URL
+        """
+        bodies = self.engine.run(urls)
+        return {
+            url: parse_html(body, self.parser_backend, parse_only) if body is not None else None
+            for url, body in bodies.items()
+        }
 
 
 class GiriasScraper(BaseScraper):
     """Scraper para sites de gírias brasileiras"""
     
-    def scrape_dicionario_informal(self) -> List[Dict]:
+    def scrape(self) -> List[Record]:
+        return self.scrape_dicionario_informal()
+    
+    def scrape_dicionario_informal(self) -> List[Record]:
         """
         Scraper de exemplo: Dicionário Informal
         NOTA: Este é um exemplo simplificado. Adaptar conforme site real.
@@ -308,40 +766,43 @@ class GiriasScraper(BaseScraper):
         logger.info(f"Dicionário Informal: collected {len(references)} references")
         return references
     
-    def _generate_mock_girias(self) -> List[Dict]:
+    def _generate_mock_girias(self) -> List[CulturalReference]:
         """Gera dados mock para demonstração"""
         return [
-            {
-                'termo': 'Tá ligado',
-                'tipo': 'giria',
-                'significado': 'Expressão para verificar entendimento ou concordância',
-                'exemplo_uso': 'Gostei do seu perfil, tá ligado?',
-                'regiao': 'sudeste',
-                'contexto_flerte': 'Casual, confirma interesse'
-            },
-            {
-                'termo': 'Maneiro',
-                'tipo': 'giria',
-                'significado': 'Legal, bacana, interessante',
-                'exemplo_uso': 'Achei seu perfil maneiro demais!',
-                'regiao': 'nacional',
-                'contexto_flerte': 'Elogio casual'
-            },
-            {
-                'termo': 'Bagulho doido',
-                'tipo': 'giria',
-                'significado': 'Algo impressionante, surpreendente',
-                'exemplo_uso': 'Seu sorriso é um bagulho doido!',
-                'regiao': 'sudeste',
-                'contexto_flerte': 'Elogio criativo'
-            },
+            CulturalReference(
+                termo='Tá ligado',
+                tipo='giria',
+                significado='Expressão para verificar entendimento ou concordância',
+                exemplo_uso='Gostei do seu perfil, tá ligado?',
+                regiao='sudeste',
+                contexto_flerte='Casual, confirma interesse'
+            ),
+            CulturalReference(
+                termo='Maneiro',
+                tipo='giria',
+                significado='Legal, bacana, interessante',
+                exemplo_uso='Achei seu perfil maneiro demais!',
+                regiao='nacional',
+                contexto_flerte='Elogio casual'
+            ),
+            CulturalReference(
+                termo='Bagulho doido',
+                tipo='giria',
+                significado='Algo impressionante, surpreendente',
+                exemplo_uso='Seu sorriso é um bagulho doido!',
+                regiao='sudeste',
+                contexto_flerte='Elogio criativo'
+            ),
         ]
 
 
 class MemesScraper(BaseScraper):
     """Scraper para memes e referências da internet brasileira"""
     
-    def scrape_know_your_meme_br(self) -> List[Dict]:
+    def scrape(self) -> List[Record]:
+        return self.scrape_know_your_meme_br()
+    
+    def scrape_know_your_meme_br(self) -> List[Record]:
         """
         Scraper de exemplo: Memes brasileiros
         """
@@ -356,32 +817,35 @@ class MemesScraper(BaseScraper):
         logger.info(f"Memes: collected {len(references)} references")
         return references
     
-    def _generate_mock_memes(self) -> List[Dict]:
+    def _generate_mock_memes(self) -> List[CulturalReference]:
         """Gera dados mock de memes"""
         return [
-            {
-                'termo': 'Stonks',
-                'tipo': 'meme',
-                'significado': 'Meme sobre investimentos bons (ou ruins de forma irônica)',
-                'exemplo_uso': 'Match com você foi total stonks!',
-                'regiao': 'nacional',
-                'contexto_flerte': 'Humor moderno, indica lucro/ganho'
-            },
-            {
-                'termo': 'F no chat',
-                'tipo': 'meme',
-                'significado': 'Expressar condolências ou respeito de forma humorística',
-                'exemplo_uso': 'F no chat pros que não deram match comigo',
-                'regiao': 'nacional',
-                'contexto_flerte': 'Humor autodepreciativo leve'
-            },
+            CulturalReference(
+                termo='Stonks',
+                tipo='meme',
+                significado='Meme sobre investimentos bons (ou ruins de forma irônica)',
+                exemplo_uso='Match com você foi total stonks!',
+                regiao='nacional',
+                contexto_flerte='Humor moderno, indica lucro/ganho'
+            ),
+            CulturalReference(
+                termo='F no chat',
+                tipo='meme',
+                significado='Expressar condolências ou respeito de forma humorística',
+                exemplo_uso='F no chat pros que não deram match comigo',
+                regiao='nacional',
+                contexto_flerte='Humor autodepreciativo leve'
+            ),
         ]
 
 
 class CulturalReferencesScraper(BaseScraper):
     """Scraper para referências culturais brasileiras (novelas, músicas, etc)"""
     
-    def scrape_cultural_references(self) -> List[Dict]:
+    def scrape(self) -> List[Record]:
+        return self.scrape_cultural_references()
+    
+    def scrape_cultural_references(self) -> List[Record]:
         """Coleta referências culturais diversas"""
         logger.info("Starting Cultural References scraper")
         references = []
@@ -394,35 +858,60 @@ class CulturalReferencesScraper(BaseScraper):
         logger.info(f"Cultural: collected {len(references)} references")
         return references
     
-    def _generate_mock_cultural(self) -> List[Dict]:
+    def _generate_mock_cultural(self) -> List[CulturalReference]:
         """Gera dados mock de cultura brasileira"""
         return [
-            {
-                'termo': 'Evidências',
-                'tipo': 'musica',
-                'significado': 'Música romântica icônica de Chitãozinho e Xororó',
-                'exemplo_uso': 'Tipo Evidências: quando vejo você, eu me rendo',
-                'regiao': 'nacional',
-                'contexto_flerte': 'Romântico, referência nostálgica'
-            },
-            {
-                'termo': 'Avenida Brasil',
-                'tipo': 'novela',
-                'significado': 'Novela icônica da Globo, drama e reviravoltas',
-                'exemplo_uso': 'Essa conversa tá melhor que Avenida Brasil!',
-                'regiao': 'nacional',
-                'contexto_flerte': 'Humorístico, comparação empolgante'
-            },
-            {
-                'termo': 'Feijoada',
-                'tipo': 'comida',
-                'significado': 'Prato típico brasileiro, símbolo de encontro familiar',
-                'exemplo_uso': 'Bora marcar uma feijoada pra gente se conhecer melhor?',
-                'regiao': 'nacional',
-                'contexto_flerte': 'Convite casual e acolhedor'
-            },
+            CulturalReference(
+                termo='Evidências',
+                tipo='musica',
+                significado='Música romântica icônica de Chitãozinho e Xororó',
+                exemplo_uso='Tipo Evidências: quando vejo você, eu me rendo',
+                regiao='nacional',
+                contexto_flerte='Romântico, referência nostálgica'
+            ),
+            CulturalReference(
+                termo='Avenida Brasil',
+                tipo='novela',
+                significado='Novela icônica da Globo, drama e reviravoltas',
+                exemplo_uso='Essa conversa tá melhor que Avenida Brasil!',
+                regiao='nacional',
+                contexto_flerte='Humorístico, comparação empolgante'
+            ),
+            CulturalReference(
+                termo='Feijoada',
+                tipo='comida',
+                significado='Prato típico brasileiro, símbolo de encontro familiar',
+                exemplo_uso='Bora marcar uma feijoada pra gente se conhecer melhor?',
+                regiao='nacional',
+                contexto_flerte='Convite casual e acolhedor'
+            ),
         ]
 
+# =====================================================
+# PARSE WORKERS
+# =====================================================
+
+ParseTask = Tuple[Type[BaseScraper], str, bytes, str]
+
+
+def parse_and_clean_page(task: ParseTask) -> List[CulturalReference]:
+    """
+    Parseia e limpa uma página (executado nos processos do pool)
+    
+    Args:
+        task: (classe do scraper, URL, corpo bruto, backend de parsing)
+    
+    Returns:
+        List[CulturalReference]: Registros já validados e limpos
+    """
+    scraper_cls, url, content, backend = task
+    try:
+        raw = scraper_cls.parse_references(content, url, backend)
+    except Exception as e:
+        logger.error(f"Error parsing {url}: {e}")
+        return []
+    return DataCleaner.validate_and_clean_many(raw)
+
 # =====================================================
 # ORCHESTRATOR
 # =====================================================
@@ -430,77 +919,388 @@ class CulturalReferencesScraper(BaseScraper):
 class ScraperOrchestrator:
     """Orquestra todos os scrapers e inserção no banco"""
     
-    def __init__(self):
+    def __init__(self, checkpoint: Optional[CrawlCheckpoint] = None):
+        self.metrics = PipelineMetrics()
         self.db_client = SupabaseClient()
+        self.insert_engine = build_insert_engine(self.db_client.write_batch,
+                                                 getattr(self.db_client, 'reject_log', None),
+                                                 self.metrics)
+        self.checkpoint = checkpoint
+        # Engine compartilhado: o limite global vale para todos os scrapers
+        self.fetch_engine = build_fetch_engine(self.metrics)
         self.scrapers = [
-            GiriasScraper(),
-            MemesScraper(),
-            CulturalReferencesScraper()
+            GiriasScraper(self.fetch_engine),
+            MemesScraper(self.fetch_engine),
+            CulturalReferencesScraper(self.fetch_engine)
         ]
         self.collected_data = []
+        self.known_terms: Set[str] = set()
+        self.queued_terms: Set[str] = set()
+        self.resumed_data: List[CulturalReference] = []
+        self.parsed_data: List[CulturalReference] = []
+        self.parsed_urls: List[str] = []
+        self.finished_scrapers: List[str] = []
+        self._parse_pool: Optional[ProcessPoolExecutor] = None
+        self._dedup_index: Optional[NearDuplicateIndex] = None
+        self.collected_count = 0
+        self.validated_count = 0
         self.inserted_count = 0
         self.skipped_count = 0
+        
+        if self.checkpoint:
+            self.resume_from_checkpoint()
+    
+    def resume_from_checkpoint(self):
+        """Recupera termos inseridos e registros pendentes da execução anterior"""
+        summary = self.checkpoint.summary()
+        if not any(summary.values()):
+            return
+        logger.info(f"Resuming from checkpoint {self.checkpoint.path}: {summary}")
+        
+        for scraper in self.scrapers:
+            scraper.checkpoint = self.checkpoint
+        self.known_terms.update(self.checkpoint.inserted_terms())
+        pending = list(self.checkpoint.pending_records())
+        # Batches que falharam em parte ficam pendentes: o que já entrou sai da fila
+        written = self.db_client.fetch_existing_terms(data['termo'] for data in pending) if pending else set()
+        if written:
+            self.checkpoint.mark_terms_inserted(written)
+            self.known_terms.update(written)
+        self.resumed_data = [data for data in pending if data['termo'] not in written]
+        self.queued_terms.update(data['termo'] for data in self.resumed_data)
+    
+    def active_scrapers(self) -> List[BaseScraper]:
+        """Scrapers ainda não concluídos (segundo o checkpoint)"""
+        active = []
+        for scraper in self.scrapers:
+            name = scraper.__class__.__name__
+            if self.checkpoint and self.checkpoint.is_scraper_done(name):
+                logger.info(f"Skipping {name}: already completed (checkpoint)")
+            else:
+                scraper.checkpoint = self.checkpoint
+                active.append(scraper)
+        return active
+    
+    def commit_finished_scrapers(self):
+        """
+        Marca no checkpoint os scrapers cujos registros já foram gravados
+        
+        Só é chamado depois que os registros passaram por filter_new_terms
+        (e portanto estão no checkpoint), nunca logo após o scrape.
+        """
+        if self.checkpoint:
+            for name in self.finished_scrapers:
+                self.checkpoint.mark_scraper_done(name)
+        self.finished_scrapers = []
     
-    def run_all_scrapers(self) -> List[Dict]:
+    def run_all_scrapers(self) -> List[Record]:
         """Executa todos os scrapers"""
         logger.info("Starting all scrapers...")
         all_references = []
         
-        for scraper in self.scrapers:
+        for scraper in self.active_scrapers():
             try:
-                if isinstance(scraper, GiriasScraper):
-                    refs = scraper.scrape_dicionario_informal()
-                elif isinstance(scraper, MemesScraper):
-                    refs = scraper.scrape_know_your_meme_br()
-                elif isinstance(scraper, CulturalReferencesScraper):
-                    refs = scraper.scrape_cultural_references()
-                else:
-                    refs = []
-                
-                all_references.extend(refs)
+                all_references.extend(scraper.scrape())
+                # Páginas já saem limpas do pool: não passam pela validação de novo
+                self.parsed_data.extend(self.iter_parsed_pages(scraper))
+                self.finished_scrapers.append(scraper.__class__.__name__)
             except Exception as e:
                 logger.error(f"Scraper {scraper.__class__.__name__} failed: {e}")
         
-        logger.info(f"Total references collected: {len(all_references)}")
+        logger.info(f"Total references collected: {len(all_references) + len(self.parsed_data)}")
         return all_references
     
-    def clean_and_validate_data(self, raw_data: List[Dict]) -> List[Dict]:
+    def iter_scraper(self, scraper: BaseScraper) -> Iterator[CulturalReference]:
+        """Gera as referências limpas de um scraper, uma a uma"""
+        try:
+            for data in scraper.iter_references():
+                self.collected_count += 1
+                start = time.perf_counter()
+                clean = DataCleaner.validate_and_clean(data)
+                self.metrics.add_stage_time('clean', time.perf_counter() - start, 1)
+                if clean:
+                    yield clean
+            yield from self.iter_parsed_pages(scraper)
+            self.finished_scrapers.append(scraper.__class__.__name__)
+        except Exception as e:
+            logger.error(f"Scraper {scraper.__class__.__name__} failed: {e}")
+    
+    def parse_pool(self) -> ProcessPoolExecutor:
+        """Pool de processos para parse/limpeza (criado sob demanda)"""
+        if self._parse_pool is None:
+            logger.info(f"Starting parse pool with {PARSE_WORKERS} workers")
+            self._parse_pool = ProcessPoolExecutor(max_workers=PARSE_WORKERS)
+        return self._parse_pool
+    
+    def parse_pages(self, scraper: BaseScraper, bodies: Dict[str, Optional[bytes]]) -> Iterator[Tuple[str, List[CulturalReference]]]:
+        """
+        Distribui páginas baixadas entre os workers de parse/limpeza
+        
+        Args:
+            scraper: Scraper dono das páginas
+            bodies: Corpo bruto por URL (None = fetch falhou)
+        
+        Returns:
+            Iterator[Tuple[str, List[CulturalReference]]]: (URL, registros limpos) na ordem das URLs
+        """
+        tasks = [
+            (type(scraper), url, body, scraper.parser_backend)
+            for url, body in bodies.items() if body is not None
+        ]
+        if PARSE_WORKERS <= 1 or len(tasks) <= 1:
+            results = map(parse_and_clean_page, tasks)
+        else:
+            chunksize = max(1, len(tasks) // (PARSE_WORKERS * 4))
+            results = self.parse_pool().map(parse_and_clean_page, tasks, chunksize=chunksize)
+        return zip((task[1] for task in tasks), results)
+    
+    def iter_parsed_pages(self, scraper: BaseScraper) -> Iterator[CulturalReference]:
+        """
+        Baixa as páginas do scraper e gera os registros limpos pelo pool
+        
+        As páginas são processadas em blocos de PARSE_CHUNK_PAGES para que
+        só um bloco de corpos brutos fique em memória por vez.
+        """
+        urls = scraper.pending_urls(scraper.page_urls())
+        for i in range(0, len(urls), PARSE_CHUNK_PAGES):
+            bodies = self.fetch_engine.run(urls[i:i+PARSE_CHUNK_PAGES])
+            # Inclui a limpeza, feita nos mesmos workers
+            with self.metrics.stage('parse', items=len(bodies)):
+                parsed = list(self.parse_pages(scraper, bodies))
+            for url, records in parsed:
+                self.collected_count += len(records)
+                yield from records
+                # Marcada como visitada quando os registros forem gravados
+                self.parsed_urls.append(url)
+    
+    def close(self):
+        """Libera o pool de processos"""
+        if self._parse_pool is not None:
+            self._parse_pool.shutdown()
+            self._parse_pool = None
+    
+    def dedup_index(self) -> NearDuplicateIndex:
+        """
+        Índice de quase-duplicatas com os termos do banco (carregado sob demanda)
+        
+        A mesma leitura preenche known_terms com todos os termos da tabela,
+        então a checagem exata não precisa mais das consultas por chunk.
+        """
+        if self._dedup_index is None:
+            logger.info("Loading existing terms into near-duplicate index...")
+            self._dedup_index = NearDuplicateIndex(term_threshold=NEAR_DUPLICATE_THRESHOLD)
+            # No upsert não há leitura da tabela: só variantes desta execução
+            if self.db_client.insert_mode != 'upsert':
+                for row in self.db_client.iter_terms():
+                    self.known_terms.add(row['termo'])
+                    self._dedup_index.add(row['termo'], row.get('significado') or '')
+            for data in self.resumed_data:
+                self._dedup_index.add(data['termo'], data['significado'])
+            logger.info(f"Near-duplicate index ready: {len(self._dedup_index)} terms")
+        return self._dedup_index
+    
+    def filter_new_terms(self, validated: List[CulturalReference]) -> List[CulturalReference]:
+        """
+        Remove termos que já existem no banco ou já entraram nesta execução
+        
+        Args:
+            validated: Registros já limpos e validados
+        
+        Returns:
+            List[CulturalReference]: Registros com termos novos
+        """
+        with self.metrics.stage('dedup', items=len(validated)):
+            fresh = self._filter_new_terms(validated)
+        
+        if self.checkpoint:
+            self.checkpoint.add_records(fresh)
+            self.checkpoint.mark_visited(self.parsed_urls)
+        self.parsed_urls = []
+        return fresh
+    
+    def _filter_new_terms(self, validated: List[CulturalReference]) -> List[CulturalReference]:
+        # Verificar existência em lote (um round-trip por chunk, não por termo);
+        # no upsert o próprio banco descarta os conflitos
+        if NEAR_DUPLICATE_THRESHOLD > 0:
+            # O índice já carregou a tabela inteira em known_terms
+            self.dedup_index()
+        elif self.db_client.insert_mode != 'upsert':
+            unknown = {clean['termo'] for clean in validated} - self.known_terms - self.queued_terms
+            self.known_terms.update(self.db_client.fetch_existing_terms(unknown))
+        
+        fresh = []
+        for clean in validated:
+            if clean['termo'] in self.known_terms or clean['termo'] in self.queued_terms:
+                logger.debug(f"Termo já existe: {clean['termo']}")
+                self.skipped_count += 1
+            else:
+                self.queued_terms.add(clean['termo'])
+                fresh.append(clean)
+        
+        if NEAR_DUPLICATE_THRESHOLD > 0:
+            unique = DataCleaner.deduplicate(fresh, self.dedup_index())
+            self.skipped_count += len(fresh) - len(unique)
+            fresh = unique
+        return fresh
+    
+    def clean_and_validate_data(self, raw_data: List[Record]) -> List[CulturalReference]:
         """Limpa e valida todos os dados coletados"""
         logger.info("Cleaning and validating data...")
-        cleaned_data = []
-        
-        for data in tqdm(raw_data, desc="Validating"):
-            clean = DataCleaner.validate_and_clean(data)
-            if clean:
-                # Verificar se já existe
-                if not self.db_client.check_exists(clean['termo']):
-                    cleaned_data.append(clean)
-                else:
-                    logger.debug(f"Termo já existe: {clean['termo']}")
-                    self.skipped_count += 1
+        
+        with self.metrics.stage('clean', items=len(raw_data)):
+            validated = DataCleaner.validate_and_clean_many(raw_data)
+        validated.extend(self.parsed_data)
+        
+        cleaned_data = self.filter_new_terms(validated)
+        self.commit_finished_scrapers()
         
         logger.info(f"Valid references: {len(cleaned_data)}")
         logger.info(f"Skipped (duplicates): {self.skipped_count}")
         return cleaned_data
     
-    def insert_to_database(self, data_list: List[Dict]) -> int:
+    def record_batch(self, batch: List[CulturalReference], count: int):
+        """
+        Registra um batch gravado (termos conhecidos e checkpoint)
+        
+        Um batch sem nenhuma linha gravada (o engine desistiu depois dos
+        retries) fica pendente no checkpoint, para ser repetido ao retomar.
+        """
+        if count == 0:
+            return
+        self.known_terms.update(data['termo'] for data in batch)
+        if self.checkpoint:
+            self.checkpoint.mark_inserted(batch, count)
+    
+    def insert_to_database(self, data_list: List[CulturalReference]) -> int:
         """Insere dados no banco em batches"""
         logger.info("Inserting data into database...")
-        total_inserted = 0
         
         # Limitar ao MAX_TOTAL_RECORDS
         data_to_insert = data_list[:MAX_TOTAL_RECORDS]
         
-        # Processar em batches
-        for i in tqdm(range(0, len(data_to_insert), BATCH_SIZE), desc="Inserting"):
-            batch = data_to_insert[i:i+BATCH_SIZE]
-            count = self.db_client.insert_batch(batch)
-            total_inserted += count
-            time.sleep(1)  # Rate limiting
+        with tqdm(total=len(data_to_insert), desc="Inserting", unit="rec") as progress:
+            def on_batch(batch: List[CulturalReference], count: int):
+                self.record_batch(batch, count)
+                progress.update(len(batch))
+            
+            total_inserted = self.insert_engine.run(data_to_insert, on_batch)
         
         logger.info(f"Total inserted: {total_inserted}")
         return total_inserted
     
+    def iter_clean_batches(self) -> Iterator[List[CulturalReference]]:
+        """
+        Valida e deduplica os registros à medida que os scrapers os geram
+        
+        A verificação de existência é feita a cada EXISTS_CHUNK_SIZE
+        registros válidos; os novos saem em batches de BATCH_SIZE.
+        """
+        pending: List[CulturalReference] = []
+        ready: List[CulturalReference] = list(self.resumed_data)
+        remaining = MAX_TOTAL_RECORDS
+        
+        def take_batch() -> List[CulturalReference]:
+            nonlocal ready, remaining
+            batch = ready[:min(BATCH_SIZE, remaining)]
+            ready = ready[len(batch):]
+            remaining -= len(batch)
+            self.validated_count += len(batch)
+            return batch
+        
+        for scraper in self.active_scrapers():
+            if len(ready) >= remaining:
+                break
+            references = self.iter_scraper(scraper)
+            capped = False
+            for clean in references:
+                pending.append(clean)
+                if len(pending) >= EXISTS_CHUNK_SIZE:
+                    ready.extend(self.filter_new_terms(pending))
+                    pending = []
+                    while len(ready) >= BATCH_SIZE and remaining > 0:
+                        yield take_batch()
+                    if len(ready) >= remaining:
+                        capped = True
+                        break
+            
+            if capped:
+                # MAX_TOTAL_RECORDS atingido: nenhum outro scraper começa, e este
+                # não é marcado concluído (roda de novo ao retomar)
+                references.close()
+                break
+            
+            # Gravar o que sobrou deste scraper antes de marcá-lo concluído
+            if pending:
+                ready.extend(self.filter_new_terms(pending))
+                pending = []
+            self.commit_finished_scrapers()
+        
+        while ready and remaining > 0:
+            yield take_batch()
+    
+    def run_streaming_pipeline(self):
+        """
+        Executa o pipeline em modo streaming
+        
+        Uma thread produtora coleta, valida e deduplica; a thread principal
+        consome os batches de uma fila limitada e os passa ao InsertEngine. A memória fica
+        limitada ao tamanho da fila e os primeiros registros chegam ao
+        banco assim que o primeiro batch fica pronto.
+        """
+        logger.info("="*50)
+        logger.info("STARTING CULTURAL REFERENCES SCRAPER (STREAMING)")
+        logger.info("="*50)
+        
+        start_time = time.time()
+        batches: queue.Queue = queue.Queue(maxsize=STREAM_QUEUE_SIZE)
+        done = object()
+        
+        def produce():
+            try:
+                for batch in self.iter_clean_batches():
+                    batches.put(batch)
+            except Exception as e:
+                logger.error(f"Streaming producer failed: {e}", exc_info=True)
+            finally:
+                batches.put(done)
+        
+        producer = threading.Thread(target=produce, name="scraper-producer", daemon=True)
+        producer.start()
+        
+        def records() -> Iterator[CulturalReference]:
+            while True:
+                batch = batches.get()
+                if batch is done:
+                    return
+                yield from batch
+        
+        with tqdm(desc="Inserting", unit="rec") as progress:
+            def on_batch(batch: List[CulturalReference], count: int):
+                self.inserted_count += count
+                self.record_batch(batch, count)
+                progress.update(len(batch))
+            
+            self.insert_engine.run(records(), on_batch)
+        
+        producer.join()
+        
+        if self.fetch_engine.cache:
+            self.fetch_engine.cache.prune()
+        if self.checkpoint:
+            self.checkpoint.clear()
+        
+        elapsed = time.time() - start_time
+        logger.info("="*50)
+        logger.info("SCRAPING COMPLETED")
+        logger.info(f"Time elapsed: {elapsed:.2f}s")
+        logger.info(f"Total collected: {self.collected_count}")
+        logger.info(f"Total validated: {self.validated_count}")
+        logger.info(f"Total inserted: {self.inserted_count}")
+        logger.info(f"Total skipped: {self.skipped_count}")
+        logger.info(f"Stage times: {self.metrics.summary()}")
+        logger.info("="*50)
+        self.record_totals(self.collected_count, self.validated_count)
+    
     def run_full_pipeline(self):
         """Executa pipeline completo"""
         logger.info("="*50)
@@ -512,22 +1312,39 @@ class ScraperOrchestrator:
         # 1. Coletar dados
         raw_data = self.run_all_scrapers()
         
-        # 2. Limpar e validar
-        clean_data = self.clean_and_validate_data(raw_data)
+        # 2. Limpar e validar (pendentes do checkpoint entram primeiro)
+        clean_data = self.resumed_data + self.clean_and_validate_data(raw_data)
         
         # 3. Inserir no banco
         self.inserted_count = self.insert_to_database(clean_data)
         
+        # 4. Manter o cache HTTP dentro do TTL e do tamanho máximo
+        if self.fetch_engine.cache:
+            self.fetch_engine.cache.prune()
+        
+        # 5. Execução completa: o próximo run começa do zero
+        if self.checkpoint:
+            self.checkpoint.clear()
+        
         # Estatísticas finais
         elapsed = time.time() - start_time
         logger.info("="*50)
         logger.info("SCRAPING COMPLETED")
         logger.info(f"Time elapsed: {elapsed:.2f}s")
-        logger.info(f"Total collected: {len(raw_data)}")
+        logger.info(f"Total collected: {len(raw_data) + len(self.parsed_data)}")
         logger.info(f"Total validated: {len(clean_data)}")
         logger.info(f"Total inserted: {self.inserted_count}")
         logger.info(f"Total skipped: {self.skipped_count}")
+        logger.info(f"Stage times: {self.metrics.summary()}")
         logger.info("="*50)
+        self.record_totals(len(raw_data) + len(self.parsed_data), len(clean_data))
+    
+    def record_totals(self, collected: int, validated: int):
+        """Copia os totais da execução para as métricas exportadas"""
+        self.metrics.set('collected', collected)
+        self.metrics.set('validated', validated)
+        self.metrics.set('inserted', self.inserted_count)
+        self.metrics.set('skipped', self.skipped_count)
 
 # =====================================================
 # MAIN ENTRY POINT
@@ -536,8 +1353,19 @@ class ScraperOrchestrator:
 def main():
     """Função principal"""
     try:
-        orchestrator = ScraperOrchestrator()
-        orchestrator.run_full_pipeline()
+        checkpoint = CrawlCheckpoint(CHECKPOINT_FILE) if CHECKPOINT_FILE else None
+        orchestrator = ScraperOrchestrator(checkpoint)
+        exporter = MetricsExporter(orchestrator.metrics, json_path=METRICS_FILE or None,
+                                   prometheus_path=METRICS_PROM_FILE or None,
+                                   interval=METRICS_EXPORT_INTERVAL)
+        try:
+            with exporter:
+                if PIPELINE_MODE == 'streaming':
+                    orchestrator.run_streaming_pipeline()
+                else:
+                    orchestrator.run_full_pipeline()
+        finally:
+            orchestrator.close()
     except KeyboardInterrupt:
         logger.warning("Scraping interrupted by user")
     except Exception as e:
@@ -0,0 +1,50 @@
+"""
+=====================================================
+STORAGE CLIENT FACTORY
+=====================================================
+Description: Cria o cliente de banco usado pelos scripts:
+             Supabase (padrão) ou o backend local, conforme
+             STORAGE_BACKEND
+Author: FlertAI Team
+Date: 2025-10-01
+=====================================================
+"""
+
+import os
+from typing import Optional
+
+BACKENDS = ('supabase', 'local')
+
+
+def storage_backend() -> str:
+    """Backend configurado (lido na chamada, depois do load_dotenv dos scripts)"""
+    backend = os.getenv('STORAGE_BACKEND', 'supabase')
+    if backend not in BACKENDS:
+        raise ValueError(f"STORAGE_BACKEND must be one of {BACKENDS}, got '{backend}'")
+    return backend
+
+
+def uses_supabase() -> bool:
+    """True se os scripts precisam de SUPABASE_URL / chave"""
+    return storage_backend() == 'supabase'
+
+
+def create_storage_client(url: Optional[str] = None, key: Optional[str] = None):
+    """
+    Cria o cliente com a interface do Supabase (table/rpc)
+
+    Args:
+        url: SUPABASE_URL (ignorado no backend local)
+        key: Chave do Supabase (ignorado no backend local)
+
+    Returns:
+        Client do Supabase ou LocalBackend
+    """
+    if storage_backend() == 'local':
+        from local_backend import get_local_backend
+        return get_local_backend()
+
+    if not url or not key:
+        raise ValueError("SUPABASE_URL and SUPABASE_KEY must be set")
+    from supabase import create_client
+    return create_client(url, key)
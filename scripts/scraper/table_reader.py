@@ -0,0 +1,97 @@
+"""
+=====================================================
+TABLE READER
+=====================================================
+Description: Leitura paginada de tabelas inteiras via PostgREST
+             com paginação keyset (WHERE chave > última), sem
+             truncar no limite de linhas da API e com memória
+             limitada a uma página
+Author: FlertAI Team
+Date: 2025-10-01
+=====================================================
+"""
+
+import logging
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Abaixo do max-rows padrão do Supabase (1000), senão a página vem truncada
+# e parece a última
+DEFAULT_PAGE_SIZE = 1000
+
+QueryFilter = Callable[[Any], Any]
+
+
+def _quote(value: Any) -> str:
+    """Valor literal para a sintaxe de or=(...) do PostgREST"""
+    text = str(value).replace('\\', '\\\\').replace('"', '\\"')
+    return f'"{text}"'
+
+
+def _with_columns(columns: str, *required: str) -> str:
+    """Garante que as colunas da chave estejam no select"""
+    if '*' in columns:
+        return columns
+    selected = {column.strip() for column in columns.split(',')}
+    missing = [column for column in required if column and column not in selected]
+    return ', '.join([columns] + missing) if missing else columns
+
+
+def iter_pages(client, table: str, columns: str = '*', key: str = 'id',
+               tiebreaker: Optional[str] = None, page_size: int = DEFAULT_PAGE_SIZE,
+               filters: Optional[QueryFilter] = None) -> Iterator[List[Dict]]:
+    """
+    Percorre uma tabela em páginas ordenadas pela chave
+
+    Cada página começa depois da última linha da anterior (keyset), então
+    o custo por página não cresce com o offset e linhas inseridas durante
+    a leitura não deslocam as páginas.
+
+    Args:
+        client: Cliente Supabase
+        table: Nome da tabela
+        columns: Colunas do select (pode ter embeds)
+        key: Coluna de ordenação; sem tiebreaker precisa ser única
+        tiebreaker: Coluna única para desempatar uma chave não única
+                    (ex.: key='created_at', tiebreaker='id')
+        page_size: Linhas por request
+        filters: Função que recebe e devolve a query (ex.: lambda q: q.gte(...))
+
+    Returns:
+        Iterator[List[Dict]]: Páginas de linhas
+    """
+    columns = _with_columns(columns, key, tiebreaker)
+    order = f"{key},{tiebreaker}" if tiebreaker else key
+    last: Optional[Dict] = None
+
+    while True:
+        query = client.table(table).select(columns)
+        if filters:
+            query = filters(query)
+        if last is not None:
+            if tiebreaker:
+                k, t = _quote(last[key]), _quote(last[tiebreaker])
+                query = query.or_(f"{key}.gt.{k},and({key}.eq.{k},{tiebreaker}.gt.{t})")
+            else:
+                query = query.gt(key, last[key])
+        rows = query.order(order).limit(page_size).execute().data
+
+        if rows:
+            yield rows
+        if len(rows) < page_size:
+            return
+        last = rows[-1]
+
+
+def iter_table(client, table: str, columns: str = '*', key: str = 'id',
+               tiebreaker: Optional[str] = None, page_size: int = DEFAULT_PAGE_SIZE,
+               filters: Optional[QueryFilter] = None) -> Iterator[Dict]:
+    """
+    Percorre uma tabela linha a linha (ver iter_pages)
+
+    Returns:
+        Iterator[Dict]: Linhas da tabela, na ordem da chave
+    """
+    for page in iter_pages(client, table, columns, key, tiebreaker, page_size, filters):
+        yield from page
@@ -0,0 +1,14 @@
+"""
+Configuração do pytest para os testes de scripts/scraper
+
+Os módulos do scraper se importam sem pacote, como nos scripts: o
+diretório vai para o sys.path.
+"""
+
+import os
+import sys
+
+SCRAPER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if SCRAPER_DIR not in sys.path:
+    sys.path.insert(0, SCRAPER_DIR)
@@ -0,0 +1,130 @@
+"""Testes de insert_with_bisection (batch_recovery.py)"""
+
+import json
+
+import pytest
+
+from postgrest.exceptions import APIError
+
+from batch_recovery import BisectionInterrupted, RejectLog, insert_with_bisection
+from local_backend import LocalBackend
+
+
+def _reference(termo, tipo='giria'):
+    return {'termo': termo, 'tipo': tipo, 'significado': f'significado de {termo}'}
+
+
+class CountingInsert:
+    """insert() sobre um LocalBackend, contando as chamadas
+
+    `overloaded_at` lista os primeiros termos dos batches que recebem um
+    53300 (too_many_connections) na primeira tentativa.
+    """
+
+    def __init__(self, backend, overloaded_at=()):
+        self.backend = backend
+        self.calls = 0
+        self.overloaded_at = set(overloaded_at)
+
+    def __call__(self, batch):
+        self.calls += 1
+        if batch[0]['termo'] in self.overloaded_at:
+            self.overloaded_at.discard(batch[0]['termo'])
+            raise APIError({'code': '53300', 'message': 'too many connections'})
+        return len(self.backend.table('cultural_references').insert(batch).execute().data)
+
+
+def _first_error(insert, batch):
+    try:
+        insert(batch)
+    except APIError as e:
+        return e
+    raise AssertionError('batch deveria falhar')
+
+
+def test_bisection_isolates_bad_rows(tmp_path):
+    backend = LocalBackend()
+    insert = CountingInsert(backend)
+    batch = [_reference(f'termo{i}') for i in range(16)]
+    batch[5]['tipo'] = 'invalido'
+    batch[12]['tipo'] = 'invalido'
+    reject_log = RejectLog(str(tmp_path / 'rejected.jsonl'))
+
+    inserted = insert_with_bisection(insert, batch, _first_error(insert, batch), reject_log)
+
+    assert inserted == 14
+    stored = {row['termo'] for row in backend.rows['cultural_references']}
+    assert stored == {data['termo'] for i, data in enumerate(batch) if i not in (5, 12)}
+
+    assert reject_log.count == 2
+    with open(reject_log.path, encoding='utf-8') as f:
+        entries = [json.loads(line) for line in f]
+    assert [entry['record']['termo'] for entry in entries] == ['termo5', 'termo12']
+    assert all(entry['code'] == '23514' for entry in entries)
+
+
+def test_bisection_request_count_is_logarithmic():
+    insert = CountingInsert(LocalBackend())
+    batch = [_reference(f'termo{i}') for i in range(64)]
+    batch[40]['tipo'] = 'invalido'
+
+    inserted = insert_with_bisection(insert, batch, _first_error(insert, batch))
+
+    assert inserted == 63
+    # 1 tentativa inteira + 2 por nível (log2(64) = 6)
+    assert insert.calls == 1 + 2 * 6
+
+
+def test_non_row_error_is_not_bisected(tmp_path):
+    calls = []
+
+    def insert(batch):
+        calls.append(batch)
+        return len(batch)
+
+    batch = [_reference(f'termo{i}') for i in range(8)]
+    error = APIError({'code': '42501', 'message': 'permission denied'})
+    reject_log = RejectLog(str(tmp_path / 'rejected.jsonl'))
+
+    assert insert_with_bisection(insert, batch, error, reject_log) == 0
+    assert calls == []
+    assert reject_log.count == 8
+
+
+def test_single_bad_row_is_rejected(tmp_path):
+    insert = CountingInsert(LocalBackend())
+    batch = [_reference('termo', tipo=None)]
+    reject_log = RejectLog(str(tmp_path / 'rejected.jsonl'))
+
+    assert insert_with_bisection(insert, batch, _first_error(insert, batch), reject_log) == 0
+    assert insert.calls == 1
+    assert reject_log.count == 1
+
+
+@pytest.mark.parametrize('overloaded_at, inserted, remaining', [
+    # Segunda metade do batch inteiro
+    ('termo4', 4, ['termo4', 'termo5', 'termo6', 'termo7']),
+    # Um nível abaixo: termo4-5 já entraram, termo6-7 ficam para depois
+    ('termo6', 6, ['termo6', 'termo7']),
+])
+def test_backpressure_mid_bisection_is_not_rejected(tmp_path, overloaded_at, inserted, remaining):
+    backend = LocalBackend()
+    insert = CountingInsert(backend, overloaded_at=[overloaded_at])
+    batch = [_reference(f'termo{i}') for i in range(8)]
+    batch[7]['tipo'] = 'invalido'
+    reject_log = RejectLog(str(tmp_path / 'rejected.jsonl'))
+
+    with pytest.raises(BisectionInterrupted) as interrupted:
+        insert_with_bisection(insert, batch, _first_error(insert, batch), reject_log)
+
+    assert interrupted.value.inserted == inserted
+    assert [data['termo'] for data in interrupted.value.remaining] == remaining
+    assert interrupted.value.error.code == '53300'
+    assert reject_log.count == 0
+    assert len(backend.rows['cultural_references']) == inserted
+
+    # Retomando só o que faltou, apenas a linha inválida é rejeitada
+    rest = interrupted.value.remaining
+    assert insert_with_bisection(insert, rest, _first_error(insert, rest), reject_log) == len(rest) - 1
+    assert len(backend.rows['cultural_references']) == 7
+    assert reject_log.count == 1
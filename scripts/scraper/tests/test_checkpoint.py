@@ -0,0 +1,93 @@
+"""Testes de retomada com CrawlCheckpoint (checkpoint.py)"""
+
+import pytest
+
+from checkpoint import CrawlCheckpoint
+from records import CulturalReference
+
+
+def _reference(termo):
+    return CulturalReference(termo, 'giria', f'significado de {termo}', regiao='sul')
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / 'checkpoint.db')
+
+
+def _reopen(checkpoint):
+    # Simula a próxima execução: nova conexão no mesmo arquivo
+    checkpoint.close()
+    return CrawlCheckpoint(checkpoint.path)
+
+
+def test_state_survives_restart(path):
+    checkpoint = CrawlCheckpoint(path)
+    checkpoint.mark_visited(['https://a/1', 'https://a/2'])
+    checkpoint.mark_scraper_done('GiriasScraper')
+    records = [_reference(f'termo{i}') for i in range(4)]
+    checkpoint.add_records(records)
+    checkpoint.mark_inserted(records[:2], 2)
+
+    checkpoint = _reopen(checkpoint)
+    assert checkpoint.is_visited('https://a/1')
+    assert not checkpoint.is_visited('https://a/3')
+    assert checkpoint.is_scraper_done('GiriasScraper')
+    assert not checkpoint.is_scraper_done('MemesScraper')
+    assert checkpoint.inserted_terms() == {'termo0', 'termo1'}
+    # Pendentes voltam na ordem original e com todos os campos
+    assert list(checkpoint.pending_records()) == records[2:]
+    assert checkpoint.summary() == {
+        'visited_urls': 2, 'completed_scrapers': 1,
+        'pending_records': 2, 'inserted_records': 2, 'batches': 1,
+    }
+    checkpoint.close()
+
+
+def test_partial_batch_stays_pending(path):
+    checkpoint = CrawlCheckpoint(path)
+    batch = [_reference(f'termo{i}') for i in range(5)]
+    checkpoint.add_records(batch)
+
+    checkpoint.mark_inserted(batch, 3)
+    checkpoint.mark_inserted(batch, 0)
+
+    checkpoint = _reopen(checkpoint)
+    assert checkpoint.inserted_terms() == set()
+    assert [data['termo'] for data in checkpoint.pending_records()] == [data['termo'] for data in batch]
+    assert checkpoint.summary()['batches'] == 2
+    checkpoint.close()
+
+
+def test_mark_terms_inserted_reconciles_pending(path):
+    checkpoint = CrawlCheckpoint(path)
+    batch = [_reference(f'termo{i}') for i in range(5)]
+    checkpoint.add_records(batch)
+    checkpoint.mark_inserted(batch, 3)
+
+    # Ao retomar, os termos que já estão no banco saem da fila
+    checkpoint.mark_terms_inserted(['termo0', 'termo3', 'desconhecido'])
+
+    assert checkpoint.inserted_terms() == {'termo0', 'termo3'}
+    assert [data['termo'] for data in checkpoint.pending_records()] == ['termo1', 'termo2', 'termo4']
+    checkpoint.close()
+
+
+def test_add_records_keeps_first_payload(path):
+    checkpoint = CrawlCheckpoint(path)
+    checkpoint.add_records([_reference('termo')])
+    checkpoint.add_records([{'termo': 'termo', 'tipo': 'meme', 'significado': 'outro'}])
+
+    assert list(checkpoint.pending_records()) == [_reference('termo')]
+    checkpoint.close()
+
+
+def test_clear(path):
+    checkpoint = CrawlCheckpoint(path)
+    checkpoint.mark_visited(['https://a/1'])
+    checkpoint.add_records([_reference('termo')])
+    checkpoint.clear()
+
+    checkpoint = _reopen(checkpoint)
+    assert not any(checkpoint.summary().values())
+    checkpoint.close()
@@ -0,0 +1,104 @@
+"""Testes de backpressure no InsertEngine (insert_engine.py)"""
+
+from postgrest.exceptions import APIError
+
+from batch_recovery import RejectLog, insert_with_bisection, is_backpressure_error
+from insert_engine import AdaptiveBatchSizer, InsertEngine
+from local_backend import LocalBackend
+from metrics import PipelineMetrics
+from rate_limiter import RetryPolicy
+
+
+def _reference(termo, tipo='giria'):
+    return {'termo': termo, 'tipo': tipo, 'significado': f'significado de {termo}'}
+
+
+class OverloadedBackend:
+    """Grava num LocalBackend; os batches que começam em `overloaded_at`
+    recebem 53300 (too_many_connections) `times` vezes"""
+
+    def __init__(self, overloaded_at, times=1):
+        self.backend = LocalBackend()
+        self.overloaded_at = overloaded_at
+        self.times = times
+        self.calls = []
+
+    def insert(self, rows):
+        self.calls.append([data['termo'] for data in rows])
+        if rows[0]['termo'] == self.overloaded_at and self.times:
+            self.times -= 1
+            raise APIError({'code': '53300', 'message': 'too many connections'})
+        return len(self.backend.table('cultural_references').insert(rows).execute().data)
+
+    def stored(self):
+        return {row['termo'] for row in self.backend.rows['cultural_references']}
+
+
+def _client_write(db, reject_log):
+    """Mesmo tratamento de SupabaseClient.insert_batch / SeedInserter.insert_batch"""
+    def write(rows):
+        try:
+            return db.insert(rows)
+        except Exception as e:
+            if is_backpressure_error(e):
+                raise
+            return insert_with_bisection(db.insert, rows, e, reject_log)
+    return write
+
+
+class RecordingSizer(AdaptiveBatchSizer):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.backpressure = 0
+
+    def on_backpressure(self):
+        self.backpressure += 1
+        super().on_backpressure()
+
+
+def _engine(write, reject_log, max_retries=3):
+    return InsertEngine(
+        write, workers=1,
+        sizer=RecordingSizer(initial=8, min_size=2, max_size=8),
+        retry_policy=RetryPolicy(max_retries=max_retries, base_delay=0, max_delay=0),
+        reject_log=reject_log, metrics=PipelineMetrics(),
+    )
+
+
+def _batch():
+    batch = [_reference(f'termo{i}') for i in range(8)]
+    batch[1]['tipo'] = 'invalido'
+    return batch
+
+
+def test_backpressure_after_first_split_retries_remaining_rows(tmp_path):
+    # termo1 é inválida: o batch é dividido e a metade termo4-7 recebe 53300
+    db = OverloadedBackend('termo4')
+    reject_log = RejectLog(str(tmp_path / 'rejected.jsonl'))
+    engine = _engine(_client_write(db, reject_log), reject_log)
+    batches = []
+
+    total = engine.run(_batch(), lambda batch, count: batches.append((len(batch), count)))
+
+    assert total == 7
+    assert batches == [(8, 7)]
+    assert db.stored() == {f'termo{i}' for i in range(8) if i != 1}
+    # Só a linha inválida vai para os rejeitos; termo0-3 não são reenviados
+    assert reject_log.count == 1
+    assert db.calls[-1] == ['termo4', 'termo5', 'termo6', 'termo7']
+    assert sum(call == ['termo0', 'termo1', 'termo2', 'termo3'] for call in db.calls) == 1
+    # Mesmo caminho do backoff do batch inteiro
+    assert engine.sizer.backpressure == 1
+    assert engine.metrics.counters['insert_backpressure'] == 1
+
+
+def test_backpressure_after_split_gives_up_after_retries(tmp_path):
+    db = OverloadedBackend('termo4', times=10)
+    reject_log = RejectLog(str(tmp_path / 'rejected.jsonl'))
+    engine = _engine(_client_write(db, reject_log), reject_log, max_retries=2)
+
+    assert engine.run(_batch()) == 3
+    assert db.stored() == {'termo0', 'termo2', 'termo3'}
+    assert engine.sizer.backpressure == 2
+    # termo1 (inválida) + termo4-7 (desistência depois das tentativas)
+    assert reject_log.count == 5
@@ -0,0 +1,65 @@
+"""Testes da paginação keyset de iter_pages (table_reader.py)"""
+
+import pytest
+
+from local_backend import LocalBackend
+from table_reader import iter_pages, iter_table
+
+
+def _feedback(i, created_at):
+    return {
+        'id': f'fb{i:04d}', 'created_at': created_at, 'user_id': 'u', 'conversation_id': 'c',
+        'suggestion_text': f's{i}', 'suggestion_index': 0, 'feedback_type': 'like',
+    }
+
+
+@pytest.fixture
+def backend():
+    backend = LocalBackend()
+    # Grupos de created_at repetido maiores que a página, inseridos fora de ordem
+    rows = [_feedback(i, f'2025-10-0{1 + i % 3}T12:00:00+00:00') for i in range(50)]
+    backend.table('suggestion_feedback').insert(rows[::-1]).execute()
+    return backend
+
+
+@pytest.mark.parametrize('page_size', [1, 7, 10, 17, 50, 51])
+def test_tiebreaker_paging_reads_every_row_once(backend, page_size):
+    pages = list(iter_pages(backend, 'suggestion_feedback', 'id', key='created_at',
+                            tiebreaker='id', page_size=page_size))
+
+    rows = [row for page in pages for row in page]
+    assert len(rows) == 50
+    assert len({row['id'] for row in rows}) == 50
+    assert rows == sorted(rows, key=lambda row: (row['created_at'], row['id']))
+    assert all(len(page) <= page_size for page in pages)
+
+
+def test_without_tiebreaker_duplicate_keys_are_skipped(backend):
+    # Motivo do tiebreaker: WHERE created_at > última pula o resto do grupo
+    rows = list(iter_table(backend, 'suggestion_feedback', 'id', key='created_at', page_size=7))
+    assert len(rows) < 50
+
+
+def test_key_columns_are_added_to_select(backend):
+    page = next(iter_pages(backend, 'suggestion_feedback', 'suggestion_text', key='created_at',
+                           tiebreaker='id', page_size=5))
+    assert set(page[0]) == {'suggestion_text', 'created_at', 'id'}
+
+
+def test_filters_apply_to_every_page(backend):
+    def filters(query):
+        return query.gte('created_at', '2025-10-02T00:00:00+00:00')
+
+    rows = list(iter_table(backend, 'suggestion_feedback', 'id', key='created_at',
+                           tiebreaker='id', page_size=4, filters=filters))
+    expected = {f'fb{i:04d}' for i in range(50) if i % 3 != 0}
+    assert [row['id'] for row in rows] == sorted(expected, key=lambda id: (int(id[2:]) % 3, id))
+
+
+def test_requests_per_page(backend):
+    before = backend.request_count
+    pages = list(iter_pages(backend, 'suggestion_feedback', 'id', key='created_at',
+                            tiebreaker='id', page_size=10))
+    assert len(pages) == 5
+    # A última página cheia precisa de mais um request (vazio) para saber que acabou
+    assert backend.request_count - before == 6
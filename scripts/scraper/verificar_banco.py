@@ -1,18 +1,38 @@
-from supabase import create_client
+from collections import Counter
 import os
 from dotenv import load_dotenv
 
+from storage import create_storage_client
+from table_reader import iter_table
+
 load_dotenv()
 
+# Distribuição por tipo e região: lê a tabela inteira, então só sob pedido
+VERIFY_DISTRIBUTION = os.getenv('VERIFY_DISTRIBUTION', 'false').lower() == 'true'
+
 try:
-    client = create_client(os.getenv('SUPABASE_URL'), os.getenv('SUPABASE_KEY'))
+    client = create_storage_client(os.getenv('SUPABASE_URL'), os.getenv('SUPABASE_KEY'))
 
-    # Verificar total
-    result = client.table('cultural_references').select('id', count='exact').execute()
-    total = result.count if hasattr(result, 'count') else len(result.data)
+    # Verificar total (count exato no header; só 1 linha no corpo)
+    result = client.table('cultural_references').select('id', count='exact').limit(1).execute()
+    total = result.count
 
     print(f'Total de registros no banco: {total}')
 
+    if VERIFY_DISTRIBUTION:
+        # Varredura paginada da tabela toda
+        tipos = Counter()
+        regioes = Counter()
+        for row in iter_table(client, 'cultural_references', 'id, tipo, regiao'):
+            tipos[row['tipo']] += 1
+            regioes[row['regiao']] += 1
+        print('Por tipo:')
+        for tipo, count in tipos.most_common():
+            print(f'  - {tipo}: {count}')
+        print('Por região:')
+        for regiao, count in regioes.most_common():
+            print(f'  - {regiao}: {count}')
+
     # Ver amostra
     sample = client.table('cultural_references').select('termo, tipo, regiao').limit(5).execute()
     print('Amostra de dados:')
@@ -0,0 +1,14 @@
+"""
+Configuração do pytest para os testes de scripts/
+
+Os módulos de scripts/ (feedback_rollup, feedback_cache) se importam
+sem pacote, como nos scripts: o diretório vai para o sys.path.
+"""
+
+import os
+import sys
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
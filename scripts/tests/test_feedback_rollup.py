@@ -0,0 +1,124 @@
+"""Testes de FeedbackRollup.add/window (feedback_rollup.py)"""
+
+import pandas as pd
+import pytest
+
+from feedback_rollup import FeedbackRollup
+
+
+def _feedbacks(*rows):
+    """DataFrame no formato de fetch_feedback_data a partir de tuplas
+    (created_at, feedback_type, suggestion_text, tone, focus_tags)"""
+    df = pd.DataFrame(rows, columns=['created_at', 'feedback_type', 'suggestion_text', 'tone', 'focus_tags'])
+    df.insert(0, 'id', [f'fb{i}' for i in range(len(df))])
+    df['created_at'] = pd.to_datetime(df['created_at'], utc=True)
+    for column in ('feedback_type', 'suggestion_text', 'tone'):
+        df[column] = df[column].astype('category')
+    return df
+
+
+def _by(rows, key):
+    return {row[key]: (row['total'], row['likes'], row['dislikes']) for row in rows}
+
+
+@pytest.fixture
+def rollup(tmp_path):
+    rollup = FeedbackRollup(str(tmp_path / 'rollup.db'))
+    yield rollup
+    rollup.close()
+
+
+def test_add_moves_watermark(rollup):
+    assert rollup.watermark() is None
+    assert rollup.covered_from() is None
+
+    rollup.add(_feedbacks(), '2025-10-01T00:00:00+00:00', '2025-10-02T08:00:00+00:00')
+    assert rollup.watermark() == '2025-10-02T08:00:00+00:00'
+    assert rollup.covered_from() == '2025-10-01'
+
+    rollup.add(_feedbacks(), '2025-10-02T08:00:00+00:00', '2025-10-03T00:00:00+00:00')
+    assert rollup.watermark() == '2025-10-03T00:00:00+00:00'
+    assert rollup.covered_from() == '2025-10-01'
+
+
+def test_window_sums_days_from_since_day(rollup):
+    rollup.add(_feedbacks(
+        ('2025-10-01T10:00:00', 'dislike', 'a', 'flerte', ['x']),
+        ('2025-10-02T10:00:00', 'like', 'a', 'flerte', ['x', 'y']),
+        ('2025-10-02T11:00:00', 'dislike', 'b', 'casual', []),
+    ), '2025-10-01T00:00:00+00:00', '2025-10-02T12:00:00+00:00')
+    # Lote seguinte cai no mesmo dia: as contagens somam
+    rollup.add(_feedbacks(
+        ('2025-10-02T13:00:00', 'dislike', 'a', 'flerte', ['y']),
+        ('2025-10-03T09:00:00', 'like', 'b', 'casual', ['x']),
+    ), '2025-10-02T12:00:00+00:00', '2025-10-04T00:00:00+00:00')
+
+    totals, tones, tags, _ = rollup.window('2025-10-02', min_feedbacks=1)
+    assert totals == {'total': 4, 'likes': 2, 'dislikes': 2}
+    assert _by(tones, 'tone') == {'flerte': (2, 1, 1), 'casual': (2, 1, 1)}
+    # Sem like conta como dislike por tag (mesma regra de analyze_by_focus_tags)
+    assert _by(tags, 'focus_tag') == {'x': (2, 2, 0), 'y': (2, 1, 1)}
+
+    totals, _, _, _ = rollup.window('2025-10-01', min_feedbacks=1)
+    assert totals['total'] == 5
+
+
+def test_window_suggestion_filters(rollup):
+    rollup.add(_feedbacks(
+        ('2025-10-01T10:00:00', 'dislike', 'ruim', 'flerte', []),
+        ('2025-10-01T11:00:00', 'dislike', 'ruim', 'flerte', []),
+        ('2025-10-02T10:00:00', 'like', 'ruim', 'flerte', []),
+        ('2025-10-02T10:00:00', 'dislike', 'poucos', 'flerte', []),
+        ('2025-10-02T11:00:00', 'dislike', 'poucos', 'flerte', []),
+    ), '2025-10-01T00:00:00+00:00', '2025-10-03T00:00:00+00:00')
+
+    _, _, _, suggestions = rollup.window('2025-10-01', threshold=60.0, min_feedbacks=3)
+    assert suggestions == [{'suggestion_text': 'ruim', 'total': 3, 'dislikes': 2}]
+
+    _, _, _, suggestions = rollup.window('2025-10-01', threshold=70.0, min_feedbacks=3)
+    assert suggestions == []
+
+
+def test_window_merges_extra_before_filters(rollup):
+    rollup.add(_feedbacks(
+        ('2025-10-02T10:00:00', 'dislike', 'ruim', 'flerte', ['x']),
+        ('2025-10-02T11:00:00', 'dislike', 'ruim', 'flerte', []),
+    ), '2025-10-01T00:00:00+00:00', '2025-10-03T00:00:00+00:00')
+    # Pedaço do primeiro dia e linhas depois da marca d'água, lidos à parte
+    extra = _feedbacks(
+        ('2025-10-01T20:00:00', 'dislike', 'ruim', 'casual', ['x']),
+        ('2025-10-03T10:00:00', 'like', 'nova', 'casual', []),
+    )
+
+    totals, tones, tags, suggestions = rollup.window('2025-10-02', threshold=70.0, extra=extra)
+    assert totals == {'total': 4, 'likes': 1, 'dislikes': 3}
+    assert _by(tones, 'tone') == {'flerte': (2, 0, 2), 'casual': (2, 1, 1)}
+    assert _by(tags, 'focus_tag') == {'x': (2, 0, 2)}
+    assert suggestions == [{'suggestion_text': 'ruim', 'total': 3, 'dislikes': 3}]
+
+    # extra vale só para a chamada
+    totals, _, _, suggestions = rollup.window('2025-10-02', threshold=70.0)
+    assert totals == {'total': 2, 'likes': 0, 'dislikes': 2}
+    assert suggestions == []
+
+
+def test_prune(rollup):
+    rollup.add(_feedbacks(
+        ('2025-10-01T10:00:00', 'dislike', 'antiga', 'flerte', ['x']),
+        ('2025-10-02T10:00:00', 'like', 'nova', 'flerte', ['x']),
+    ), '2025-10-01T00:00:00+00:00', '2025-10-03T00:00:00+00:00')
+
+    rollup.prune('2025-10-02')
+
+    assert rollup.covered_from() == '2025-10-02'
+    totals, _, tags, _ = rollup.window('2025-10-01', min_feedbacks=1)
+    assert totals == {'total': 1, 'likes': 1, 'dislikes': 0}
+    assert _by(tags, 'focus_tag') == {'x': (1, 1, 0)}
+    texts = {text for (text,) in rollup._conn.execute("SELECT suggestion_text FROM suggestions")}
+    assert texts == {'nova'}
+
+
+def test_empty_window(rollup):
+    totals, tones, tags, suggestions = rollup.window('2025-10-01')
+    assert totals == {'total': 0, 'likes': 0, 'dislikes': 0}
+    assert tones == tags == suggestions == []
@@ -0,0 +1,83 @@
+-- =====================================================
+-- MIGRATION: Bulk load for cultural_references
+-- Description: Função para carga em massa: recebe um array JSON
+--              grande de referências e grava tudo em um único
+--              INSERT ... ON CONFLICT (termo), em vez de centenas
+--              de inserts pequenos via PostgREST
+-- Author: FlertAI Team
+-- Date: 2025-10-06
+-- =====================================================
+
+-- =====================================================
+-- FUNCTION: bulk_load_cultural_references
+-- =====================================================
+-- payload: [{"termo": ..., "tipo": ..., "significado": ..., "exemplo_uso": ...,
+--            "regiao": ..., "contexto_flerte": ...}, ...]
+-- merge:   false = mantém o registro existente (DO NOTHING)
+--          true  = atualiza o existente com os dados do payload
+-- Retorna o número de linhas gravadas (inseridas ou atualizadas).
+-- Termos repetidos no próprio payload: vale a primeira ocorrência.
+CREATE OR REPLACE FUNCTION bulk_load_cultural_references(
+    payload JSONB,
+    merge BOOLEAN DEFAULT false
+)
+RETURNS INTEGER AS $$
+DECLARE
+    written INTEGER;
+BEGIN
+    IF merge THEN
+        INSERT INTO cultural_references (termo, tipo, significado, exemplo_uso, regiao, contexto_flerte)
+        SELECT DISTINCT ON (r.termo)
+            r.termo, r.tipo, r.significado, r.exemplo_uso,
+            COALESCE(r.regiao, 'nacional'), r.contexto_flerte
+        FROM ROWS FROM (
+            jsonb_to_recordset(payload) AS (
+                termo TEXT, tipo TEXT, significado TEXT, exemplo_uso TEXT,
+                regiao TEXT, contexto_flerte TEXT
+            )
+        ) WITH ORDINALITY AS r(termo, tipo, significado, exemplo_uso, regiao, contexto_flerte, ord)
+        ORDER BY r.termo, r.ord
+        ON CONFLICT (termo) DO UPDATE SET
+            tipo = EXCLUDED.tipo,
+            significado = EXCLUDED.significado,
+            exemplo_uso = EXCLUDED.exemplo_uso,
+            regiao = EXCLUDED.regiao,
+            contexto_flerte = EXCLUDED.contexto_flerte;
+    ELSE
+        INSERT INTO cultural_references (termo, tipo, significado, exemplo_uso, regiao, contexto_flerte)
+        SELECT DISTINCT ON (r.termo)
+            r.termo, r.tipo, r.significado, r.exemplo_uso,
+            COALESCE(r.regiao, 'nacional'), r.contexto_flerte
+        FROM ROWS FROM (
+            jsonb_to_recordset(payload) AS (
+                termo TEXT, tipo TEXT, significado TEXT, exemplo_uso TEXT,
+                regiao TEXT, contexto_flerte TEXT
+            )
+        ) WITH ORDINALITY AS r(termo, tipo, significado, exemplo_uso, regiao, contexto_flerte, ord)
+        ORDER BY r.termo, r.ord
+        ON CONFLICT (termo) DO NOTHING;
+    END IF;
+
+    GET DIAGNOSTICS written = ROW_COUNT;
+    RETURN written;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Só scripts de carga (service_role) podem chamar
+REVOKE ALL ON FUNCTION bulk_load_cultural_references(JSONB, BOOLEAN) FROM PUBLIC;
+REVOKE ALL ON FUNCTION bulk_load_cultural_references(JSONB, BOOLEAN) FROM anon, authenticated;
+GRANT EXECUTE ON FUNCTION bulk_load_cultural_references(JSONB, BOOLEAN) TO service_role;
+
+COMMENT ON FUNCTION bulk_load_cultural_references(JSONB, BOOLEAN) IS
+    'Carga em massa de cultural_references a partir de um array JSON (INSERT_MODE=bulk)';
+
+-- =====================================================
+-- VERIFICATION QUERY
+-- =====================================================
+-- SELECT bulk_load_cultural_references(
+--     '[{"termo": "Teste bulk", "tipo": "giria", "significado": "Só um teste de carga"}]'::jsonb
+-- );
+
+-- =====================================================
+-- END OF MIGRATION
+-- =====================================================
@@ -0,0 +1,125 @@
+-- =====================================================
+-- MIGRATION: Feedback aggregation functions
+-- Description: Agregações de suggestion_feedback feitas no banco
+--              para o scripts/analyze_feedback.py (ANALYSIS_MODE=
+--              aggregate): o script recebe só as contagens já
+--              agrupadas, em vez de todas as linhas da janela
+-- Author: FlertAI Team
+-- Date: 2025-10-07
+-- =====================================================
+
+-- Varredura da janela por created_at lendo só as colunas agregadas
+CREATE INDEX IF NOT EXISTS idx_suggestion_feedback_created_at_type
+    ON suggestion_feedback(created_at, feedback_type, conversation_id);
+
+-- =====================================================
+-- FUNCTION: get_feedback_totals
+-- =====================================================
+CREATE OR REPLACE FUNCTION get_feedback_totals(since TIMESTAMPTZ)
+RETURNS TABLE (
+    total BIGINT,
+    likes BIGINT,
+    dislikes BIGINT
+) AS $$
+    SELECT
+        COUNT(*) AS total,
+        COUNT(*) FILTER (WHERE sf.feedback_type = 'like') AS likes,
+        COUNT(*) FILTER (WHERE sf.feedback_type = 'dislike') AS dislikes
+    FROM suggestion_feedback sf
+    WHERE sf.created_at >= since;
+$$ LANGUAGE sql STABLE;
+
+-- =====================================================
+-- FUNCTION: get_feedback_by_tone
+-- =====================================================
+CREATE OR REPLACE FUNCTION get_feedback_by_tone(since TIMESTAMPTZ)
+RETURNS TABLE (
+    tone TEXT,
+    total BIGINT,
+    likes BIGINT,
+    dislikes BIGINT
+) AS $$
+    SELECT
+        COALESCE(c.tone, 'unknown') AS tone,
+        COUNT(*) AS total,
+        COUNT(*) FILTER (WHERE sf.feedback_type = 'like') AS likes,
+        COUNT(*) FILTER (WHERE sf.feedback_type = 'dislike') AS dislikes
+    FROM suggestion_feedback sf
+    LEFT JOIN conversations c ON c.id = sf.conversation_id
+    WHERE sf.created_at >= since
+    GROUP BY COALESCE(c.tone, 'unknown');
+$$ LANGUAGE sql STABLE;
+
+-- =====================================================
+-- FUNCTION: get_feedback_by_focus_tag
+-- =====================================================
+-- Um feedback conta uma vez para cada focus_tag da conversa
+CREATE OR REPLACE FUNCTION get_feedback_by_focus_tag(since TIMESTAMPTZ)
+RETURNS TABLE (
+    focus_tag TEXT,
+    total BIGINT,
+    likes BIGINT,
+    dislikes BIGINT
+) AS $$
+    SELECT
+        tag AS focus_tag,
+        COUNT(*) AS total,
+        COUNT(*) FILTER (WHERE sf.feedback_type = 'like') AS likes,
+        COUNT(*) FILTER (WHERE sf.feedback_type <> 'like') AS dislikes
+    FROM suggestion_feedback sf
+    JOIN conversations c ON c.id = sf.conversation_id
+    CROSS JOIN LATERAL unnest(c.focus_tags) AS tag
+    WHERE sf.created_at >= since
+    GROUP BY tag;
+$$ LANGUAGE sql STABLE;
+
+-- =====================================================
+-- FUNCTION: get_problem_suggestions
+-- =====================================================
+-- Só as sugestões com pelo menos min_feedbacks avaliações e taxa de
+-- dislike >= threshold (%), que são as únicas usadas no relatório
+CREATE OR REPLACE FUNCTION get_problem_suggestions(
+    since TIMESTAMPTZ,
+    threshold NUMERIC DEFAULT 70,
+    min_feedbacks INT DEFAULT 3
+)
+RETURNS TABLE (
+    suggestion_text TEXT,
+    total BIGINT,
+    dislikes BIGINT
+) AS $$
+    SELECT
+        sf.suggestion_text,
+        COUNT(*) AS total,
+        COUNT(*) FILTER (WHERE sf.feedback_type = 'dislike') AS dislikes
+    FROM suggestion_feedback sf
+    WHERE sf.created_at >= since
+    GROUP BY sf.suggestion_text
+    HAVING COUNT(*) >= min_feedbacks
+       AND COUNT(*) FILTER (WHERE sf.feedback_type = 'dislike') * 100.0 / COUNT(*) >= threshold;
+$$ LANGUAGE sql STABLE;
+
+-- =====================================================
+-- GRANTS
+-- =====================================================
+-- Agregados de todos os usuários: só para o script de análise (service_role)
+REVOKE ALL ON FUNCTION get_feedback_totals(TIMESTAMPTZ) FROM PUBLIC, anon, authenticated;
+REVOKE ALL ON FUNCTION get_feedback_by_tone(TIMESTAMPTZ) FROM PUBLIC, anon, authenticated;
+REVOKE ALL ON FUNCTION get_feedback_by_focus_tag(TIMESTAMPTZ) FROM PUBLIC, anon, authenticated;
+REVOKE ALL ON FUNCTION get_problem_suggestions(TIMESTAMPTZ, NUMERIC, INT) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION get_feedback_totals(TIMESTAMPTZ) TO service_role;
+GRANT EXECUTE ON FUNCTION get_feedback_by_tone(TIMESTAMPTZ) TO service_role;
+GRANT EXECUTE ON FUNCTION get_feedback_by_focus_tag(TIMESTAMPTZ) TO service_role;
+GRANT EXECUTE ON FUNCTION get_problem_suggestions(TIMESTAMPTZ, NUMERIC, INT) TO service_role;
+
+-- =====================================================
+-- VERIFICATION QUERY
+-- =====================================================
+-- SELECT * FROM get_feedback_totals(now() - interval '30 days');
+-- SELECT * FROM get_feedback_by_tone(now() - interval '30 days');
+-- SELECT * FROM get_feedback_by_focus_tag(now() - interval '30 days');
+-- SELECT * FROM get_problem_suggestions(now() - interval '30 days');
+
+-- =====================================================
+-- END OF MIGRATION
+-- =====================================================